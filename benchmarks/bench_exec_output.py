@@ -0,0 +1,53 @@
+"""
+Benchmark: memory used by exec on commands with large output.
+
+Runs a command printing --mb megabytes through ExecTool (bounded head/tail
+capture) and through the old approach of buffering everything with
+communicate() and truncating afterwards, and reports the peak Python heap
+of each (tracemalloc) and the wall time.
+
+Usage:
+    python benchmarks/bench_exec_output.py [--mb 200]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from nanobot.agent.tools.shell import ExecTool
+
+
+async def buffered(command: str) -> str:
+    """What exec did before: buffer both pipes, then truncate."""
+    process = await asyncio.create_subprocess_shell(
+        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    return stdout.decode("utf-8", errors="replace")[:10000]
+
+
+def measure(label: str, run) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>10}: peak {peak / 1e6:8.1f} MB  {elapsed:6.2f} s  ({len(out)} chars returned)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=200)
+    args = parser.parse_args()
+
+    command = f"head -c {args.mb * 1024 * 1024} /dev/zero | tr '\\0' 'x' | fold -w 100"
+    print(f"command output: {args.mb} MB")
+    measure("buffered", lambda: buffered(command))
+    tool = ExecTool(timeout=300)
+    measure("exec", lambda: tool.execute(command))
+
+
+if __name__ == "__main__":
+    main()
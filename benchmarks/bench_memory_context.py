@@ -0,0 +1,92 @@
+"""
+Benchmark: prompt size and build time with a large MEMORY.md.
+
+Compares injecting the whole file into the system prompt (memory_tokens=0,
+what every turn did before) with the budgeted injection of relevant
+sections. Reports prompt tokens (system prompt + current user message),
+the first build after the file changed (indexing, token counting) and the
+per-turn build with an unchanged file.
+
+Usage:
+    python benchmarks/bench_memory_context.py [--sizes-kb 100,1000] [--budget 2000] [--rounds 20]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.utils.file_cache import FileCache
+from nanobot.utils.tokens import count_tokens
+
+WORDS = (
+    "project deadline meeting family birthday travel flight hotel recipe garden "
+    "invoice budget doctor appointment password router printer book movie music "
+    "running gym coffee tea office client contract holiday school car insurance"
+).split()
+
+QUERIES = [
+    "When is the client contract deadline?",
+    "What did I say about the hotel for the holiday?",
+    "Remind me which coffee I like",
+]
+
+
+def make_memory(path: Path, size_bytes: int) -> None:
+    rng = random.Random(0)
+    parts = ["# Long-term Memory\n"]
+    size = 0
+    i = 0
+    while size < size_bytes:
+        body = "\n".join(
+            "- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16)))
+            for _ in range(rng.randint(2, 6))
+        )
+        section = f"\n## Note {i}\n{body}\n"
+        parts.append(section)
+        size += len(section)
+        i += 1
+    path.write_text("".join(parts), encoding="utf-8")
+
+
+def prompt_tokens(messages: list[dict]) -> int:
+    return count_tokens(messages[0]["content"]) + count_tokens(messages[-1]["content"])
+
+
+def run(workspace: Path, budget: int, rounds: int) -> tuple[int, float, float]:
+    ctx = ContextBuilder(workspace, file_cache=FileCache(), memory_tokens=budget)
+    start = time.perf_counter()
+    messages = ctx.build_messages([], QUERIES[0])
+    first_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for n in range(rounds):
+        start = time.perf_counter()
+        ctx.build_messages([], QUERIES[n % len(QUERIES)])
+        samples.append((time.perf_counter() - start) * 1000)
+    return prompt_tokens(messages), first_ms, statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-kb", default="100,1000")
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'MEMORY.md':>10} {'mode':>9} {'prompt tok':>11} {'first ms':>9} {'turn ms':>8}")
+    for size_kb in (int(s) for s in args.sizes_kb.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = Path(tmp)
+            (workspace / "memory").mkdir()
+            make_memory(workspace / "memory" / "MEMORY.md", size_kb * 1024)
+            for mode, budget in (("whole", 0), ("budgeted", args.budget)):
+                tokens, first_ms, turn_ms = run(workspace, budget, args.rounds)
+                print(f"{size_kb:>8}KB {mode:>9} {tokens:>11} {first_ms:>9.1f} {turn_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
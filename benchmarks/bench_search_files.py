@@ -0,0 +1,78 @@
+"""
+Benchmark: search_files over a large workspace.
+
+Generates a tree of source-like files (plus an ignored node_modules tree)
+and times a content search, a case-insensitive search with context and a
+glob listing, with one walker thread and with the default pool.
+
+Usage:
+    python benchmarks/bench_search_files.py [--files 50000] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.tools.search import SearchFilesTool
+
+WORDS = "config handler request session memory token cache index value result error state".split()
+
+
+def make_tree(root: Path, files: int) -> None:
+    rng = random.Random(0)
+    (root / ".gitignore").write_text("node_modules/\n*.log\n")
+    per_dir = 100
+    for n in range(files):
+        directory = root / f"pkg{n // (per_dir * 20)}" / f"mod{(n // per_dir) % 20}"
+        if n % per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        body = "\n".join(
+            f"def {rng.choice(WORDS)}_{i}({rng.choice(WORDS)}): return {rng.choice(WORDS)}"
+            for i in range(rng.randint(20, 60))
+        )
+        if n % 5000 == 1234:
+            body += "\n# FIXME: rare_marker_token\n"
+        (directory / f"file{n}.py").write_text(body)
+    ignored = root / "node_modules" / "dep"
+    ignored.mkdir(parents=True)
+    for n in range(files // 10):
+        (ignored / f"x{n}.js").write_text("rare_marker_token\n")
+
+
+def timed(tool: SearchFilesTool, rounds: int, **kwargs) -> tuple[float, str]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = asyncio.run(tool.execute(**kwargs))
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files)
+        print(f"{args.files} files (+{args.files // 10} ignored)")
+        searches = {
+            "regex": {"pattern": r"rare_marker_\w+"},
+            "regex -i +ctx": {"pattern": "fixme", "ignore_case": True, "context": 2},
+            "glob": {"glob": "pkg1/**/file2*.py", "max_results": 500},
+        }
+        for workers in (1, 8):
+            tool = SearchFilesTool(working_dir=str(root), workers=workers)
+            for label, kwargs in searches.items():
+                ms, out = timed(tool, args.rounds, **kwargs)
+                print(f"workers={workers} {label:>14}: {ms:8.1f} ms  ({len(out.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: SessionManager.save latency as a session grows.
+
+For each history size, appends one user/assistant turn and times the save,
+comparing the append-only save with a full rewrite of the session file (what
+every save did before).
+
+Usage:
+    python benchmarks/bench_session_save.py [--sizes 100,1000,10000] [--rounds 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["HOME"] = tmp
+        from nanobot.session.manager import SessionManager
+
+        manager = SessionManager(Path(tmp))
+        text = "Some reasonably long chat message with details. " * 8
+
+        print(f"{'messages':>9} {'file MB':>8} {'append ms':>10} {'rewrite ms':>11}")
+        for size in sizes:
+            session = manager.get_or_create(f"bench:{size}")
+            while len(session.messages) < size:
+                session.add_message("user", text)
+                session.add_message("assistant", text)
+            manager.save(session)
+            path = manager.store._get_session_path(session.key)
+
+            append_ms, rewrite_ms = [], []
+            for _ in range(args.rounds):
+                session.add_message("user", text)
+                session.add_message("assistant", text)
+                start = time.perf_counter()
+                manager.save(session)
+                append_ms.append((time.perf_counter() - start) * 1000)
+
+                trailer = '{"_type": "metadata"}\n'
+                start = time.perf_counter()
+                manager.store._rewrite(path, session, trailer)
+                rewrite_ms.append((time.perf_counter() - start) * 1000)
+                session.persisted = None
+                manager.save(session)  # Restore a real trailer
+
+            size_mb = path.stat().st_size / 1e6
+            print(f"{len(session.messages):>9} {size_mb:>8.2f} "
+                  f"{statistics.median(append_ms):>10.3f} {statistics.median(rewrite_ms):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: skills summary with a few hundred workspace skills.
+
+Compares a cold SkillsLoader (empty caches, as on every turn before the
+skills index existed) with a warm one serving the same workspace.
+
+Usage:
+    python benchmarks/bench_skills.py [--skills 300] [--rounds 50]
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.file_cache import FileCache
+
+
+def make_workspace(root: Path, count: int) -> None:
+    for i in range(count):
+        skill_dir = root / "skills" / f"skill-{i:04d}"
+        skill_dir.mkdir(parents=True)
+        bins = ["git", "tmux", f"missing-tool-{i % 7}"][: 1 + i % 3]
+        metadata = '{"nanobot":{"requires":{"bins":[%s]}}}' % ",".join(f'"{b}"' for b in bins)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: skill-{i:04d}\ndescription: Benchmark skill number {i}\n"
+            f"metadata: {metadata}\n---\n\n# Skill {i}\n\n" + "Instructions line.\n" * 40,
+            encoding="utf-8",
+        )
+
+
+def timed(fn, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    which_calls = 0
+    real_which = shutil.which
+
+    def counting_which(*a, **kw):
+        nonlocal which_calls
+        which_calls += 1
+        return real_which(*a, **kw)
+
+    shutil.which = counting_which
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        make_workspace(workspace, args.skills)
+
+        def cold() -> None:
+            SkillsLoader(workspace, file_cache=FileCache()).build_skills_summary()
+
+        which_calls = 0
+        cold_ms = timed(cold, args.rounds)
+        cold_which = which_calls / args.rounds
+
+        warm_loader = SkillsLoader(workspace, file_cache=FileCache())
+        warm_loader.build_skills_summary()
+        which_calls = 0
+        warm_ms = timed(warm_loader.build_skills_summary, args.rounds)
+        warm_which = which_calls / args.rounds
+
+    print(f"skills: {args.skills}, rounds: {args.rounds}")
+    print(f"cold  build_skills_summary: median {statistics.median(cold_ms):8.2f} ms, "
+          f"{cold_which:.0f} PATH scans/turn")
+    print(f"warm  build_skills_summary: median {statistics.median(warm_ms):8.2f} ms, "
+          f"{warm_which:.0f} PATH scans/turn")
+
+
+if __name__ == "__main__":
+    main()
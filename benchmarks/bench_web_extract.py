@@ -0,0 +1,110 @@
+"""
+Benchmark: event-loop stalls caused by web_fetch content extraction.
+
+Extracts a corpus of HTML pages (readability + HTML-to-markdown) while a
+heartbeat task ticks every 5 ms, and reports the worst heartbeat delay
+(how long the event loop was blocked) and the wall time for the corpus.
+"inline" is what web_fetch did before (extraction on the event loop);
+"pool" uses the ExtractionPool worker processes.
+
+Pass --corpus DIR to use saved pages (*.html) instead of generated ones.
+
+Usage:
+    python benchmarks/bench_web_extract.py [--corpus DIR] [--workers 2] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from pathlib import Path
+
+from nanobot.utils.extraction import ExtractionPool, extract_content
+
+WORDS = (
+    "the agent fetches pages and extracts readable text from noisy markup with "
+    "navigation sidebars footers scripts styles tables links headings lists"
+).split()
+
+
+def make_page(rng: random.Random, size_bytes: int) -> str:
+    """A page with an article, boilerplate navigation and inline scripts."""
+    nav = "".join(f'<li><a href="/n{i}">Section {i}</a></li>' for i in range(40))
+    parts = [f"<html><head><title>Page</title><script>var x = {'1' * 200};</script></head>"
+             f"<body><nav><ul>{nav}</ul></nav><article><h1>Title</h1>"]
+    size = sum(len(p) for p in parts)
+    i = 0
+    while size < size_bytes:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+        block = (f'<h2>Part {i}</h2><p>{words} <a href="https://example.com/{i}">ref</a></p>'
+                 f"<ul><li>{words[:60]}</li><li>{words[-60:]}</li></ul>")
+        parts.append(block)
+        size += len(block)
+        i += 1
+    parts.append("</article><footer>footer</footer></body></html>")
+    return "".join(parts)
+
+
+def load_corpus(corpus: str | None) -> list[str]:
+    if corpus:
+        return [p.read_text(encoding="utf-8", errors="replace") for p in sorted(Path(corpus).glob("*.html"))]
+    rng = random.Random(0)
+    sizes_kb = [20, 50, 100, 200, 500, 2048] * 2
+    return [make_page(rng, kb * 1024) for kb in sizes_kb]
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    interval = 0.005
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run(pages: list[str], pool: ExtractionPool | None, concurrency: int) -> tuple[float, float, float]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0.02)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(page: str) -> None:
+        async with semaphore:
+            if pool is None:
+                extract_content(page, "text/html", "markdown")
+                await asyncio.sleep(0)
+            else:
+                await pool.extract(page, "text/html", "markdown")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(page) for page in pages))
+    wall = (time.perf_counter() - start) * 1000
+    stop.set()
+    await beat
+    return wall, max(lags), statistics.median(lags)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    total_mb = sum(len(p) for p in pages) / 1e6
+    print(f"{len(pages)} pages, {total_mb:.1f} MB, largest {max(len(p) for p in pages) / 1e6:.1f} MB")
+
+    pool = ExtractionPool(workers=args.workers, timeout=120)
+    await pool.extract("<html><body><p>warm up</p></body></html>", "text/html", "markdown")
+
+    print(f"{'mode':>7} {'wall ms':>9} {'max loop stall ms':>18} {'p50 stall ms':>13}")
+    for label, p in (("inline", None), ("pool", pool)):
+        wall, worst, p50 = await run(pages, p, args.concurrency)
+        print(f"{label:>7} {wall:>9.0f} {worst:>18.1f} {p50:>13.2f}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Benchmark: p50 web_search latency with and without the shared HTTP pool.
+
+Runs WebSearchTool against a local Brave-like endpoint that charges a fixed
+delay for every new connection, standing in for DNS + TCP + TLS setup
+(about 2-3 round trips to a real API). "per-call client" is what every
+search did before (a fresh httpx.AsyncClient per call); "pooled" uses the
+application's HttpClients registry, so connections are kept alive.
+
+Pass --live to query the real Brave API instead (needs BRAVE_API_KEY).
+
+Usage:
+    python benchmarks/bench_web_search.py [--calls 30] [--setup-ms 60] [--live]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from nanobot.agent.tools.web import WebSearchTool
+from nanobot.utils.http import HttpClients
+
+BODY = json.dumps({
+    "web": {"results": [
+        {"title": f"Result {i}", "url": f"https://example.com/{i}", "description": "Snippet."}
+        for i in range(5)
+    ]}
+}).encode()
+
+
+async def serve(setup_ms: float) -> asyncio.AbstractServer:
+    """Keep-alive HTTP/1.1 server answering every request with BODY."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await asyncio.sleep(setup_ms / 1000)  # Connection setup cost
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def measure(tool: WebSearchTool, calls: int) -> list[float]:
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        result = await tool.execute(query=f"nanobot benchmark {i % 3}")
+        samples.append((time.perf_counter() - start) * 1000)
+        if result.startswith("Error"):
+            raise SystemExit(result)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--setup-ms", type=float, default=60.0)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    api_key = os.environ.get("BRAVE_API_KEY", "")
+    if not args.live:
+        server = await serve(args.setup_ms)
+        port = server.sockets[0].getsockname()[1]
+        api_url = f"http://127.0.0.1:{port}/res/v1/web/search"
+        api_key = "local"
+        print(f"local endpoint, {args.setup_ms:.0f} ms connection setup, {args.calls} calls")
+    else:
+        print(f"live Brave API, {args.calls} calls")
+
+    results = {}
+    clients = HttpClients()
+    for label, http in (("per-call client", None), ("pooled", clients)):
+        tool = WebSearchTool(api_key=api_key, http=http)
+        if server:
+            tool.api_url = api_url
+        samples = await measure(tool, args.calls)
+        results[label] = samples
+    await clients.aclose()
+
+    for label, samples in results.items():
+        ordered = sorted(samples)
+        p90 = ordered[int(len(ordered) * 0.9) - 1]
+        print(f"{label:>16}: p50 {statistics.median(samples):7.2f} ms   p90 {p90:7.2f} ms")
+
+    if server:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
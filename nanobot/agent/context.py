@@ -4,10 +4,15 @@ import base64
 import mimetypes
 import platform
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.file_cache import FileCache, file_signature, shared_file_cache
+from nanobot.utils.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from nanobot.utils.write_behind import WriteBehindQueue
 
 
 class ContextBuilder:
@@ -19,11 +24,29 @@ class ContextBuilder:
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
+    RUNTIME_CONTEXT_HEADER = "[Runtime Context]"
+    RELEVANT_MEMORY_HEADER = "[Relevant Memory]"
+    # Upper bound on the tokens of the per-turn runtime context block
+    RUNTIME_CONTEXT_TOKENS = 64
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        file_cache: FileCache | None = None,
+        writer: "WriteBehindQueue | None" = None,
+        memory_tokens: int = 2000,
+    ):
         self.workspace = workspace
-        self.memory = MemoryStore(workspace)
-        self.skills = SkillsLoader(workspace)
+        # Token budget for MEMORY.md; larger files are injected as relevant sections
+        self.memory_tokens = memory_tokens
+        self.files = file_cache or shared_file_cache
+        self.memory = MemoryStore(workspace, file_cache=self.files, writer=writer)
+        self.skills = SkillsLoader(workspace, file_cache=self.files)
+        # section name -> (signature of its source files, rendered text)
+        self._sections: dict[str, tuple[tuple, str]] = {}
+        self._section_stats: dict[str, dict[str, int]] = {}
+        # (system prompt, its token count) from the last budget computation
+        self._prompt_tokens: tuple[str, int] = ("", 0)
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -41,12 +64,21 @@ class ContextBuilder:
         parts.append(self._get_identity())
         
         # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
+        bootstrap = self._cached_section(
+            "bootstrap",
+            [self.workspace / f for f in self.BOOTSTRAP_FILES],
+            self._load_bootstrap_files,
+        )
         if bootstrap:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        memory = self._cached_section(
+            "memory",
+            [self.memory.memory_file, self.memory.get_today_file()],
+            lambda: self.memory.get_memory_context(self.memory_tokens),
+            params=(self.memory_tokens,),
+        )
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
@@ -70,10 +102,86 @@ Skills with available="false" need dependencies installed first - you can try in
         
         return "\n\n---\n\n".join(parts)
     
+    def history_budget(
+        self,
+        current_message: str,
+        context_window: int,
+        reserved_tokens: int = 0,
+        skill_names: list[str] | None = None,
+    ) -> int:
+        """
+        Compute how many tokens of conversation history fit in the context window.
+        
+        Args:
+            current_message: The new user message.
+            context_window: Model context window in tokens.
+            reserved_tokens: Tokens kept free for tool schemas and the reply.
+            skill_names: Optional skills included in the system prompt.
+        
+        Returns:
+            The history token budget (never negative).
+        """
+        prompt = self.build_system_prompt(skill_names)
+        if prompt != self._prompt_tokens[0]:
+            self._prompt_tokens = (prompt, count_tokens(prompt))
+        
+        used = (
+            self._prompt_tokens[1]
+            + count_tokens(current_message)
+            + self.RUNTIME_CONTEXT_TOKENS
+            + (self.memory_tokens if self._memory_oversized() else 0)
+            + reserved_tokens
+        )
+        return max(0, context_window - used)
+    
+    def _cached_section(
+        self,
+        name: str,
+        sources: list[Path],
+        build: Callable[[], str],
+        params: tuple = (),
+    ) -> str:
+        """
+        Return a prompt section, rebuilding it only when a source file changed.
+        
+        Args:
+            name: Section name (used for stats).
+            sources: Files the section is built from.
+            build: Function that renders the section.
+            params: Settings the rendering depends on.
+        
+        Returns:
+            The rendered section.
+        """
+        key = tuple((path, file_signature(path)) for path in sources) + params
+        stats = self._section_stats.setdefault(name, {"hits": 0, "misses": 0})
+        
+        cached = self._sections.get(name)
+        if cached and cached[0] == key:
+            stats["hits"] += 1
+            return cached[1]
+        
+        stats["misses"] += 1
+        text = build()
+        self._sections[name] = (key, text)
+        return text
+    
+    def cache_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters for prompt sections and the underlying file cache."""
+        sections = {}
+        for name, stats in self._section_stats.items():
+            total = stats["hits"] + stats["misses"]
+            sections[name] = {**stats, "hit_rate": stats["hits"] / total if total else 0.0}
+        return {"sections": sections, "files": self.files.stats()}
+    
     def _get_identity(self) -> str:
-        """Get the core identity section."""
-        from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        """
+        Get the core identity section.
+        
+        Kept free of per-turn data (time, chat) so the system prompt stays
+        byte-identical across turns and chats and can be served from the
+        provider's prompt cache; see _build_runtime_context.
+        """
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -87,9 +195,6 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now}
-
 ## Runtime
 {runtime}
 
@@ -104,16 +209,16 @@ Only use the 'message' tool when you need to send a message to a specific chat c
 For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, explain what you're doing.
-When remembering something, write to {workspace_path}/memory/MEMORY.md"""
+When remembering something, write to {workspace_path}/memory/MEMORY.md
+To recall older notes, use the memory_search tool instead of reading daily notes one by one."""
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
         parts = []
         
         for filename in self.BOOTSTRAP_FILES:
-            file_path = self.workspace / filename
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8")
+            content = self.files.read_text(self.workspace / filename)
+            if content is not None:
                 parts.append(f"## {filename}\n\n{content}")
         
         return "\n\n".join(parts) if parts else ""
@@ -143,21 +248,42 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         """
         messages = []
 
-        # System prompt
+        # System prompt (stable across turns and chats)
         system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
         messages.append({"role": "system", "content": system_prompt})
 
         # History
         messages.extend(history)
 
-        # Current message (with optional image attachments)
+        # Current message (with optional image attachments), followed by the
+        # volatile per-turn context so it never invalidates a cached prefix
+        runtime = self._build_runtime_context(channel, chat_id)
+        if self._memory_oversized():
+            recalled = self.memory.select_long_term(current_message, self.memory_tokens)
+            if recalled:
+                runtime = f"{self.RELEVANT_MEMORY_HEADER}\n{recalled}\n\n{runtime}"
         user_content = self._build_user_content(current_message, media)
+        if isinstance(user_content, str):
+            user_content = f"{user_content}\n\n{runtime}"
+        else:
+            user_content = user_content + [{"type": "text", "text": runtime}]
         messages.append({"role": "user", "content": user_content})
 
         return messages
 
+    def _memory_oversized(self) -> bool:
+        """Check whether MEMORY.md exceeds its prompt budget."""
+        return bool(self.memory_tokens) and self.memory.long_term_tokens() > self.memory_tokens
+
+    def _build_runtime_context(self, channel: str | None, chat_id: str | None) -> str:
+        """Build the per-turn context block (current time and session)."""
+        from datetime import datetime
+        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        lines = [self.RUNTIME_CONTEXT_HEADER, f"Current Time: {now}"]
+        if channel and chat_id:
+            lines += [f"Channel: {channel}", f"Chat ID: {chat_id}"]
+        return "\n".join(lines)
+
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
@@ -2,24 +2,40 @@
 
 import asyncio
 import json
+import time
+import uuid
+from collections import deque
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.shell_session import ShellPool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache
+from nanobot.agent.tools.search_cache import SearchCache
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
+from nanobot.agent.tools.memory import MemorySearchTool
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.session.manager import Session, SessionManager
+from nanobot.utils.extraction import ExtractionPool
+from nanobot.utils.tokens import count_tokens
+
+
+SUMMARY_PROMPT = """You maintain a running summary of a chat between a user and an AI assistant.
+Merge the previous summary and the new messages into one updated summary.
+Keep facts, decisions, user preferences, open tasks, names, paths and numbers.
+Drop small talk and anything superseded. Write concise bullet points, at most 400 words."""
 
 
 class AgentLoop:
@@ -34,6 +50,12 @@ class AgentLoop:
     5. Sends responses back
     """
 
+    # Minimum seconds between partial updates of a streamed reply
+    STREAM_INTERVAL_S = 1.0
+
+    # Fraction of the context window kept free to absorb tokenizer differences
+    CONTEXT_SAFETY_MARGIN = 0.1
+
     def __init__(
         self,
         bus: MessageBus,
@@ -41,13 +63,27 @@ class AgentLoop:
         workspace: Path,
         model: str | None = None,
         max_iterations: int = 20,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
+        max_concurrency: int = 4,
+        streaming: bool = False,
+        context_window: int = 0,
+        max_history_tokens: int = 16000,
+        compaction_threshold: int = 100,
+        compaction_keep: int = 40,
+        compaction_model: str | None = None,
+        writer: "WriteBehindQueue | None" = None,
+        memory_tokens: int = 2000,
+        http: "HttpClients | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_search_config: "WebSearchConfig | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig, WebSearchConfig
         from nanobot.cron.service import CronService
 
         self.bus = bus
@@ -55,13 +91,36 @@ class AgentLoop:
         self.workspace = workspace
         self.model = model or provider.get_default_model()
         self.max_iterations = max_iterations
+        self.max_tokens = max_tokens
+        self.temperature = temperature
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
-
-        self.context = ContextBuilder(workspace)
-        self.sessions = session_manager or SessionManager(workspace)
+        self.max_concurrency = max(1, max_concurrency)
+        self.streaming = streaming
+        self.context_window = context_window
+        self.http = http
+        self.search_cache = self._make_search_cache(web_search_config or WebSearchConfig())
+        web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_cache = self._make_web_cache(web_fetch_config)
+        self.extractor = ExtractionPool(
+            workers=web_fetch_config.extract_workers, timeout=web_fetch_config.extract_timeout
+        )
+        # Persistent shells for exec, one per chat (and per subagent task)
+        self.shells = ShellPool(
+            idle_timeout=self.exec_config.shell_idle_timeout, max_shells=self.exec_config.max_shells
+        ) if self.exec_config.persistent_shell else None
+        self.max_history_tokens = max_history_tokens
+        # (tool count, token count of their schemas)
+        self._tool_schema_tokens: tuple[int, int] = (0, 0)
+
+        self.context = ContextBuilder(workspace, writer=writer, memory_tokens=memory_tokens)
+        self.sessions = session_manager or SessionManager(workspace, writer=writer)
+        self.compaction_model = compaction_model
+        self.sessions.enable_compaction(
+            self._summarize_history, compaction_threshold, compaction_keep
+        )
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
             provider=provider,
@@ -71,9 +130,18 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            http=http,
+            web_cache=self.web_cache,
+            extractor=self.extractor,
+            search_cache=self.search_cache,
+            shells=self.shells,
         )
 
         self._running = False
+        # Per-session FIFO queues; each non-empty queue is drained by one worker task
+        self._session_queues: dict[str, deque[InboundMessage]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -84,6 +152,7 @@ class AgentLoop:
         self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
         self.tools.register(ListDirTool(allowed_dir=allowed_dir))
+        self.tools.register(SearchFilesTool(working_dir=str(self.workspace), allowed_dir=allowed_dir))
 
         # Shell tool
         self.tools.register(
@@ -91,12 +160,18 @@ class AgentLoop:
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
+                shells=self.shells,
+                max_output_bytes=self.exec_config.max_output_mb * 1024 * 1024,
+                spill_dir=self.workspace / ".exec-output" if self.exec_config.spill_output else None,
             )
         )
 
         # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool(api_key=self.brave_api_key, http=self.http, cache=self.search_cache))
+        self.tools.register(WebFetchTool(http=self.http, cache=self.web_cache, extractor=self.extractor))
+
+        # Memory search
+        self.tools.register(MemorySearchTool(self.context.memory))
 
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -110,44 +185,151 @@ class AgentLoop:
         if self.cron_service:
             self.tools.register(CronTool(self.cron_service))
 
+    @staticmethod
+    def _make_search_cache(config: "WebSearchConfig") -> SearchCache | None:
+        """Create the web_search result cache (shared with subagents)."""
+        if config.cache_ttl <= 0:
+            return None
+        return SearchCache(
+            ttl=config.cache_ttl,
+            max_entries=config.cache_entries,
+            max_bytes=config.cache_mb * 1024 * 1024,
+        )
+
+    @staticmethod
+    def _make_web_cache(config: "WebFetchConfig") -> WebCache | None:
+        """Create the web_fetch page cache (shared with subagents)."""
+        if not config.cache:
+            return None
+        return WebCache(
+            Path.home() / ".nanobot" / "cache" / "web",
+            max_bytes=config.cache_mb * 1024 * 1024,
+            ttl_floor=config.cache_ttl,
+        )
+
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """
+        Run the agent loop, processing messages from the bus.
+
+        Each session gets its own worker: messages within a session are handled
+        in order, while different sessions run concurrently (at most
+        max_concurrency turns at a time).
+        """
         self._running = True
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max concurrency: {self.max_concurrency})")
 
         while self._running:
             try:
                 # Wait for next message
                 msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
-
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response
-                    await self.bus.publish_outbound(
-                        OutboundMessage(
-                            channel=msg.channel,
-                            chat_id=msg.chat_id,
-                            content=f"Sorry, I encountered an error: {str(e)}",
-                        )
-                    )
             except asyncio.TimeoutError:
                 continue
 
+            self._dispatch(msg)
+
+    def _dispatch(self, msg: InboundMessage) -> None:
+        """Queue a message on its session's worker, starting the worker if idle."""
+        key = self._dispatch_key(msg)
+        queue = self._session_queues.get(key)
+        if queue is None:
+            queue = self._session_queues[key] = deque()
+            self._workers[key] = asyncio.create_task(self._session_worker(key, queue))
+        queue.append(msg)
+
+    @staticmethod
+    def _dispatch_key(msg: InboundMessage) -> str:
+        """Get the ordering key for a message (system messages use their origin session)."""
+        # System messages carry the origin "channel:chat_id" in chat_id
+        if msg.channel == "system":
+            return msg.chat_id
+        return msg.session_key
+
+    async def _session_worker(self, key: str, queue: deque[InboundMessage]) -> None:
+        """Drain one session's queue in order, then exit."""
+        try:
+            while queue:
+                msg = queue.popleft()
+                async with self._semaphore:
+                    await self._handle_inbound(msg)
+        finally:
+            self._session_queues.pop(key, None)
+            self._workers.pop(key, None)
+
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one inbound message and publish the response (or an error reply)."""
+        # Only bus-driven turns stream to the chat; direct callers handle their own output
+        stream_id = str(uuid.uuid4())[:8] if self.streaming else None
+        try:
+            response = await self._process_message(msg, stream_id=stream_id)
+            if response:
+                await self.bus.publish_outbound(response)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            channel, chat_id = msg.channel, msg.chat_id
+            if channel == "system" and ":" in chat_id:
+                # System turns stream to their origin chat
+                channel, chat_id = chat_id.split(":", 1)
+            # Send error response; the stream_id finalizes any partial reply already shown
+            await self.bus.publish_outbound(
+                OutboundMessage(
+                    channel=channel,
+                    chat_id=chat_id,
+                    content=f"Sorry, I encountered an error: {str(e)}",
+                    stream_id=stream_id,
+                )
+            )
+
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
         logger.info("Agent loop stopping")
 
+    async def aclose(self) -> None:
+        """Stop the agent loop and cancel in-flight turns (queued messages are dropped)."""
+        self.stop()
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.log_cache_stats()
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Get the prompt-section, file and web search cache counters (for monitoring)."""
+        stats = self.context.cache_stats()
+        if self.search_cache is not None:
+            stats["search"] = self.search_cache.stats()
+        return stats
+
+    def log_cache_stats(self) -> None:
+        """Log a one-line summary of cache_stats()."""
+        stats = self.cache_stats()
+        parts = [
+            f"prompt {name} {s['hit_rate']:.0%} of {s['hits'] + s['misses']}"
+            for name, s in stats["sections"].items()
+        ]
+        files = stats["files"]
+        parts.append(f"files {files['hit_rate']:.0%} of {files['hits'] + files['misses']}")
+        search = stats.get("search")
+        if search:
+            lookups = search["hits"] + search["misses"] + search["coalesced"]
+            parts.append(f"search {search['hit_rate']:.0%} of {lookups} ({search['coalesced']} coalesced)")
+        logger.info(f"Cache stats: {', '.join(parts)}")
+
     def update_config(self, config: Any) -> None:
         self.model = config.agents.defaults.model
         self.max_iterations = config.agents.defaults.max_tool_iterations
         self.max_tokens = config.agents.defaults.max_tokens
         self.temperature = config.agents.defaults.temperature
+        self.streaming = config.agents.defaults.streaming
+        self.context_window = config.agents.defaults.context_window
+        self.max_history_tokens = config.agents.defaults.max_history_tokens
+        self.compaction_model = config.agents.defaults.compaction_model or None
+        self.context.memory_tokens = config.agents.defaults.memory_tokens
+        self.sessions.enable_compaction(
+            self._summarize_history,
+            config.agents.defaults.compaction_threshold,
+            config.agents.defaults.compaction_keep,
+        )
         self.brave_api_key = config.tools.web.search.api_key or None
         self.exec_config = config.tools.exec
         self.restrict_to_workspace = config.tools.restrict_to_workspace
@@ -163,6 +345,8 @@ class AgentLoop:
         if exec_tool:
             if hasattr(exec_tool, "timeout"):
                 setattr(exec_tool, "timeout", self.exec_config.timeout)
+            if hasattr(exec_tool, "max_output_bytes"):
+                setattr(exec_tool, "max_output_bytes", self.exec_config.max_output_mb * 1024 * 1024)
             if hasattr(exec_tool, "restrict_to_workspace"):
                 setattr(exec_tool, "restrict_to_workspace", self.restrict_to_workspace)
 
@@ -177,12 +361,164 @@ class AgentLoop:
 
         logger.info("Agent configuration updated via hot reload")
 
-    async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    def _set_tool_context(self, channel: str, chat_id: str) -> None:
+        """
+        Route message/spawn/cron tools to the current chat, and exec to its shell.
+
+        The context is stored per asyncio task, so concurrent turns keep
+        their own routing.
+        """
+        message_tool = self.tools.get("message")
+        if isinstance(message_tool, MessageTool):
+            message_tool.set_context(channel, chat_id)
+
+        spawn_tool = self.tools.get("spawn")
+        if isinstance(spawn_tool, SpawnTool):
+            spawn_tool.set_context(channel, chat_id)
+
+        cron_tool = self.tools.get("cron")
+        if isinstance(cron_tool, CronTool):
+            cron_tool.set_context(channel, chat_id)
+
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool):
+            exec_tool.set_context(f"{channel}:{chat_id}")
+
+    def _get_history(self, session: Session, current_message: str) -> list[dict[str, Any]]:
+        """
+        Get the most recent history that fits the model's context window.
+
+        Room is left for the system prompt, tool schemas, the current message,
+        the reply (max_tokens) and a safety margin; max_history_tokens caps
+        the result further.
+        """
+        window = self.context_window or self.provider.get_context_window(self.model)
+
+        if self._tool_schema_tokens[0] != len(self.tools):
+            schemas = json.dumps(self.tools.get_definitions())
+            self._tool_schema_tokens = (len(self.tools), count_tokens(schemas))
+
+        reserved = (
+            self._tool_schema_tokens[1]
+            + self.max_tokens
+            + int(window * self.CONTEXT_SAFETY_MARGIN)
+        )
+        budget = self.context.history_budget(current_message, window, reserved)
+        if self.max_history_tokens:
+            budget = min(budget, self.max_history_tokens)
+        return session.get_history(max_messages=None, max_tokens=budget)
+
+    async def _summarize_history(self, previous: str, messages: list[dict[str, Any]]) -> str:
+        """
+        Summarize older conversation turns for session compaction.
+
+        Runs in the background (see SessionManager.compact), optionally on a
+        cheaper compaction model.
+        """
+        transcript = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        request = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"## Previous summary\n{previous or '(none)'}\n\n## New messages\n{transcript}",
+            },
+        ]
+        response = await self.provider.chat(
+            messages=request,
+            model=self.compaction_model or self.model,
+            max_tokens=1024,
+            temperature=0.2,
+        )
+        if response.finish_reason == "error" or not response.content:
+            raise RuntimeError(response.content or "empty summary")
+        return response.content.strip()
+
+    async def _chat(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> LLMResponse:
+        """Call the LLM, streaming content deltas to on_delta if given."""
+        if on_delta:
+            return await self.provider.chat_stream(
+                messages=messages,
+                tools=self.tools.get_definitions(),
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                on_delta=on_delta,
+            )
+        return await self.provider.chat(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+
+    def _stream_to_channel(
+        self, channel: str, chat_id: str, stream_id: str
+    ) -> Callable[[str], Awaitable[None]]:
+        """
+        Build an on_delta callback that publishes partial replies to a chat.
+
+        Each partial message carries the text streamed so far in this LLM call;
+        updates are throttled to STREAM_INTERVAL_S so channels stay within
+        their edit rate limits. The first delta is published immediately.
+        """
+        text = ""
+        last_sent = 0.0
+
+        async def on_delta(delta: str) -> None:
+            nonlocal text, last_sent
+            text += delta
+            now = time.monotonic()
+            if not text.strip() or now - last_sent < self.STREAM_INTERVAL_S:
+                return
+            last_sent = now
+            await self.bus.publish_outbound(
+                OutboundMessage(
+                    channel=channel,
+                    chat_id=chat_id,
+                    content=text,
+                    stream_id=stream_id,
+                    partial=True,
+                )
+            )
+
+        return on_delta
+
+    async def _execute_tool_calls(
+        self, messages: list[dict[str, Any]], tool_calls: list[ToolCallRequest]
+    ) -> list[dict[str, Any]]:
+        """Run one iteration's tool calls and append their results in call order."""
+        for tool_call in tool_calls:
+            args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+            logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+
+        results = await self.tools.execute_batch(
+            [(tc.name, tc.arguments) for tc in tool_calls]
+        )
+        for tool_call, result in zip(tool_calls, results):
+            messages = self.context.add_tool_result(
+                messages, tool_call.id, tool_call.name, result
+            )
+        return messages
+
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+        stream_id: str | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
 
         Args:
             msg: The inbound message to process.
+            on_delta: Optional callback for streamed content deltas.
+            stream_id: If given, partial replies are published to the
+                message's chat under this stream ID.
 
         Returns:
             The response message, or None if no response needed.
@@ -190,30 +526,20 @@ class AgentLoop:
         # Handle system messages (subagent announces)
         # The chat_id contains the original "channel:chat_id" to route back to
         if msg.channel == "system":
-            return await self._process_system_message(msg)
+            return await self._process_system_message(msg, stream_id=stream_id)
 
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
 
         # Get or create session
-        session = self.sessions.get_or_create(msg.session_key)
+        session = await self.sessions.aget_or_create(msg.session_key)
 
         # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(msg.channel, msg.chat_id)
-
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
-
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(msg.channel, msg.chat_id)
+        self._set_tool_context(msg.channel, msg.chat_id)
 
         # Build initial messages (use get_history for LLM-formatted messages)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=self._get_history(session, msg.content),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
@@ -228,9 +554,9 @@ class AgentLoop:
             iteration += 1
 
             # Call LLM
-            response = await self.provider.chat(
-                messages=messages, tools=self.tools.get_definitions(), model=self.model
-            )
+            if stream_id:
+                on_delta = self._stream_to_channel(msg.channel, msg.chat_id, stream_id)
+            response = await self._chat(messages, on_delta)
 
             # Handle tool calls
             if response.has_tool_calls:
@@ -250,14 +576,8 @@ class AgentLoop:
                     messages, response.content, tool_call_dicts
                 )
 
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                # Execute tools (results appended in tool_call order)
+                messages = await self._execute_tool_calls(messages, response.tool_calls)
             else:
                 # No tool calls, we're done
                 final_content = response.content
@@ -275,9 +595,13 @@ class AgentLoop:
         session.add_message("assistant", final_content)
         self.sessions.save(session)
 
-        return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content=final_content)
+        return OutboundMessage(
+            channel=msg.channel, chat_id=msg.chat_id, content=final_content, stream_id=stream_id
+        )
 
-    async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    async def _process_system_message(
+        self, msg: InboundMessage, stream_id: str | None = None
+    ) -> OutboundMessage | None:
         """
         Process a system message (e.g., subagent announce).
 
@@ -298,24 +622,14 @@ class AgentLoop:
 
         # Use the origin session for context
         session_key = f"{origin_channel}:{origin_chat_id}"
-        session = self.sessions.get_or_create(session_key)
+        session = await self.sessions.aget_or_create(session_key)
 
         # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(origin_channel, origin_chat_id)
-
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
-
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(origin_channel, origin_chat_id)
+        self._set_tool_context(origin_channel, origin_chat_id)
 
         # Build messages with the announce content
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=self._get_history(session, msg.content),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
@@ -328,9 +642,12 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages, tools=self.tools.get_definitions(), model=self.model
+            on_delta = (
+                self._stream_to_channel(origin_channel, origin_chat_id, stream_id)
+                if stream_id
+                else None
             )
+            response = await self._chat(messages, on_delta)
 
             if response.has_tool_calls:
                 tool_call_dicts = [
@@ -345,13 +662,7 @@ class AgentLoop:
                     messages, response.content, tool_call_dicts
                 )
 
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                messages = await self._execute_tool_calls(messages, response.tool_calls)
             else:
                 final_content = response.content
                 break
@@ -365,7 +676,10 @@ class AgentLoop:
         self.sessions.save(session)
 
         return OutboundMessage(
-            channel=origin_channel, chat_id=origin_chat_id, content=final_content
+            channel=origin_channel,
+            chat_id=origin_chat_id,
+            content=final_content,
+            stream_id=stream_id,
         )
 
     async def process_direct(
@@ -374,6 +688,7 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
@@ -383,11 +698,12 @@ class AgentLoop:
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            on_delta: Optional callback receiving streamed content deltas.
 
         Returns:
             The agent's response.
         """
         msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content)
 
-        response = await self._process_message(msg)
+        response = await self._process_message(msg, on_delta=on_delta)
         return response.content if response else ""
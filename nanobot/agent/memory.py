@@ -1,9 +1,17 @@
 """Memory system for persistent agent memory."""
 
+import threading
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
 
+from nanobot.agent.memory_index import MemoryChunk, MemoryIndex
+from nanobot.utils.file_cache import FileCache, FileSignature, file_signature, shared_file_cache
 from nanobot.utils.helpers import ensure_dir, today_date
+from nanobot.utils.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from nanobot.utils.write_behind import WriteBehindQueue
 
 
 class MemoryStore:
@@ -11,12 +19,35 @@ class MemoryStore:
     Memory system for the agent.
     
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
+    
+    With a writer, daily-note appends are queued on its I/O thread; notes not
+    yet written are still visible to read_today.
+    
+    A MEMORY.md larger than the prompt budget is not injected whole: the
+    system prompt points at the file and select_long_term picks the sections
+    most relevant to each message.
     """
     
-    def __init__(self, workspace: Path):
+    # Weight of a chunk's position in MEMORY.md (later = newer) next to its
+    # relevance, which is normalized to [0, 1]
+    RECENCY_WEIGHT = 0.3
+    
+    def __init__(
+        self,
+        workspace: Path,
+        file_cache: FileCache | None = None,
+        writer: "WriteBehindQueue | None" = None,
+    ):
         self.workspace = workspace
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self.files = file_cache or shared_file_cache
+        self.writer = writer
+        # Appends queued but not yet written, per daily file
+        self._pending: dict[Path, list[str]] = {}
+        self._lock = threading.Lock()
+        self.index = MemoryIndex(self.memory_dir)
+        self._long_term_tokens: tuple[FileSignature, int] = (None, 0)
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
@@ -25,29 +56,99 @@ class MemoryStore:
     def read_today(self) -> str:
         """Read today's memory notes."""
         today_file = self.get_today_file()
-        if today_file.exists():
-            return today_file.read_text(encoding="utf-8")
-        return ""
+        with self._lock:  # Consistent with an append being written
+            existing = self.files.read_text(today_file)
+            pending = self._pending.get(today_file)
+            if pending:
+                return (existing or "") + self._format_append(today_file, existing is not None, pending)
+        return existing or ""
     
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
+        if self.writer is None:
+            self._write_appends(today_file, [content])
+            return
         
-        if today_file.exists():
-            existing = today_file.read_text(encoding="utf-8")
-            content = existing + "\n" + content
-        else:
-            # Add header for new day
-            header = f"# {today_date()}\n\n"
-            content = header + content
-        
-        today_file.write_text(content, encoding="utf-8")
+        with self._lock:
+            self._pending.setdefault(today_file, []).append(content)
+        self.writer.submit(("memory", today_file), lambda: self._flush_appends(today_file))
+    
+    def _flush_appends(self, path: Path) -> list[Path]:
+        """Write the queued appends for a daily file (runs on the I/O thread)."""
+        with self._lock:
+            chunks = self._pending.pop(path, None)
+            if not chunks:
+                return []
+            self._write_appends(path, chunks)
+        return [path]
+    
+    def _write_appends(self, path: Path, chunks: list[str]) -> None:
+        """Append notes to a daily file without rewriting it."""
+        exists = path.exists()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self._format_append(path, exists, chunks))
+    
+    @staticmethod
+    def _format_append(path: Path, exists: bool, chunks: list[str]) -> str:
+        """Text appended for notes: a header starts a new day's file."""
+        prefix = "\n" if exists else f"# {path.stem}\n\n"
+        return prefix + "\n".join(chunks)
     
     def read_long_term(self) -> str:
         """Read long-term memory (MEMORY.md)."""
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        return self.files.read_text(self.memory_file) or ""
+    
+    def long_term_tokens(self) -> int:
+        """Token count of MEMORY.md (recounted only when the file changes)."""
+        signature = file_signature(self.memory_file)
+        if signature != self._long_term_tokens[0]:
+            self._long_term_tokens = (signature, count_tokens(self.read_long_term()))
+        return self._long_term_tokens[1]
+    
+    def select_long_term(self, query: str, budget_tokens: int) -> str:
+        """
+        Pick the MEMORY.md sections most relevant to a message.
+        
+        Chunks (sections, or paragraphs of long sections) are scored by BM25
+        relevance to the query plus RECENCY_WEIGHT times their position in the
+        file, then taken best first while they fit in the budget.
+        
+        Args:
+            query: The current user message.
+            budget_tokens: Token budget for the selected text.
+        
+        Returns:
+            The selected chunks in file order, separated by blank lines.
+        """
+        self.index.refresh_file(self.memory_file)
+        ids = self.index.file_chunks(self.memory_file)
+        if not ids:
+            return ""
+        
+        relevance = self.index.score(query, paths={self.memory_file})
+        top = max(relevance.values(), default=0.0) or 1.0
+        ranked = sorted(
+            ids,
+            key=lambda i: relevance.get(i, 0.0) / top + self.RECENCY_WEIGHT * self.index.chunk(i).position,
+            reverse=True,
+        )
+        
+        chosen = []
+        used = 0
+        for chunk_id in ranked:
+            chunk = self.index.chunk(chunk_id)
+            if chunk.tokens is None:
+                chunk.tokens = count_tokens(chunk.text)
+            if used + chunk.tokens > budget_tokens:
+                continue  # A smaller chunk may still fit
+            chosen.append(chunk_id)
+            used += chunk.tokens
+            if budget_tokens - used < 16:
+                break
+        
+        order = {chunk_id: n for n, chunk_id in enumerate(ids)}
+        return "\n\n".join(self.index.chunk(i).text for i in sorted(chosen, key=order.get))
     
     def write_long_term(self, content: str) -> None:
         """Write to long-term memory (MEMORY.md)."""
@@ -71,14 +172,26 @@ class MemoryStore:
         for i in range(days):
             date = today - timedelta(days=i)
             date_str = date.strftime("%Y-%m-%d")
-            file_path = self.memory_dir / f"{date_str}.md"
+            content = self.files.read_text(self.memory_dir / f"{date_str}.md")
             
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8")
+            if content is not None:
                 memories.append(content)
         
         return "\n\n---\n\n".join(memories)
     
+    def search(self, query: str, limit: int = 5) -> list[tuple[float, MemoryChunk]]:
+        """
+        Full-text search over daily notes and MEMORY.md sections.
+        
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+        
+        Returns:
+            (score, chunk) pairs, best first.
+        """
+        return self.index.search(query, limit)
+    
     def list_memory_files(self) -> list[Path]:
         """List all memory files sorted by date (newest first)."""
         if not self.memory_dir.exists():
@@ -87,10 +200,14 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
-    def get_memory_context(self) -> str:
+    def get_memory_context(self, long_term_budget: int = 0) -> str:
         """
         Get memory context for the agent.
         
+        Args:
+            long_term_budget: Token budget for MEMORY.md (0 = no limit). A
+                larger file is replaced by a pointer; see select_long_term.
+        
         Returns:
             Formatted memory context including long-term and recent memories.
         """
@@ -98,7 +215,14 @@ class MemoryStore:
         
         # Long-term memory
         long_term = self.read_long_term()
-        if long_term:
+        if long_term and long_term_budget and self.long_term_tokens() > long_term_budget:
+            parts.append(
+                "## Long-term Memory\n"
+                f"{self.memory_file} is too large to include here. The sections most relevant "
+                "to each message are attached to it under [Relevant Memory]; read the file "
+                "or use memory_search for the rest."
+            )
+        elif long_term:
             parts.append("## Long-term Memory\n" + long_term)
         
         # Today's notes
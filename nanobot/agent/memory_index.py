@@ -0,0 +1,240 @@
+"""Full-text (BM25) index over memory notes."""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.file_cache import FileSignature, file_signature
+
+_WORD_RE = re.compile(r"\w+")
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+_DAILY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word terms."""
+    return _WORD_RE.findall(text.lower())
+
+
+@dataclass
+class MemoryChunk:
+    """A searchable piece of a memory file: one section, or part of a long one."""
+
+    path: Path
+    line: int  # 1-based line where the chunk starts
+    heading: str
+    text: str
+    date: str | None = None  # YYYY-MM-DD for daily notes
+    terms: Counter = field(default_factory=Counter, repr=False)
+    length: int = 0  # Number of terms
+    position: float = 0.0  # Where the chunk sits in its file (0 = top, 1 = bottom)
+    tokens: int | None = None  # LLM tokens of text, counted on first use
+
+
+def split_chunks(text: str, max_chars: int = 1200) -> list[tuple[int, str, str]]:
+    """
+    Split markdown into chunks at headings, then at paragraphs.
+
+    A section longer than max_chars is split between paragraphs (or lines,
+    for a single long paragraph) so each chunk stays small enough to score
+    and quote on its own.
+
+    Returns:
+        (start line, heading, text) for each non-empty chunk.
+    """
+    sections: list[tuple[int, str, list[str]]] = []
+    heading, start, lines = "", 1, []
+    for number, line in enumerate(text.splitlines(), 1):
+        match = _HEADING_RE.match(line)
+        if match:
+            if lines:
+                sections.append((start, heading, lines))
+            heading, start, lines = match.group(1).strip(), number, [line]
+        else:
+            if not lines:
+                start = number
+            lines.append(line)
+    if lines:
+        sections.append((start, heading, lines))
+
+    chunks: list[tuple[int, str, str]] = []
+    for start, heading, lines in sections:
+        chunk_start, buf, size = start, [], 0
+        for number, line in enumerate(lines, start):
+            # Break at a paragraph once the chunk is half full, or before it overflows
+            if buf and (size + len(line) > max_chars or (not line.strip() and size >= max_chars // 2)):
+                chunks.append((chunk_start, heading, "\n".join(buf).strip()))
+                buf, size = [], 0
+            if not buf:
+                if not line.strip():
+                    continue
+                chunk_start = number
+            buf.append(line)
+            size += len(line) + 1
+        if buf:
+            chunks.append((chunk_start, heading, "\n".join(buf).strip()))
+    return chunks
+
+
+class MemoryIndex:
+    """
+    Inverted index over memory/YYYY-MM-DD.md and MEMORY.md, ranked with BM25.
+
+    refresh() re-reads only files whose signature (mtime, size, inode)
+    changed since they were indexed and drops files that disappeared, so
+    keeping the index current costs one stat() per note file.
+    """
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, memory_dir: Path):
+        self.memory_dir = memory_dir
+        self._files: dict[Path, tuple[FileSignature, list[int]]] = {}
+        self._chunks: dict[int, MemoryChunk] = {}
+        self._postings: dict[str, dict[int, int]] = {}  # term -> {chunk id: term frequency}
+        self._total_length = 0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the memory directory."""
+        paths = list(self.memory_dir.glob("????-??-??.md"))
+        paths.append(self.memory_dir / "MEMORY.md")
+
+        seen = {path for path in paths if self.refresh_file(path)}
+        for path in [p for p in self._files if p not in seen]:
+            self._remove_file(path)
+
+    def refresh_file(self, path: Path) -> bool:
+        """
+        Re-index one file if it changed.
+
+        Returns:
+            False if the file does not exist (it is dropped from the index).
+        """
+        signature = file_signature(path)
+        if signature is None:
+            self._remove_file(path)
+            return False
+        indexed = self._files.get(path)
+        if indexed and indexed[0] == signature:
+            return True
+        self._remove_file(path)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to index memory file {path.name}: {e}")
+            return True
+        self._add_file(path, signature, text)
+        return True
+
+    def file_chunks(self, path: Path) -> list[int]:
+        """Ids of the indexed chunks of a file, in file order."""
+        return list(self._files.get(path, (None, []))[1])
+
+    def _add_file(self, path: Path, signature: FileSignature, text: str) -> None:
+        date = path.stem if _DAILY_RE.match(path.stem) else None
+        ids = []
+        pieces = split_chunks(text)
+        for i, (line, heading, body) in enumerate(pieces):
+            terms = Counter(tokenize(body))
+            if not terms:
+                continue
+            position = i / (len(pieces) - 1) if len(pieces) > 1 else 1.0
+            chunk = MemoryChunk(path, line, heading, body, date, terms, sum(terms.values()), position)
+            chunk_id = self._next_id
+            self._next_id += 1
+            self._chunks[chunk_id] = chunk
+            self._total_length += chunk.length
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[chunk_id] = tf
+            ids.append(chunk_id)
+        self._files[path] = (signature, ids)
+
+    def _remove_file(self, path: Path) -> None:
+        _, ids = self._files.pop(path, (None, []))
+        for chunk_id in ids:
+            chunk = self._chunks.pop(chunk_id)
+            self._total_length -= chunk.length
+            for term in chunk.terms:
+                posting = self._postings[term]
+                del posting[chunk_id]
+                if not posting:
+                    del self._postings[term]
+
+    def score(self, query: str, paths: set[Path] | None = None) -> dict[int, float]:
+        """
+        BM25 scores of the chunks matching any query term.
+
+        Args:
+            query: Free-text query.
+            paths: Only score chunks of these files (None for all).
+
+        Returns:
+            {chunk id: score} for matching chunks.
+        """
+        n = len(self._chunks)
+        if not n:
+            return {}
+        avg_length = self._total_length / n
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for chunk_id, tf in posting.items():
+                chunk = self._chunks[chunk_id]
+                if paths is not None and chunk.path not in paths:
+                    continue
+                norm = self.K1 * (1 - self.B + self.B * chunk.length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+    def chunk(self, chunk_id: int) -> MemoryChunk:
+        """Get an indexed chunk by id."""
+        return self._chunks[chunk_id]
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[float, MemoryChunk]]:
+        """
+        Rank memory chunks against a query.
+
+        Ties are broken in favour of newer daily notes.
+
+        Returns:
+            Up to `limit` (score, chunk) pairs, best first.
+        """
+        self.refresh()
+        scores = self.score(query)
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (item[1], self._chunks[item[0]].date or ""),
+            reverse=True,
+        )
+        return [(score, self._chunks[chunk_id]) for chunk_id, score in ranked[:limit]]
+
+
+def snippet(chunk: MemoryChunk, query: str, max_chars: int = 400) -> str:
+    """Quote the lines of a chunk that mention query terms, up to max_chars."""
+    wanted = set(tokenize(query))
+    lines = [line for line in chunk.text.splitlines() if line.strip()]
+    hits = [line for line in lines if wanted & set(tokenize(line))] or lines
+
+    out: list[str] = []
+    size = 0
+    for line in hits:
+        if size + len(line) > max_chars:
+            if not out:
+                out.append(line[:max_chars] + "...")
+            break
+        out.append(line)
+        size += len(line) + 1
+    return "\n".join(out)
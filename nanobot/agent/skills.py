@@ -4,11 +4,18 @@ import json
 import os
 import re
 import shutil
+import time
 from pathlib import Path
+from typing import Any
+
+from nanobot.utils.file_cache import FileCache, shared_file_cache
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# How long a `shutil.which` result for a required binary is trusted
+DEFAULT_PROBE_TTL_S = 60.0
+
 
 class SkillsLoader:
     """
@@ -16,12 +23,90 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+    
+    The loader keeps an in-memory index: directory listings are cached by
+    directory mtime, each SKILL.md is read and parsed once per file version,
+    and required-binary lookups are cached for probe_ttl seconds.
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        file_cache: FileCache | None = None,
+        probe_ttl: float = DEFAULT_PROBE_TTL_S,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.files = file_cache or shared_file_cache
+        self.probe_ttl = probe_ttl
+        # skills root -> (directory mtime_ns, sorted subdirectory names)
+        self._dir_listings: dict[Path, tuple[int, list[str]]] = {}
+        # SKILL.md path -> (file signature, parsed skill record)
+        self._records: dict[Path, tuple[Any, dict[str, Any]]] = {}
+        # binary name -> (probe time, found)
+        self._bin_probes: dict[str, tuple[float, bool]] = {}
+    
+    def _skill_roots(self) -> list[tuple[Path, str]]:
+        """Skills directories with their source label, highest priority first."""
+        roots = [(self.workspace_skills, "workspace")]
+        if self.builtin_skills:
+            roots.append((self.builtin_skills, "builtin"))
+        return roots
+    
+    def _list_skill_dirs(self, root: Path) -> list[str]:
+        """List subdirectory names of a skills root, cached by the root's mtime."""
+        try:
+            mtime = root.stat().st_mtime_ns
+        except OSError:
+            self._dir_listings.pop(root, None)
+            return []
+        
+        cached = self._dir_listings.get(root)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        names = sorted(e.name for e in os.scandir(root) if e.is_dir())
+        self._dir_listings[root] = (mtime, names)
+        return names
+    
+    def _read_skill(self, path: Path) -> dict[str, Any] | None:
+        """
+        Get the parsed record for a SKILL.md, re-parsing only when it changed.
+        
+        Returns:
+            Dict with 'content', 'body' (frontmatter stripped), 'metadata'
+            (frontmatter dict or None) and 'nanobot' (parsed nanobot metadata),
+            or None if the file does not exist.
+        """
+        # One stat per lookup, shared with the file cache
+        signature, content = self.files.read(path)
+        if content is None:
+            self._records.pop(path, None)
+            return None
+        
+        cached = self._records.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        metadata = self._parse_frontmatter(content)
+        record = {
+            "content": content,
+            "body": self._strip_frontmatter(content),
+            "metadata": metadata,
+            "nanobot": self._parse_nanobot_metadata((metadata or {}).get("metadata", "")),
+        }
+        self._records[path] = (signature, record)
+        return record
+    
+    def _find_skill(self, name: str) -> dict[str, Any] | None:
+        """Get the record for a skill by name (workspace overrides built-in)."""
+        for root, _ in self._skill_roots():
+            record = self._read_skill(root / name / "SKILL.md")
+            if record is not None:
+                return record
+        return None
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -34,22 +119,17 @@ class SkillsLoader:
             List of skill info dicts with 'name', 'path', 'source'.
         """
         skills = []
+        seen: set[str] = set()
         
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
+        # Workspace skills first (highest priority), then built-in
+        for root, source in self._skill_roots():
+            for name in self._list_skill_dirs(root):
+                if name in seen:
+                    continue
+                skill_file = root / name / "SKILL.md"
+                if self._read_skill(skill_file) is not None:
+                    seen.add(name)
+                    skills.append({"name": name, "path": str(skill_file), "source": source})
         
         # Filter by requirements
         if filter_unavailable:
@@ -66,18 +146,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        record = self._find_skill(name)
+        return record["content"] if record else None
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -91,10 +161,9 @@ class SkillsLoader:
         """
         parts = []
         for name in skill_names:
-            content = self.load_skill(name)
-            if content:
-                content = self._strip_frontmatter(content)
-                parts.append(f"### Skill: {name}\n\n{content}")
+            record = self._find_skill(name)
+            if record and record["content"]:
+                parts.append(f"### Skill: {name}\n\n{record['body']}")
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
@@ -117,10 +186,11 @@ class SkillsLoader:
         
         lines = ["<skills>"]
         for s in all_skills:
+            record = self._read_skill(Path(s["path"])) or {}
             name = escape_xml(s["name"])
             path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
+            desc = escape_xml((record.get("metadata") or {}).get("description") or s["name"])
+            skill_meta = record.get("nanobot", {})
             available = self._check_requirements(skill_meta)
             
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
@@ -139,12 +209,23 @@ class SkillsLoader:
         
         return "\n".join(lines)
     
+    def _has_bin(self, name: str) -> bool:
+        """Check if a binary is on PATH, caching the answer for probe_ttl seconds."""
+        now = time.monotonic()
+        cached = self._bin_probes.get(name)
+        if cached and now - cached[0] < self.probe_ttl:
+            return cached[1]
+        
+        found = shutil.which(name) is not None
+        self._bin_probes[name] = (now, found)
+        return found
+    
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -178,7 +259,7 @@ class SkillsLoader:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -186,17 +267,17 @@ class SkillsLoader:
         return True
     
     def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
+        """Get nanobot metadata for a skill (parsed from frontmatter)."""
+        record = self._find_skill(name)
+        return record["nanobot"] if record else {}
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
         result = []
         for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
+            record = self._find_skill(s["name"]) or {}
+            meta = record.get("metadata") or {}
+            if record.get("nanobot", {}).get("always") or meta.get("always"):
                 result.append(s["name"])
         return result
     
@@ -210,10 +291,11 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
+        record = self._find_skill(name)
+        return record["metadata"] if record else None
+    
+    def _parse_frontmatter(self, content: str) -> dict | None:
+        """Parse simple `key: value` YAML frontmatter into a dict."""
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
@@ -13,6 +13,7 @@ from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
 
@@ -35,6 +36,11 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        http: "HttpClients | None" = None,
+        web_cache: "WebCache | None" = None,
+        extractor: "ExtractionPool | None" = None,
+        search_cache: "SearchCache | None" = None,
+        shells: "ShellPool | None" = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -44,6 +50,11 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.http = http
+        self.web_cache = web_cache
+        self.extractor = extractor
+        self.search_cache = search_cache
+        self.shells = shells
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -102,13 +113,18 @@ class SubagentManager:
             tools.register(ReadFileTool(allowed_dir=allowed_dir))
             tools.register(WriteFileTool(allowed_dir=allowed_dir))
             tools.register(ListDirTool(allowed_dir=allowed_dir))
+            tools.register(SearchFilesTool(working_dir=str(self.workspace), allowed_dir=allowed_dir))
             tools.register(ExecTool(
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
+                shells=self.shells,
+                max_output_bytes=self.exec_config.max_output_mb * 1024 * 1024,
+                spill_dir=self.workspace / ".exec-output" if self.exec_config.spill_output else None,
+                session=f"subagent:{task_id}",
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools.register(WebSearchTool(api_key=self.brave_api_key, http=self.http, cache=self.search_cache))
+            tools.register(WebFetchTool(http=self.http, cache=self.web_cache, extractor=self.extractor))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -150,11 +166,14 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
+                    # Execute tools (safe calls run in parallel, results kept in order)
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_batch(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
@@ -175,6 +194,9 @@ class SubagentManager:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
             await self._announce_result(task_id, label, task, error_msg, origin, "error")
+        finally:
+            if self.shells is not None:
+                self.shells.close(f"subagent:{task_id}")
     
     async def _announce_result(
         self,
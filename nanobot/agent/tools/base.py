@@ -52,6 +52,15 @@ class Tool(ABC):
         """
         pass
 
+    @property
+    def concurrency_safe(self) -> bool:
+        """
+        Whether calls may run concurrently with other safe calls.
+
+        Only read-only tools without shared mutable state should return True.
+        """
+        return False
+
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
         schema = self.parameters or {}
@@ -1,5 +1,6 @@
 """Cron tool for scheduling reminders and tasks."""
 
+from contextvars import ContextVar
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -12,13 +13,13 @@ class CronTool(Tool):
     
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        self._context: ContextVar[tuple[str, str]] = ContextVar(
+            "cron_context", default=("", "")
+        )
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        """Set the current session context for delivery (scoped to the running task)."""
+        self._context.set((channel, chat_id))
     
     @property
     def name(self) -> str:
@@ -78,7 +79,8 @@ class CronTool(Tool):
     def _add_job(self, message: str, every_seconds: int | None, cron_expr: str | None) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = self._context.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         
         # Build schedule
@@ -94,8 +96,8 @@ class CronTool(Tool):
             schedule=schedule,
             message=message,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
         )
         return f"Created job '{job.name}' (id: {job.id})"
     
@@ -1,9 +1,17 @@
 """File system tools: read, write, edit."""
 
+import asyncio
+import difflib
+import fnmatch
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.line_index import LineIndexCache, shared_line_index_cache
 
 
 def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
@@ -14,19 +22,47 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
     return resolved
 
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file's contents via a temp file and rename, keeping its permissions."""
+    mode = path.stat().st_mode & 0o7777 if path.exists() else None
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
-    def __init__(self, allowed_dir: Path | None = None):
+    # Largest response; bigger files are returned a page at a time
+    MAX_BYTES = 128 * 1024
+    DEFAULT_LINES = 2000
+    
+    def __init__(self, allowed_dir: Path | None = None, line_indexes: LineIndexCache | None = None):
         self._allowed_dir = allowed_dir
+        self._line_indexes = line_indexes or shared_line_index_cache
 
     @property
     def name(self) -> str:
         return "read_file"
     
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. Large files are returned a page "
+            "at a time with their total size and line count; use offset/limit (lines) or "
+            "byte_offset/byte_limit to read other parts."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -36,12 +72,40 @@ class ReadFileTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The file path to read"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start from (1-based)",
+                    "minimum": 1
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of lines to return (default {self.DEFAULT_LINES})",
+                    "minimum": 1
+                },
+                "byte_offset": {
+                    "type": "integer",
+                    "description": "Byte position to start from (instead of offset)",
+                    "minimum": 0
+                },
+                "byte_limit": {
+                    "type": "integer",
+                    "description": f"Maximum number of bytes to return (at most {self.MAX_BYTES})",
+                    "minimum": 1
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        byte_offset: int | None = None,
+        byte_limit: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
@@ -49,12 +113,72 @@ class ReadFileTool(Tool):
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
             
-            content = file_path.read_text(encoding="utf-8")
-            return content
+            ranged = any(v is not None for v in (offset, limit, byte_offset, byte_limit))
+            if not ranged and file_path.stat().st_size <= self.MAX_BYTES:
+                return file_path.read_text(encoding="utf-8")
+            
+            return await asyncio.to_thread(self._read_page, file_path, offset, limit, byte_offset, byte_limit)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
+    
+    def _read_page(
+        self,
+        file_path: Path,
+        offset: int | None,
+        limit: int | None,
+        byte_offset: int | None,
+        byte_limit: int | None,
+    ) -> str:
+        """Read one page of a file through mmap and the cached line index."""
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return "[File: 0 bytes, 0 lines]"
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if b"\0" in mm[:8192]:
+                    return f"Error: {file_path.name} looks like a binary file ({len(mm)} bytes)"
+                index = self._line_indexes.get(file_path, mm)
+                header = f"File: {index.size} bytes, {index.lines} lines"
+                
+                if byte_offset is not None and offset is None:
+                    start = min(byte_offset, index.size)
+                    end = min(start + min(byte_limit or self.MAX_BYTES, self.MAX_BYTES), index.size)
+                    # Keep multi-byte characters whole
+                    while start < end and mm[start] & 0xC0 == 0x80:
+                        start += 1
+                    while start < end < index.size and mm[end] & 0xC0 == 0x80:
+                        end -= 1
+                    shown = f"bytes {start}-{end} shown"
+                    more = f", use byte_offset={end} to continue" if end < index.size else ""
+                    return f"[{header}; {shown}{more}]\n{mm[start:end].decode('utf-8', errors='replace')}"
+                
+                first = (offset or 1) - 1
+                if first >= index.lines:
+                    return f"Error: offset {first + 1} is past the end of the file ({index.lines} lines)"
+                count = limit or self.DEFAULT_LINES
+                start = index.line_start(mm, first)
+                end = start
+                last = first
+                cap = start + min(byte_limit or self.MAX_BYTES, self.MAX_BYTES)
+                while last < first + count and end < index.size:
+                    nl = mm.find(b"\n", end)
+                    line_end = index.size if nl < 0 else nl + 1
+                    if line_end > cap:
+                        if last == first:
+                            end = cap  # A single huge line: return its beginning
+                        break
+                    end = line_end
+                    last += 1
+                
+                text = mm[start:end].decode("utf-8", errors="replace")
+                if last == first:
+                    shown = f"line {first + 1} cut at {end - start} bytes, use byte_offset={end} to continue"
+                else:
+                    shown = f"lines {first + 1}-{last} shown"
+                    if last < index.lines:
+                        shown += f", use offset={last + 1} to continue"
+                return f"[{header}; {shown}]\n{text}"
 
 
 class WriteFileTool(Tool):
@@ -103,6 +227,8 @@ class WriteFileTool(Tool):
 class EditFileTool(Tool):
     """Tool to edit a file by replacing text."""
     
+    MAX_DIFF_LINES = 40  # Diff lines shown after a successful edit
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
@@ -112,7 +238,11 @@ class EditFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+        return (
+            "Edit a file by replacing old_text with new_text. The old_text must exist exactly once "
+            "in the file. To make several changes at once, pass `edits` instead: all of them are "
+            "checked against the current file and applied together, or none are."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -130,40 +260,150 @@ class EditFileTool(Tool):
                 "new_text": {
                     "type": "string",
                     "description": "The text to replace with"
+                },
+                "edits": {
+                    "type": "array",
+                    "description": "Several replacements, applied together (instead of old_text/new_text)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_text": {"type": "string"},
+                            "new_text": {"type": "string"}
+                        },
+                        "required": ["old_text", "new_text"]
+                    }
                 }
             },
-            "required": ["path", "old_text", "new_text"]
+            "required": ["path"]
         }
     
-    async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        old_text: str | None = None,
+        new_text: str | None = None,
+        edits: list[dict[str, str]] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        if edits is None:
+            if old_text is None or new_text is None:
+                return "Error: Provide old_text and new_text, or edits"
+            edits = [{"old_text": old_text, "new_text": new_text}]
+        if not edits:
+            return "Error: edits is empty"
+        
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             
-            content = file_path.read_text(encoding="utf-8")
+            raw = file_path.read_bytes().decode("utf-8")
+            # Edits are written with "\n"; keep a CRLF file CRLF
+            crlf = "\r\n" in raw
+            content = raw.replace("\r\n", "\n") if crlf else raw
             
-            if old_text not in content:
-                return f"Error: old_text not found in file. Make sure it matches exactly."
-            
-            # Count occurrences
-            count = content.count(old_text)
-            if count > 1:
-                return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
+            spans, errors = self._locate(content, edits)
+            if errors:
+                if len(edits) == 1:
+                    return errors[0].split(": ", 1)[1]
+                return (
+                    f"Error: {len(errors)} of {len(edits)} edits failed; {path} was not changed.\n"
+                    + "\n".join(errors)
+                )
             
-            new_content = content.replace(old_text, new_text, 1)
-            file_path.write_text(new_content, encoding="utf-8")
+            parts = []
+            pos = 0
+            for start, end, replacement in spans:
+                parts.append(content[pos:start])
+                parts.append(replacement)
+                pos = end
+            parts.append(content[pos:])
+            new_content = "".join(parts)
             
-            return f"Successfully edited {path}"
+            data = new_content.replace("\n", "\r\n") if crlf else new_content
+            _write_atomic(file_path, data.encode("utf-8"))
+            return f"Successfully edited {path}\n{self._diff_summary(content, new_content, len(edits))}"
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error editing file: {str(e)}"
+    
+    @staticmethod
+    def _locate(content: str, edits: list[dict[str, str]]) -> tuple[list[tuple[int, int, str]], list[str]]:
+        """
+        Find where each edit applies in the original content.
+        
+        Returns:
+            (start, end, replacement) spans in file order, and one error
+            message per edit that is missing, ambiguous or overlaps another.
+        """
+        spans = []
+        errors = []
+        for i, edit in enumerate(edits, 1):
+            old, new = edit.get("old_text"), edit.get("new_text")
+            if not isinstance(old, str) or not isinstance(new, str) or not old:
+                errors.append(f"- edit {i}: Error: old_text and new_text are required")
+                continue
+            start = content.find(old)
+            if start < 0:
+                errors.append(f"- edit {i}: Error: old_text not found in file. Make sure it matches exactly.")
+                continue
+            count = content.count(old)
+            if count > 1:
+                errors.append(
+                    f"- edit {i}: Warning: old_text appears {count} times. "
+                    "Please provide more context to make it unique."
+                )
+                continue
+            spans.append((start, start + len(old), new, i))
+        
+        spans.sort()
+        for (_, prev_end, _, a), (start, _, _, b) in zip(spans, spans[1:]):
+            if start < prev_end:
+                errors.append(f"- edit {b}: Error: old_text overlaps edit {a}")
+        return [(start, end, new) for start, end, new, _ in spans], errors
+    
+    def _diff_summary(self, old: str, new: str, edits: int) -> str:
+        """Summarize a change as line counts and a short zero-context diff."""
+        diff = list(difflib.unified_diff(old.splitlines(), new.splitlines(), n=0, lineterm=""))[2:]
+        added = sum(1 for line in diff if line.startswith("+"))
+        removed = sum(1 for line in diff if line.startswith("-"))
+        header = f"{edits} edit{'s' if edits != 1 else ''}, +{added} -{removed} lines"
+        if len(diff) > self.MAX_DIFF_LINES:
+            diff = diff[:self.MAX_DIFF_LINES] + [f"... ({len(diff) - self.MAX_DIFF_LINES} more diff lines)"]
+        return "\n".join([header, *diff])
+
+
+def _format_size(size: float) -> str:
+    """Human-readable byte count."""
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024:
+            break
+    return f"{size:.1f} {unit}"
+
+
+@dataclass
+class _Listing:
+    """Options and running state of one list_dir call."""
+
+    depth: int
+    include_sizes: bool
+    pattern: str | None
+    max_entries: int
+    lines: list[str] = field(default_factory=list)
 
 
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
+    DEFAULT_ENTRIES = 200
+    MAX_ENTRIES = 2000
+    MAX_DEPTH = 10
+    DIR_ENTRIES = 50  # Entries shown per directory in recursive listings
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
@@ -171,9 +411,16 @@ class ListDirTool(Tool):
     def name(self) -> str:
         return "list_dir"
     
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
-        return "List the contents of a directory."
+        return (
+            "List the contents of a directory. Set depth > 1 to see a whole tree in one call; "
+            "large directories are summarized with counts."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -183,12 +430,40 @@ class ListDirTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The directory path to list"
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Levels to descend (default 1: this directory only)",
+                    "minimum": 1,
+                    "maximum": self.MAX_DEPTH
+                },
+                "include_sizes": {
+                    "type": "boolean",
+                    "description": "Show file sizes and entry counts of unexpanded directories"
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": "Only show files whose name matches this glob, e.g. '*.py'"
+                },
+                "max_entries": {
+                    "type": "integer",
+                    "description": f"Maximum lines to return (default {self.DEFAULT_ENTRIES})",
+                    "minimum": 1,
+                    "maximum": self.MAX_ENTRIES
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        depth: int = 1,
+        include_sizes: bool = False,
+        pattern: str | None = None,
+        max_entries: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             dir_path = _resolve_path(path, self._allowed_dir)
             if not dir_path.exists():
@@ -196,16 +471,95 @@ class ListDirTool(Tool):
             if not dir_path.is_dir():
                 return f"Error: Not a directory: {path}"
             
-            items = []
-            for item in sorted(dir_path.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
-                items.append(f"{prefix}{item.name}")
+            listing = _Listing(
+                depth=min(max(depth, 1), self.MAX_DEPTH),
+                include_sizes=include_sizes,
+                pattern=pattern or None,
+                max_entries=min(max_entries or self.DEFAULT_ENTRIES, self.MAX_ENTRIES),
+            )
+            await asyncio.to_thread(self._walk, dir_path, 0, listing)
             
-            if not items:
-                return f"Directory {path} is empty"
+            if not listing.lines:
+                return f"No files match {pattern} in {path}" if pattern else f"Directory {path} is empty"
             
-            return "\n".join(items)
+            return "\n".join(listing.lines)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {str(e)}"
+    
+    def _walk(self, directory: Path, level: int, listing: _Listing) -> int:
+        """
+        Append the tree under a directory to the listing.
+        
+        Each entry's type (and, with include_sizes, its stat) comes from a
+        single os.scandir pass. Returns the number of files shown, so that
+        directories without pattern matches can be dropped.
+        """
+        indent = "  " * level
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        
+        lines = listing.lines
+        per_dir = listing.max_entries if listing.depth == 1 else self.DIR_ENTRIES
+        shown = files = 0
+        hidden_files = hidden_dirs = hidden_bytes = 0
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and listing.pattern and not fnmatch.fnmatch(entry.name, listing.pattern):
+                    continue
+                expand = is_dir and level + 1 < listing.depth and not entry.is_symlink() and entry.name != ".git"
+                if is_dir and listing.pattern and not expand:
+                    continue  # Can't tell whether it holds matches
+                
+                if shown >= per_dir or len(lines) >= listing.max_entries:
+                    if is_dir:
+                        hidden_dirs += 1
+                    else:
+                        hidden_files += 1
+                        if listing.include_sizes:
+                            hidden_bytes += entry.stat().st_size
+                    continue
+                
+                if not is_dir:
+                    size = f" ({_format_size(entry.stat().st_size)})" if listing.include_sizes else ""
+                    lines.append(f"{indent}📄 {entry.name}{size}")
+                    files += 1
+                    shown += 1
+                    continue
+                
+                if not expand:
+                    count = ""
+                    if listing.include_sizes:
+                        with os.scandir(entry.path) as sub:
+                            n = sum(1 for _ in sub)
+                        count = f" ({n} entr{'y' if n == 1 else 'ies'})"
+                    lines.append(f"{indent}📁 {entry.name}{count}")
+                    shown += 1
+                    continue
+                
+                mark = len(lines)
+                lines.append(f"{indent}📁 {entry.name}")
+                try:
+                    found = self._walk(Path(entry.path), level + 1, listing)
+                except OSError as e:
+                    lines.append(f"{indent}  (unreadable: {e.strerror})")
+                    found = 0
+                if listing.pattern and not found:
+                    del lines[mark:]
+                    continue
+                files += found
+                shown += 1
+            except OSError:
+                continue
+        
+        if hidden_files or hidden_dirs:
+            parts = []
+            if hidden_files:
+                parts.append(f"{hidden_files} file{'s' if hidden_files != 1 else ''}")
+            if hidden_dirs:
+                parts.append(f"{hidden_dirs} dir{'s' if hidden_dirs != 1 else ''}")
+            size = f", {_format_size(hidden_bytes)}" if hidden_bytes else ""
+            lines.append(f"{indent}... {hidden_files + hidden_dirs} more ({', '.join(parts)}{size})")
+        return files + hidden_files
@@ -0,0 +1,68 @@
+"""Memory search tool."""
+
+from typing import Any
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.memory_index import snippet
+from nanobot.agent.tools.base import Tool
+
+
+class MemorySearchTool(Tool):
+    """Tool to search daily notes and long-term memory."""
+    
+    def __init__(self, memory: MemoryStore):
+        self._memory = memory
+    
+    @property
+    def name(self) -> str:
+        return "memory_search"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search your memory (daily notes in memory/YYYY-MM-DD.md and sections of MEMORY.md) "
+            "by keywords. Returns ranked snippets with dates and line numbers; use read_file "
+            "for the full note."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords to search for"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (default 5)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["query"]
+        }
+    
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+    
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        results = self._memory.search(query, limit)
+        if not results:
+            return f"No memory notes match: {query}"
+        
+        workspace = self._memory.workspace
+        lines = []
+        for score, chunk in results:
+            label = chunk.date or "long-term"
+            try:
+                location = chunk.path.relative_to(workspace)
+            except ValueError:
+                location = chunk.path
+            heading = f" ({chunk.heading})" if chunk.heading and chunk.heading != chunk.date else ""
+            lines.append(f"[{label}] {location}:{chunk.line}{heading} score={score:.2f}")
+            lines.append(snippet(chunk, query))
+            lines.append("")
+        return "\n".join(lines).rstrip()
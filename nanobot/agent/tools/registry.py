@@ -1,5 +1,6 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -12,8 +13,9 @@ class ToolRegistry:
     Allows dynamic registration and execution of tools.
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4):
         self._tools: dict[str, Tool] = {}
+        self.max_concurrency = max_concurrency
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -61,6 +63,42 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute several tool calls, running concurrency-safe ones in parallel.
+
+        Consecutive safe calls run together (at most max_concurrency at once);
+        any other call waits for them and runs alone, so side effects keep
+        their original order.
+
+        Args:
+            calls: (name, params) pairs in the order the model issued them.
+
+        Returns:
+            Results in the same order as calls.
+        """
+        results = [""] * len(calls)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def run(index: int, name: str, params: dict[str, Any]) -> None:
+            async with semaphore:
+                results[index] = await self.execute(name, params)
+
+        pending = []
+        for i, (name, params) in enumerate(calls):
+            tool = self._tools.get(name)
+            if tool and tool.concurrency_safe:
+                pending.append(run(i, name, params))
+                continue
+            if pending:
+                await asyncio.gather(*pending)
+                pending = []
+            results[i] = await self.execute(name, params)
+        if pending:
+            await asyncio.gather(*pending)
+
+        return results
+    
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -0,0 +1,301 @@
+"""File search tool: find files by glob and search their contents by regex."""
+
+import asyncio
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _resolve_path
+from nanobot.utils.gitignore import GitIgnore, compile_glob
+
+MAX_FILE_BYTES = 5 * 1024 * 1024  # Larger files are not searched
+MAX_LINE_CHARS = 300  # Longer matching lines are cut in the output
+SNIFF_BYTES = 8192  # A NUL byte in this prefix marks a file as binary
+_META = re.compile(r"[\\^$.|?*+()\[\]{}]")
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+@dataclass
+class _Walk:
+    """Shared state of one search."""
+
+    root: str  # Search root as a "/" path relative to the walk's top directory
+    glob: re.Pattern[str] | None
+    regex: re.Pattern[str] | None
+    # Lowercased pattern for case-insensitive literal searches, which re scans slowly
+    literal: str | None
+    context: int
+    max_results: int
+    # (path, matching line number, number of the first line shown, lines shown)
+    results: list[tuple[str, int, int, list[str]]] = field(default_factory=list)
+    files_searched: int = 0
+    skipped: int = 0
+    capped: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SearchFilesTool(Tool):
+    """Tool to find files by name and search their contents."""
+
+    DEFAULT_RESULTS = 100
+    MAX_RESULTS = 500
+
+    def __init__(self, working_dir: str | None = None, allowed_dir: Path | None = None, workers: int = 8):
+        self.working_dir = working_dir
+        self._allowed_dir = allowed_dir
+        self.workers = workers
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search a directory tree in one call. With `pattern`, returns lines matching the "
+            "regex (grep-like, as path:line: text); without it, lists files matching `glob`. "
+            "Skips .gitignored paths and binary files."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Regular expression to search file contents for"
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only files matching this glob, e.g. '*.py' or 'src/**/*.ts'"
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Directory to search (default: workspace)"
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Case-insensitive pattern matching"
+                },
+                "context": {
+                    "type": "integer",
+                    "description": "Lines of context around each match (default 0)",
+                    "minimum": 0,
+                    "maximum": 10
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": f"Maximum matches or files to return (default {self.DEFAULT_RESULTS})",
+                    "minimum": 1,
+                    "maximum": self.MAX_RESULTS
+                }
+            }
+        }
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+
+    async def execute(
+        self,
+        pattern: str | None = None,
+        glob: str | None = None,
+        path: str | None = None,
+        ignore_case: bool = False,
+        context: int = 0,
+        max_results: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        if not pattern and not glob:
+            return "Error: Provide a pattern, a glob, or both"
+        try:
+            root = _resolve_path(path or self.working_dir or ".", self._allowed_dir)
+            if not root.is_dir():
+                return f"Error: Directory not found: {path}"
+            # MULTILINE so ^ and $ anchor to lines in the whole-file prefilter too
+            flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+            regex = re.compile(pattern, flags) if pattern else None
+        except PermissionError as e:
+            return f"Error: {e}"
+        except re.error as e:
+            return f"Error: Invalid pattern: {e}"
+
+        walk = _Walk(
+            root="",
+            glob=compile_glob(glob) if glob else None,
+            regex=regex,
+            literal=pattern.lower() if ignore_case and pattern and not _META.search(pattern) else None,
+            context=min(max(context, 0), 10),
+            max_results=min(max_results or self.DEFAULT_RESULTS, self.MAX_RESULTS),
+        )
+        try:
+            return await asyncio.to_thread(self._search, root, walk)
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _search(self, root: Path, walk: _Walk) -> str:
+        """Walk the tree in parallel, one directory per task."""
+        top, ignore = self._ignore_rules(root)
+        walk.root = root.relative_to(top).as_posix() if root != top else ""
+
+        outstanding = 1
+        finished = threading.Event()
+        errors: list[BaseException] = []
+
+        def scan(directory: Path, rel: str, rules: GitIgnore) -> None:
+            nonlocal outstanding
+            subdirs = []
+            try:
+                subdirs = self._scan_dir(directory, rel, rules, walk)
+            except BaseException as e:
+                errors.append(e)
+            with walk.lock:
+                # Each task schedules its own subdirectories; the walk ends when none are left
+                outstanding += len(subdirs) - 1
+                if outstanding == 0:
+                    finished.set()
+            for subdir in subdirs:
+                pool.submit(scan, *subdir)
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="nanobot-search") as pool:
+            pool.submit(scan, root, walk.root, ignore)
+            finished.wait()
+        if errors:
+            raise errors[0]
+        return self._format(walk)
+
+    def _ignore_rules(self, root: Path) -> tuple[Path, GitIgnore]:
+        """
+        Find the top of the enclosing git repository (if any, and inside the
+        allowed directory) and load the .gitignore files above the root.
+        """
+        top = root
+        for parent in root.parents:
+            if self._allowed_dir and not str(parent).startswith(str(self._allowed_dir.resolve())):
+                break
+            if (parent / ".git").exists():
+                top = parent
+                break
+        ignore = GitIgnore()
+        if top != root:
+            parts = root.relative_to(top).parts
+            for depth in range(len(parts)):
+                base = "/".join(parts[:depth])
+                ignore = ignore.add_file(base, top.joinpath(*parts[:depth], ".gitignore"))
+        return top, ignore
+
+    def _scan_dir(self, directory: Path, rel: str, ignore: GitIgnore, walk: _Walk) -> list[tuple[Path, str, GitIgnore]]:
+        """Scan one directory: search its files, return its subdirectories."""
+        if walk.capped:
+            return []
+        ignore = ignore.add_file(rel, directory / ".gitignore")
+        subdirs = []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return []
+
+        for entry in entries:
+            if entry.name == ".git":
+                continue
+            path = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                # Symlinks are not followed: they could lead outside the allowed directory
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignore.ignored(path, True):
+                        subdirs.append((Path(entry.path), path, ignore))
+                    continue
+                if not entry.is_file(follow_symlinks=False) or ignore.ignored(path, False):
+                    continue
+            except OSError:
+                continue
+
+            shown = path[len(walk.root) + 1:] if walk.root else path
+            if walk.glob and not walk.glob.fullmatch(shown):
+                continue
+            if walk.regex is None:
+                self._add(walk, [(shown, 0, 0, [])])
+            else:
+                self._add(walk, self._grep(entry, shown, walk))
+            if walk.capped:
+                return []
+        return subdirs
+
+    def _grep(self, entry: os.DirEntry, shown: str, walk: _Walk) -> list[tuple[str, int, int, list[str]]]:
+        """Search one file; returns a result per matching line."""
+        # Raw os calls: this runs once per file, and buffered open() adds syscalls
+        try:
+            fd = os.open(entry.path, _OPEN_FLAGS)
+        except OSError:
+            return []
+        try:
+            size = os.fstat(fd).st_size
+            if size > MAX_FILE_BYTES:
+                with walk.lock:
+                    walk.skipped += 1
+                return []
+            data = os.read(fd, size) if size else b""
+        except OSError:
+            return []
+        finally:
+            os.close(fd)
+        if b"\0" in data[:SNIFF_BYTES]:
+            return []
+        with walk.lock:
+            walk.files_searched += 1
+
+        text = data.decode("utf-8", errors="replace")
+        if walk.literal is not None:
+            if walk.literal not in text.lower():
+                return []
+        elif not walk.regex.search(text):
+            return []
+        lines = text.splitlines()
+        matches = []
+        for i, line in enumerate(lines):
+            if walk.regex.search(line):
+                lo, hi = max(i - walk.context, 0), min(i + walk.context + 1, len(lines))
+                matches.append((shown, i + 1, lo + 1, lines[lo:hi]))
+                if len(matches) > walk.max_results:
+                    break
+        return matches
+
+    @staticmethod
+    def _add(walk: _Walk, found: list[tuple[str, int, int, list[str]]]) -> None:
+        if not found:
+            return
+        with walk.lock:
+            room = walk.max_results - len(walk.results)
+            walk.results.extend(found[:room])
+            if len(found) > room:
+                walk.capped = True
+
+    @staticmethod
+    def _format(walk: _Walk) -> str:
+        results = sorted(walk.results, key=lambda r: (r[0], r[1]))
+        notes = []
+        if walk.capped:
+            notes.append(f"[Stopped at {walk.max_results} results; narrow the search]")
+        if walk.skipped:
+            notes.append(f"[Skipped {walk.skipped} files over {MAX_FILE_BYTES // (1024 * 1024)} MB]")
+
+        if walk.regex is None:
+            lines = [path for path, _, _, _ in results] or ["No files match"]
+            return "\n".join(lines + notes)
+
+        if not results:
+            return "\n".join([f"No matches ({walk.files_searched} files searched)"] + notes)
+        out = []
+        for path, number, start, shown in results:
+            if walk.context and out:
+                out.append("--")
+            for offset, line in enumerate(shown):
+                sep = ":" if start + offset == number else "-"
+                out.append(f"{path}{sep}{start + offset}{sep} {line[:MAX_LINE_CHARS]}")
+        return "\n".join(out + notes)
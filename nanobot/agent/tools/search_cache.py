@@ -0,0 +1,121 @@
+"""In-memory cache of web_search results with in-flight request coalescing."""
+
+import asyncio
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+SearchKey = tuple[str, int]
+
+
+class SearchCache:
+    """
+    TTL cache of search results keyed on the normalized query and count.
+
+    Identical searches issued while one is already in flight wait for that
+    request instead of sending their own; the upstream call runs as its own
+    task, so a caller being cancelled does not fail the others. Failed
+    searches are not cached.
+
+    Size is bounded per entry (`max_entry_bytes`; larger results are
+    returned but not stored) and globally (`max_entries` and `max_bytes`,
+    least recently used first). Counters are exposed through stats().
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600,
+        max_entries: int = 512,
+        max_bytes: int = 4 * 1024 * 1024,
+        max_entry_bytes: int = 64 * 1024,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        # key -> (expires_at, size, results), least recently used first
+        self._entries: OrderedDict[SearchKey, tuple[float, int, Any]] = OrderedDict()
+        self._inflight: dict[SearchKey, asyncio.Future[Any]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(query: str, count: int) -> SearchKey:
+        """Normalize a query so trivially different spellings share an entry."""
+        text = unicodedata.normalize("NFKC", query).casefold()
+        return " ".join(text.split()), count
+
+    async def get_or_fetch(self, query: str, count: int, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get cached results, or fetch them once for all concurrent callers.
+
+        Args:
+            query: Search query.
+            count: Number of results requested.
+            fetch: Coroutine function performing the upstream search; its
+                result must be JSON-serializable and is shared, not copied.
+
+        Returns:
+            The search results.
+        """
+        key = self.key(query, count)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self._remove(key)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._settle(key, t))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: SearchKey, task: asyncio.Future[Any]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        results = task.result()
+        size = len(json.dumps(results, ensure_ascii=False))
+        if self.ttl <= 0 or size > self.max_entry_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, size, results)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: SearchKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss/coalesce counters, size and the current hit rate."""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0,
+        }
@@ -3,10 +3,19 @@
 import asyncio
 import os
 import re
+import shlex
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.shell_output import OutputCapture, OutputLimitError, read_stream
+from nanobot.agent.tools.shell_session import (
+    ShellExitedError,
+    ShellPool,
+    kill_process_group,
+    reap_process,
+)
 
 
 class ExecTool(Tool):
@@ -19,6 +28,10 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        shells: ShellPool | None = None,
+        session: str = "",
+        max_output_bytes: int | None = None,
+        spill_dir: Path | None = None,
     ):
         self.timeout = timeout
         self.working_dir = working_dir
@@ -34,6 +47,15 @@ class ExecTool(Tool):
         ]
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
+        self.shells = shells  # Persistent shells; None runs every command in a fresh shell
+        # Per-task session key selecting the persistent shell
+        self._session: ContextVar[str] = ContextVar("exec_session", default=session)
+        self.max_output_bytes = max_output_bytes  # Commands writing more are killed
+        self.spill_dir = spill_dir  # Full output of truncated commands is saved here
+    
+    def set_context(self, session: str) -> None:
+        """Set the session whose shell runs commands (scoped to the running task)."""
+        self._session.set(session)
     
     @property
     def name(self) -> str:
@@ -41,6 +63,12 @@ class ExecTool(Tool):
     
     @property
     def description(self) -> str:
+        if self.shells is not None:
+            return (
+                "Execute a shell command and return its output. Use with caution. "
+                "Commands share one shell per chat: cd, exported variables and activated "
+                "virtualenvs persist between calls."
+            )
         return "Execute a shell command and return its output. Use with caution."
     
     @property
@@ -66,47 +94,91 @@ class ExecTool(Tool):
         if guard_error:
             return guard_error
         
+        # Only the head and tail of each stream are kept in memory
+        stdout = OutputCapture("stdout", self.max_output_bytes, self.spill_dir)
+        stderr = OutputCapture("stderr", self.max_output_bytes, self.spill_dir)
         try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd,
-            )
-            
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                return f"Error: Command timed out after {self.timeout} seconds"
-            
-            output_parts = []
-            
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
-            
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
-            
-            if process.returncode != 0:
-                output_parts.append(f"\nExit code: {process.returncode}")
-            
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
+            session = self._session.get()
+            returncode = None
+            if self.shells is not None and session and os.name == "posix":
+                if working_dir:
+                    # A subshell, so the shell itself stays in its own directory
+                    command = f"(cd {shlex.quote(working_dir)} && {command}\n)"
+                try:
+                    returncode = await self.shells.run(
+                        session, command, self.working_dir or cwd, self.timeout, stdout, stderr
+                    )
+                except asyncio.TimeoutError:
+                    return f"Error: Command timed out after {self.timeout} seconds (shell restarted, state lost)"
+                except ShellExitedError:
+                    output = self._format_output(stdout, stderr, None)
+                    return f"{output}\n(shell exited; the next command starts a new one)"
+            if returncode is None:
+                returncode = await self._run_once(command, cwd, stdout, stderr)
+                if returncode is None:
+                    return f"Error: Command timed out after {self.timeout} seconds"
             
+            return self._format_output(stdout, stderr, returncode)
+        except OutputLimitError:
+            output = self._format_output(stdout, stderr, None)
+            return f"{output}\nError: Command killed after writing more than {self.max_output_bytes} bytes of output"
         except Exception as e:
             return f"Error executing command: {str(e)}"
+        finally:
+            await stdout.close()
+            await stderr.close()
+    
+    async def _run_once(self, command: str, cwd: str, stdout: OutputCapture, stderr: OutputCapture) -> int | None:
+        """Run a command in a fresh shell; returns None on timeout."""
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=os.name == "posix",
+        )
+        
+        readers = [
+            asyncio.ensure_future(read_stream(process.stdout, stdout)),
+            asyncio.ensure_future(read_stream(process.stderr, stderr)),
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*readers, process.wait()), timeout=self.timeout)
+        except (asyncio.TimeoutError, OutputLimitError) as e:
+            # The command's own children (pipelines, background jobs) go too
+            kill_process_group(process)
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await reap_process(process)
+            if isinstance(e, OutputLimitError):
+                raise
+            return None
+        return process.returncode
+    
+    @staticmethod
+    def _format_output(stdout: OutputCapture, stderr: OutputCapture, returncode: int | None) -> str:
+        output_parts = []
+        
+        if stdout.total:
+            output_parts.append(stdout.text())
+        
+        if stderr.total:
+            stderr_text = stderr.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
+        
+        if returncode:
+            output_parts.append(f"\nExit code: {returncode}")
+        
+        result = "\n".join(output_parts) if output_parts else "(no output)"
+        
+        # Truncate very long output
+        max_len = 10000
+        if len(result) > max_len:
+            result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
+        
+        return result
 
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
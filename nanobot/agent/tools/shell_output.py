@@ -0,0 +1,196 @@
+"""Bounded capture of command output for the exec tool."""
+
+import asyncio
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from loguru import logger
+
+READ_CHUNK = 65536
+HEAD_BYTES = 3000  # Kept from the start of each stream
+TAIL_BYTES = 2000  # Kept from the end of each stream
+MAX_SPILL_FILES = 20  # Older spill files are deleted
+SPILL_BATCH = 1024 * 1024  # Spilled bytes buffered before one write in a worker thread
+
+
+class OutputLimitError(Exception):
+    """A command wrote more output than allowed."""
+
+
+class OutputCapture:
+    """
+    The first and last bytes of one output stream, in O(head + tail) memory.
+
+    Bytes in between are only counted, unless `spill_dir` is set: then a
+    stream that outgrows the head is written in full to a file there, so
+    the complete output can still be read afterwards. feed() only buffers
+    the bytes to spill; spill() and close() write them in a worker thread,
+    SPILL_BATCH at a time, so the file I/O stays off the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int | None = None,
+        spill_dir: Path | None = None,
+        head: int = HEAD_BYTES,
+        tail: int = TAIL_BYTES,
+    ):
+        self.name = name
+        self.limit = limit
+        self.spill_dir = spill_dir
+        self.head_size = head
+        self.tail_size = tail
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self.spill_path: Path | None = None
+        self._spill: BinaryIO | None = None
+        self._spilling = False
+        self._pending = bytearray()  # Bytes to spill, not yet written
+
+    @property
+    def omitted(self) -> int:
+        """Bytes dropped between the head and the tail."""
+        return self.total - len(self.head) - len(self.tail)
+
+    def feed(self, data: bytes) -> None:
+        """
+        Add output.
+
+        Raises:
+            OutputLimitError: The stream is now over the limit.
+        """
+        if not data:
+            return
+        self.total += len(data)
+        room = self.head_size - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            if self.spill_dir is not None:
+                if not self._spilling:
+                    self._spilling = True
+                    self._pending += self.head
+                self._pending += data
+            self.tail += data[-self.tail_size:]
+            excess = len(self.tail) - self.tail_size
+            if excess > 0:
+                del self.tail[:excess]
+        if self.limit is not None and self.total > self.limit:
+            raise OutputLimitError(f"{self.name} exceeded {self.limit} bytes")
+
+    async def spill(self, final: bool = False) -> None:
+        """Write the buffered spill bytes once a batch is full (or, if final, any left)."""
+        if not self.omitted:
+            return  # Everything may still fit in memory; omitted never shrinks
+        if len(self._pending) >= SPILL_BATCH or (final and self._pending):
+            data = bytes(self._pending)
+            self._pending.clear()
+            await asyncio.to_thread(self._write_spill, data)
+
+    def _write_spill(self, data: bytes) -> None:
+        if self.spill_dir is None:
+            return  # Disabled after an error
+        try:
+            if self._spill is None:
+                self._open_spill()
+            self._spill.write(data)
+        except OSError as e:
+            logger.warning(f"Cannot save exec output to {self.spill_dir}: {e}")
+            self.spill_dir = None
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            if self.spill_path is not None:
+                self.spill_path.unlink(missing_ok=True)  # Incomplete
+                self.spill_path = None
+
+    def _open_spill(self) -> None:
+        assert self.spill_dir is not None
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        # Names sort by creation time, so pruning drops the oldest
+        old = sorted(self.spill_dir.glob("exec-*.log"))
+        for path in old[:max(len(old) - MAX_SPILL_FILES + 1, 0)]:
+            path.unlink(missing_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = self.spill_dir / f"exec-{stamp}-{uuid.uuid4().hex[:6]}.{self.name}.log"
+        self._spill = open(path, "wb")
+        self.spill_path = path
+
+    def text(self) -> str:
+        """The captured output, with a note where bytes were dropped."""
+        if not self.omitted:
+            return (self.head + self.tail).decode("utf-8", errors="replace")
+        note = f"... ({self.omitted} bytes omitted"
+        if self.spill_path is not None:
+            note += f"; full {self.name} in {self.spill_path}"
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        return f"{head}\n{note}) ...\n{tail}"
+
+    async def close(self) -> None:
+        """Write what is left to spill and close the spill file."""
+        await self.spill(final=True)
+        if self._spill is not None:
+            await asyncio.to_thread(self._spill.close)
+            self._spill = None
+
+
+async def read_stream(
+    stream: asyncio.StreamReader, capture: OutputCapture, sentinel: bytes | None = None
+) -> bytes:
+    """
+    Feed a stream into a capture until EOF or, if given, a sentinel.
+
+    Spilled output is written as it arrives, and in full before returning.
+
+    Returns:
+        The rest of the sentinel's line (empty when reading to EOF).
+
+    Raises:
+        EOFError: The stream ended before the sentinel.
+        OutputLimitError: From the capture.
+    """
+    try:
+        rest = await _read_stream(stream, capture, sentinel)
+    except OutputLimitError:
+        await capture.spill(final=True)
+        raise
+    await capture.spill(final=True)
+    return rest
+
+
+async def _read_stream(
+    stream: asyncio.StreamReader, capture: OutputCapture, sentinel: bytes | None
+) -> bytes:
+    # Hold back enough bytes to find a sentinel split across reads
+    keep = len(sentinel) - 1 if sentinel else 0
+    buf = bytearray()
+    while True:
+        await capture.spill()
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            capture.feed(bytes(buf))
+            if sentinel:
+                raise EOFError
+            return b""
+        buf += chunk
+        if sentinel:
+            idx = buf.find(sentinel)
+            if idx >= 0:
+                capture.feed(bytes(buf[:idx]))
+                line = buf[idx + len(sentinel):]
+                while b"\n" not in line:
+                    more = await stream.read(READ_CHUNK)
+                    if not more:
+                        break
+                    line += more
+                return bytes(line.split(b"\n", 1)[0])
+        cut = len(buf) - keep
+        if cut > 0:
+            capture.feed(bytes(buf[:cut]))
+            del buf[:cut]
@@ -0,0 +1,250 @@
+"""Long-lived shell processes for the exec tool."""
+
+import asyncio
+import atexit
+import os
+import shlex
+import shutil
+import signal
+import time
+import uuid
+
+from loguru import logger
+
+from nanobot.agent.tools.shell_output import (
+    READ_CHUNK,
+    OutputCapture,
+    OutputLimitError,
+    read_stream,
+)
+
+
+def kill_process_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a process started in its own session together with everything it spawned."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def reap_process(process: asyncio.subprocess.Process, timeout: float = 5.0) -> None:
+    """
+    Wait for a killed process, discarding output left in its pipes.
+
+    asyncio only finishes a process once its pipes close, and a full pipe
+    buffer stops being read, so the pipes are drained rather than left.
+    """
+    async def drain(stream: asyncio.StreamReader | None) -> None:
+        while stream is not None and await stream.read(READ_CHUNK):
+            pass
+
+    try:
+        await asyncio.wait_for(asyncio.gather(drain(process.stdout), drain(process.stderr), process.wait()), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Process {process.pid} did not exit after being killed")
+
+
+class ShellExitedError(Exception):
+    """The shell process ended while running a command (e.g. `exit`)."""
+
+
+class PersistentShell:
+    """
+    One long-lived shell; commands run in it one at a time.
+
+    Each command is eval'd in the shell itself, so `cd`, exported variables
+    and sourced virtualenvs carry over to the next command. The end of a
+    command's output is found by a random sentinel printed after it to
+    stdout (with the exit status) and stderr. The shell runs in its own
+    process group, so killing it also kills anything it started.
+    """
+
+    def __init__(self, cwd: str):
+        self.cwd = cwd
+        self.process: asyncio.subprocess.Process | None = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self._killed = False
+
+    @property
+    def alive(self) -> bool:
+        """Not killed or exited (a shell not started yet counts as alive)."""
+        return not self._killed and (self.process is None or self.process.returncode is None)
+
+    async def start(self) -> None:
+        bash = shutil.which("bash")
+        argv = [bash, "--noprofile", "--norc"] if bash else ["/bin/sh"]
+        self.process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            start_new_session=True,
+        )
+        if self._killed:
+            kill_process_group(self.process)  # Closed while starting
+
+    async def run(self, command: str, timeout: float, stdout: OutputCapture, stderr: OutputCapture) -> int:
+        """
+        Run a command in the shell, capturing its output.
+
+        Returns:
+            The exit status.
+
+        Raises:
+            asyncio.TimeoutError: The command ran too long; the shell was killed.
+            OutputLimitError: The command wrote too much; the shell was killed.
+            ShellExitedError: The command ended the shell.
+        """
+        assert self.process and self.process.stdin and self.process.stdout and self.process.stderr
+        self.last_used = time.monotonic()
+        marker = f"__nanobot_done_{uuid.uuid4().hex}__"
+        # stdin is /dev/null so commands can't swallow the script that follows them
+        script = (
+            f"eval {shlex.quote(command)} < /dev/null\n"
+            f"printf '\\n{marker} %d\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        sentinel = f"\n{marker}".encode()
+        out = asyncio.ensure_future(read_stream(self.process.stdout, stdout, sentinel))
+        err = asyncio.ensure_future(read_stream(self.process.stderr, stderr, sentinel))
+        finished = False
+        try:
+            self.process.stdin.write(script.encode())
+            await self.process.stdin.drain()
+            done, pending = await asyncio.wait({out, err}, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+            errors = [t.exception() for t in done if t.exception()]
+            if errors:
+                self.kill()
+                for error in errors:
+                    if isinstance(error, OutputLimitError):
+                        raise error
+                # The shell died; after the kill the other pipe hits EOF too
+                await asyncio.wait({out, err}, timeout=5)
+                raise ShellExitedError
+            if pending:
+                raise asyncio.TimeoutError
+            finished = True
+        except (BrokenPipeError, ConnectionResetError):
+            raise ShellExitedError from None
+        finally:
+            self.last_used = time.monotonic()
+            if not finished:
+                self.kill()
+            for task in (out, err):
+                task.cancel()
+            await asyncio.gather(out, err, return_exceptions=True)
+            if not finished:
+                await reap_process(self.process)
+        
+        fields = out.result().split()
+        return int(fields[0]) if fields else 0
+
+    def kill(self) -> None:
+        self._killed = True
+        if self.process is not None:
+            kill_process_group(self.process)
+
+
+class ShellPool:
+    """
+    Persistent shells keyed by session (a chat, or a subagent task).
+
+    At most `max_shells` are kept; starting another evicts the least
+    recently used idle one. Shells unused for `idle_timeout` seconds are
+    closed by a background reaper. Without a free slot, run() returns None
+    and the caller falls back to a one-off process.
+    """
+
+    def __init__(self, idle_timeout: float = 600, max_shells: int = 8):
+        self.idle_timeout = idle_timeout
+        self.max_shells = max(1, max_shells)
+        self._shells: dict[str, PersistentShell] = {}
+        self._reaper: asyncio.Task[None] | None = None
+        atexit.register(self.close_all)
+
+    async def run(
+        self, key: str, command: str, cwd: str, timeout: float, stdout: OutputCapture, stderr: OutputCapture
+    ) -> int | None:
+        """
+        Run a command in the session's shell, starting one if needed.
+
+        Returns:
+            The exit status, or None if no shell is available.
+        """
+        shell = self._shells.get(key)
+        if shell is None or not shell.alive:
+            if not self._make_room(key):
+                return None
+            shell = PersistentShell(cwd)
+            self._shells[key] = shell
+            self._ensure_reaper()
+
+        async with shell.lock:
+            try:
+                if shell.process is None:
+                    try:
+                        await shell.start()
+                    except BaseException:
+                        shell.kill()
+                        raise
+                    logger.debug(f"Started persistent shell for {key} (pid {shell.process.pid})")
+                if not shell.alive:
+                    raise ShellExitedError  # Closed while starting
+                return await shell.run(command, timeout, stdout, stderr)
+            finally:
+                if not shell.alive and self._shells.get(key) is shell:
+                    del self._shells[key]
+
+    def _make_room(self, key: str) -> bool:
+        self._shells.pop(key, None)
+        while len(self._shells) >= self.max_shells:
+            # Shells still starting are busy too, even before their lock is taken
+            idle = [
+                (s.last_used, k) for k, s in self._shells.items()
+                if s.process is not None and not s.lock.locked()
+            ]
+            if not idle:
+                return False
+            self.close(min(idle)[1])
+        return True
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        while self._shells:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            now = time.monotonic()
+            for key, shell in list(self._shells.items()):
+                if shell.process is None or shell.lock.locked():
+                    continue
+                if now - shell.last_used >= self.idle_timeout:
+                    logger.debug(f"Closing idle shell for {key}")
+                    self.close(key)
+
+    def close(self, key: str) -> None:
+        """Kill a session's shell (and its process group)."""
+        shell = self._shells.pop(key, None)
+        if shell is not None:
+            shell.kill()
+
+    def close_all(self) -> None:
+        """Kill every shell."""
+        for key in list(self._shells):
+            self.close(key)
+
+    async def aclose(self) -> None:
+        """Kill every shell and wait for them to exit."""
+        shells = list(self._shells.values())
+        self.close_all()
+        if self._reaper is not None:
+            self._reaper.cancel()
+        for shell in shells:
+            if shell.process is not None:
+                await shell.process.wait()
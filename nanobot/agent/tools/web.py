@@ -1,33 +1,61 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
 import json
 import os
-import re
+from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.search_cache import SearchCache
+from nanobot.agent.tools.web_cache import WebCache
+from nanobot.utils.extraction import ExtractionPool, extract_content
+from nanobot.utils.http import HttpClients, http_client
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
+# Download caps: raw HTML is typically well over 10x its readable text
+BYTES_PER_CHAR = 20
+MIN_DOWNLOAD_BYTES = 256 * 1024
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+SNIFF_BYTES = 1024  # Bytes inspected to tell text from binary
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
+TEXT_TYPES = ("application/json", "application/xml", "application/javascript", "application/x-javascript")
+BINARY_SIGNATURES = (
+    b"%PDF", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"PK\x03\x04", b"\x1f\x8b", b"BZh",
+    b"7z\xbc\xaf", b"Rar!", b"\x7fELF", b"OggS", b"ID3", b"fLaC", b"wOFF", b"wOF2",
+)
 
 
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+def _download_cap(max_chars: int) -> int:
+    """Bytes to download for a page whose text is cut at max_chars."""
+    return min(max(max_chars * BYTES_PER_CHAR, MIN_DOWNLOAD_BYTES), MAX_DOWNLOAD_BYTES)
+
+
+def _is_text_type(media: str) -> bool:
+    return media.startswith("text/") or media in TEXT_TYPES or media.endswith(("+json", "+xml"))
+
+
+def _check_text(ctype: str, head: bytes) -> None:
+    """Raise if a response looks binary, judging by its content type and first bytes."""
+    media = ctype.split(";")[0].strip().lower()
+    head = head[:SNIFF_BYTES]
+    if head.startswith(BINARY_SIGNATURES) or b"\x00" in head:
+        raise ValueError(f"Binary content not supported ({media or 'unknown type'})")
+    if _is_text_type(media):
+        return
+    if media.split("/")[0] in ("image", "audio", "video", "font"):
+        raise ValueError(f"Binary content not supported ({media})")
+    # Missing or generic type (e.g. application/octet-stream): accept text-looking bytes
+    sample = head.decode("utf-8", errors="replace")
+    odd = sum(1 for c in sample if c == "\ufffd" or (c < " " and c not in "\t\n\r\f"))
+    if odd > len(sample) // 10:
+        raise ValueError(f"Binary content not supported ({media or 'unknown type'})")
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -43,6 +71,19 @@ def _validate_url(url: str) -> tuple[bool, str]:
         return False, str(e)
 
 
+@dataclass
+class _Download:
+    """A (possibly truncated) response body."""
+
+    status: int
+    headers: httpx.Headers
+    final_url: str
+    encoding: str
+    body: bytes
+    bytes_read: int
+    truncated: bool
+
+
 class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
@@ -56,10 +97,20 @@ class WebSearchTool(Tool):
         },
         "required": ["query"]
     }
+    concurrency_safe = True
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_results: int = 5,
+        http: HttpClients | None = None,
+        cache: SearchCache | None = None,
+    ):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self.api_url = "https://api.search.brave.com/res/v1/web/search"
+        self.http = http  # Shared connection pools; None opens a client per call
+        self.cache = cache  # Shared result cache; None queries the API every time
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -67,27 +118,38 @@ class WebSearchTool(Tool):
         
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
-            
-            results = r.json().get("web", {}).get("results", [])
+            if self.cache is not None:
+                results = await self.cache.get_or_fetch(query, n, lambda: self._search(query, n))
+            else:
+                results = await self._search(query, n)
             if not results:
                 return f"No results for: {query}"
             
             lines = [f"Results for: {query}\n"]
-            for i, item in enumerate(results[:n], 1):
-                lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
-                if desc := item.get("description"):
+            for i, item in enumerate(results, 1):
+                lines.append(f"{i}. {item['title']}\n   {item['url']}")
+                if desc := item["description"]:
                     lines.append(f"   {desc}")
             return "\n".join(lines)
         except Exception as e:
             return f"Error: {e}"
+    
+    async def _search(self, query: str, n: int) -> list[dict[str, str]]:
+        """Query the Brave API; returns the title, url and description of each result."""
+        async with http_client(self.http, "web_search") as client:
+            r = await client.get(
+                self.api_url,
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            r.raise_for_status()
+        
+        results = r.json().get("web", {}).get("results", [])
+        return [
+            {"title": item.get("title", ""), "url": item.get("url", ""), "description": item.get("description", "")}
+            for item in results[:n]
+        ]
 
 
 class WebFetchTool(Tool):
@@ -104,13 +166,21 @@ class WebFetchTool(Tool):
         },
         "required": ["url"]
     }
+    concurrency_safe = True
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        http: HttpClients | None = None,
+        cache: WebCache | None = None,
+        extractor: ExtractionPool | None = None,
+    ):
         self.max_chars = max_chars
+        self.http = http  # Shared connection pools; None opens a client per call
+        self.cache = cache  # On-disk response/extraction cache; None fetches every time
+        self.extractor = extractor  # Worker pool for readability; None uses a thread
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -119,45 +189,106 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
-            
-            ctype = r.headers.get("content-type", "")
+            page = await self._fetch(url, extractMode, _download_cap(max_chars))
+            text = page["text"]
+            truncated = len(text) > max_chars or page["truncated"]
+            text = text[:max_chars]
             
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
-            else:
-                text, extractor = r.text, "raw"
-            
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
-            
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            return json.dumps({"url": url, "finalUrl": page["finalUrl"], "status": page["status"],
+                              "extractor": page["extractor"], "truncated": truncated, "length": len(text),
+                              "bytes": page["bytes"], "cache": page["cache"], "text": text})
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
     
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+    async def _fetch(self, url: str, mode: str, max_bytes: int) -> dict[str, Any]:
+        """
+        Fetch a page and extract its text, going through the cache if any.
+        
+        Returns:
+            Dict with text, extractor, finalUrl, status, bytes (read from the
+            network), truncated (body cut at max_bytes) and cache ("hit",
+            "revalidated", "miss" or "off").
+        """
+        cache = self.cache
+        raw = await asyncio.to_thread(cache.get_raw, url) if cache else None
+        outcome = "hit" if cache else "off"
+        bytes_read = 0
+        
+        if raw is None or not cache.is_fresh(raw):
+            validators = cache.validators(raw) if raw else {}
+            d = await self._download(url, validators, max_bytes)
+            bytes_read = d.bytes_read
+            
+            if d.status == 304:
+                raw = await asyncio.to_thread(cache.refresh, raw, d.headers)
+                outcome = "revalidated"
+            else:
+                raw = None
+                if cache:
+                    outcome = "miss"
+                    # A cut-off body is not the resource; never serve it as one later
+                    if not d.truncated:
+                        raw = await asyncio.to_thread(
+                            cache.put_raw, url, d.final_url, d.status, d.headers, d.encoding, d.body
+                        )
+                if raw is None:
+                    body = d.body.decode(d.encoding, errors="replace")
+                    text, extractor = await self._extract(body, d.headers.get("content-type", ""), mode)
+                    return {"text": text, "extractor": extractor, "finalUrl": d.final_url, "status": d.status,
+                            "bytes": bytes_read, "truncated": d.truncated, "cache": outcome}
+        
+        page = {"finalUrl": raw.final_url, "status": raw.status, "bytes": bytes_read,
+                "truncated": False, "cache": outcome}
+        hit = await asyncio.to_thread(cache.get_extracted, url, mode, raw)
+        if hit:
+            return {**page, "text": hit[0], "extractor": hit[1].extractor}
+        
+        body = await asyncio.to_thread(cache.read_blob, raw.body)
+        if body is None:
+            raise RuntimeError("cached response body disappeared")
+        text, extractor = await self._extract(body.decode(raw.encoding, errors="replace"), raw.content_type, mode)
+        await asyncio.to_thread(cache.put_extracted, url, mode, raw, text, extractor)
+        return {**page, "text": text, "extractor": extractor}
+    
+    async def _download(self, url: str, validators: dict[str, str], max_bytes: int) -> _Download:
+        """
+        Stream a response body, stopping at max_bytes.
+        
+        Binary responses are rejected after the first SNIFF_BYTES, so large
+        files are never pulled in. A 304 is only accepted when validators
+        were sent.
+        """
+        async with http_client(
+            self.http,
+            "web_fetch",
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+            timeout=30.0
+        ) as client:
+            async with client.stream("GET", url, headers={"User-Agent": USER_AGENT, **validators}) as r:
+                if not (r.status_code == 304 and validators):
+                    r.raise_for_status()
+                ctype = r.headers.get("content-type", "")
+                chunks: list[bytes] = []
+                size = 0
+                sniffed = r.status_code == 304
+                truncated = False
+                async for chunk in r.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if not sniffed and size >= SNIFF_BYTES:
+                        _check_text(ctype, b"".join(chunks))
+                        sniffed = True
+                    if size > max_bytes:
+                        truncated = True
+                        break
+                body = b"".join(chunks)[:max_bytes]
+                if not sniffed:
+                    _check_text(ctype, body)
+                return _Download(r.status_code, r.headers, str(r.url), r.encoding or "utf-8", body, size, truncated)
+    
+    async def _extract(self, body: str, ctype: str, mode: str) -> tuple[str, str]:
+        """Extract readable text from a response body; returns (text, extractor)."""
+        if self.extractor is not None:
+            return await self.extractor.extract(body, ctype, mode)
+        return await asyncio.to_thread(extract_content, body, ctype, mode)
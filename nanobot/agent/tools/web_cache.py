@@ -0,0 +1,344 @@
+"""On-disk cache of fetched web pages and their extracted text."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+# Heuristic freshness (no explicit lifetime) is capped at one day
+MAX_HEURISTIC_TTL = 24 * 3600
+
+
+@dataclass
+class RawEntry:
+    """A cached HTTP response for one URL."""
+
+    url: str
+    final_url: str
+    status: int
+    content_type: str
+    encoding: str
+    body: str  # Blob hash of the response body
+    stored_at: float
+    fresh_until: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class ExtractedEntry:
+    """Text extracted from a cached response in one extract mode."""
+
+    url: str
+    mode: str
+    body: str  # Blob hash of the body this text was extracted from
+    text: str  # Blob hash of the extracted text
+    extractor: str
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def _parse_cache_control(value: str) -> dict[str, str]:
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class WebCache:
+    """
+    Content-addressed disk cache for web_fetch.
+
+    Layout under `root`:
+        raw/<sha(url)>.json           response metadata and validators
+        text/<sha(mode + url)>.json   extracted text per extract mode
+        blobs/<sha(content)>          response bodies and extracted texts
+
+    Freshness follows Cache-Control (no-store is never cached, no-cache is
+    always revalidated, max-age / Expires / a Last-Modified heuristic give
+    the lifetime), raised to at least `ttl_floor` seconds. Stale entries with
+    an ETag or Last-Modified are revalidated with a conditional request.
+    Total size is capped at `max_bytes`; the least recently used entries
+    (by file mtime, refreshed on every hit) are evicted first.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 100 * 1024 * 1024, ttl_floor: float = 300):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_floor = ttl_floor
+        self._size: int | None = None  # Bytes on disk, computed on first write
+        # Writes run in worker threads (to_thread), several at once
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _hash(data: str | bytes) -> str:
+        return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+    def _raw_path(self, url: str) -> Path:
+        return self.root / "raw" / f"{self._hash(url)}.json"
+
+    def _text_path(self, url: str, mode: str) -> Path:
+        return self.root / "text" / f"{self._hash(mode + chr(10) + url)}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest
+
+    # -- lookups -------------------------------------------------------------
+
+    def get_raw(self, url: str) -> RawEntry | None:
+        """Get the cached response for a URL (fresh or stale)."""
+        data = self._read_json(self._raw_path(url))
+        if data is None or not self._blob_path(data.get("body", "")).exists():
+            return None
+        try:
+            return RawEntry(**data)
+        except TypeError:
+            return None
+
+    def get_extracted(self, url: str, mode: str, raw: RawEntry) -> tuple[str, ExtractedEntry] | None:
+        """Get text extracted from exactly this cached response in a mode."""
+        data = self._read_json(self._text_path(url, mode))
+        if data is None or data.get("body") != raw.body:
+            return None
+        try:
+            entry = ExtractedEntry(**data)
+        except TypeError:
+            return None
+        text = self.read_blob(entry.text)
+        return (text.decode("utf-8"), entry) if text is not None else None
+
+    def read_blob(self, digest: str) -> bytes | None:
+        """Read a blob, marking it recently used."""
+        path = self._blob_path(digest)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        self._touch(path)
+        return data
+
+    @staticmethod
+    def is_fresh(entry: RawEntry) -> bool:
+        return time.time() < entry.fresh_until
+
+    @staticmethod
+    def validators(entry: RawEntry) -> dict[str, str]:
+        """Conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # -- freshness -----------------------------------------------------------
+
+    def lifetime(self, headers: Mapping[str, str]) -> float | None:
+        """
+        Seconds a response stays fresh, or None if it must not be stored.
+
+        Explicit lifetimes and the heuristic are raised to ttl_floor;
+        `no-cache` (and `max-age=0`) responses are stored but always revalidated.
+        """
+        cc = _parse_cache_control(headers.get("cache-control", ""))
+        if "no-store" in cc:
+            return None
+        if "no-cache" in cc:
+            return 0.0
+
+        if "max-age" in cc:
+            try:
+                age = float(cc["max-age"])
+            except ValueError:
+                age = 0.0
+            if age <= 0:
+                return 0.0
+            return max(age - float(headers.get("age", 0) or 0), self.ttl_floor)
+
+        date = _http_date(headers.get("date")) or time.time()
+        expires = _http_date(headers.get("expires"))
+        if expires is not None:
+            return max(expires - date, self.ttl_floor)
+
+        modified = _http_date(headers.get("last-modified"))
+        heuristic = min((date - modified) * 0.1, MAX_HEURISTIC_TTL) if modified else 0.0
+        return max(heuristic, self.ttl_floor)
+
+    # -- writes --------------------------------------------------------------
+
+    def put_raw(
+        self,
+        url: str,
+        final_url: str,
+        status: int,
+        headers: Mapping[str, str],
+        encoding: str,
+        body: bytes,
+    ) -> RawEntry | None:
+        """Store a response; returns None if it is not cacheable."""
+        lifetime = self.lifetime(headers)
+        if lifetime is None or status != 200:
+            return None
+        now = time.time()
+        entry = RawEntry(
+            url=url,
+            final_url=final_url,
+            status=status,
+            content_type=headers.get("content-type", ""),
+            encoding=encoding,
+            body=self._put_blob(body),
+            stored_at=now,
+            fresh_until=now + lifetime,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        self._write_json(self._raw_path(url), asdict(entry))
+        self._evict_if_needed()
+        return entry
+
+    def refresh(self, entry: RawEntry, headers: Mapping[str, str]) -> RawEntry:
+        """Extend an entry's freshness after a 304 Not Modified."""
+        # A 304 may omit Last-Modified; the stored one still drives the heuristic
+        lifetime = self.lifetime({"last-modified": entry.last_modified or "", **headers})
+        now = time.time()
+        entry.stored_at = now
+        entry.fresh_until = now + (lifetime or 0.0)
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        self._write_json(self._raw_path(entry.url), asdict(entry))
+        return entry
+
+    def put_extracted(
+        self, url: str, mode: str, raw: RawEntry, text: str, extractor: str, extra: dict[str, Any] | None = None
+    ) -> None:
+        """Store the text extracted from a cached response."""
+        entry = ExtractedEntry(
+            url=url, mode=mode, body=raw.body, text=self._put_blob(text.encode("utf-8")),
+            extractor=extractor, extra=extra or {},
+        )
+        self._write_json(self._text_path(url, mode), asdict(entry))
+        self._evict_if_needed()
+
+    def _put_blob(self, data: bytes) -> str:
+        digest = self._hash(data)
+        path = self._blob_path(digest)
+        if path.exists():
+            self._touch(path)
+        else:
+            self._write_bytes(path, data)
+        return digest
+
+    def _read_json(self, path: Path, touch: bool = True) -> dict[str, Any] | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if touch:
+            self._touch(path)
+        return data if isinstance(data, dict) else None
+
+    def _write_json(self, path: Path, data: dict[str, Any]) -> None:
+        self._write_bytes(path, json.dumps(data).encode("utf-8"))
+
+    def _write_bytes(self, path: Path, data: bytes) -> None:
+        ensure_dir(path.parent)
+        # A unique temp name per write: concurrent writers of one entry must not share it
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                old_size = path.stat().st_size if path.exists() else 0
+                os.replace(tmp, path)
+                if self._size is not None:
+                    self._size += len(data) - old_size
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    # -- eviction ------------------------------------------------------------
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for sub in ("raw", "text", "blobs"):
+            directory = self.root / sub
+            if not directory.is_dir():
+                continue
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.is_file() and not item.name.endswith(".tmp"):
+                        st = item.stat()
+                        files.append((st.st_mtime, st.st_size, Path(item.path)))
+        return files
+
+    def size(self) -> int:
+        """Total bytes stored."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            return self._size
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently used entries until the cache is under 90% of max_bytes."""
+        if self.size() <= self.max_bytes:
+            return
+        with self._lock:
+            if self.size() <= self.max_bytes:
+                return  # Another thread evicted first
+
+            files = sorted(self._files())  # Oldest mtime first
+            total = sum(size for _, size, _ in files)
+            target = self.max_bytes * 0.9
+            removed = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+            # Entries whose blob was evicted are dropped on lookup; blobs no
+            # entry refers to any more are dead weight
+            referenced = set()
+            for sub in ("raw", "text"):
+                for path in (self.root / sub).glob("*.json"):
+                    data = self._read_json(path, touch=False) or {}
+                    referenced.update(v for k, v in data.items() if k in ("body", "text"))
+            for _, size, path in files:
+                if path.parent.name == "blobs" and path.exists() and path.name not in referenced:
+                    path.unlink(missing_ok=True)
+                    total -= size
+                    removed += 1
+
+            self._size = total
+            logger.debug(f"Web cache evicted {removed} files ({total / 1e6:.1f} MB left)")
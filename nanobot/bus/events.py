@@ -33,5 +33,7 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    stream_id: str | None = None  # Shared by all updates of one streamed reply
+    partial: bool = False  # True for in-progress updates (content is the text so far)
 
 
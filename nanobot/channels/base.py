@@ -18,6 +18,7 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+    supports_streaming: bool = False  # Can edit a sent message to show partial replies
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -53,6 +54,9 @@ class BaseChannel(ABC):
         """
         Send a message through this channel.
         
+        Channels with supports_streaming also receive partial messages and
+        should update the message previously sent for the same stream_id.
+        
         Args:
             msg: The message to send.
         """
@@ -13,6 +13,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import DiscordConfig
+from nanobot.utils.http import HttpClients
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
@@ -23,15 +24,18 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
-    def __init__(self, config: DiscordConfig, bus: MessageBus):
+    def __init__(self, config: DiscordConfig, bus: MessageBus, http: HttpClients | None = None):
         super().__init__(config, bus)
         self.config: DiscordConfig = config
+        self._clients = http  # Shared pools; without them the channel owns its client
         self._ws: websockets.WebSocketClientProtocol | None = None
         self._seq: int | None = None
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._stream_messages: dict[str, str] = {}  # stream_id -> message_id being edited
 
     def update_config(self, config: DiscordConfig) -> None:
         self.config = config
@@ -44,7 +48,10 @@ class DiscordChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        if self._clients:
+            self._http = self._clients.get("discord", timeout=30.0)
+        else:
+            self._http = httpx.AsyncClient(timeout=30.0)
 
         while self._running:
             try:
@@ -73,7 +80,8 @@ class DiscordChannel(BaseChannel):
             await self._ws.close()
             self._ws = None
         if self._http:
-            await self._http.aclose()
+            if not self._clients:
+                await self._http.aclose()
             self._http = None
 
     async def send(self, msg: OutboundMessage) -> None:
@@ -82,6 +90,10 @@ class DiscordChannel(BaseChannel):
             logger.warning("Discord HTTP client not initialized")
             return
 
+        if msg.partial:
+            await self._send_partial(msg)
+            return
+
         content = msg.content
         max_len = self.config.max_message_length or 2000
 
@@ -95,35 +107,68 @@ class DiscordChannel(BaseChannel):
             messages_to_send.append(content)
 
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
-        headers = {"Authorization": f"Bot {self.config.token}"}
+        # A streamed reply is finalized by editing the message shown so far
+        stream_message_id = self._stream_messages.pop(msg.stream_id, None) if msg.stream_id else None
 
         try:
             for i, text in enumerate(messages_to_send):
                 payload: dict[str, Any] = {"content": text}
 
+                if i == 0 and stream_message_id:
+                    await self._request("PATCH", f"{url}/{stream_message_id}", payload, i)
+                    continue
+
                 if msg.reply_to and i == 0:
                     payload["message_reference"] = {"message_id": msg.reply_to}
                     payload["allowed_mentions"] = {"replied_user": False}
 
-                for attempt in range(3):
-                    try:
-                        response = await self._http.post(url, headers=headers, json=payload)
-                        if response.status_code == 429:
-                            data = response.json()
-                            retry_after = float(data.get("retry_after", 1.0))
-                            logger.warning(f"Discord rate limited, retrying in {retry_after}s")
-                            await asyncio.sleep(retry_after)
-                            continue
-                        response.raise_for_status()
-                        break
-                    except Exception as e:
-                        if attempt == 2:
-                            logger.error(f"Error sending Discord message segment {i}: {e}")
-                        else:
-                            await asyncio.sleep(1)
+                await self._request("POST", url, payload, i)
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _send_partial(self, msg: OutboundMessage) -> None:
+        """Show an in-progress reply, editing the same message on each update."""
+        max_len = self.config.max_message_length or 2000
+        text = msg.content if len(msg.content) <= max_len else msg.content[: max_len - 1] + "…"
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
+
+        message_id = self._stream_messages.get(msg.stream_id)
+        if message_id:
+            await self._request("PATCH", f"{url}/{message_id}", {"content": text}, 0)
+            return
+
+        payload: dict[str, Any] = {"content": text}
+        if msg.reply_to:
+            payload["message_reference"] = {"message_id": msg.reply_to}
+            payload["allowed_mentions"] = {"replied_user": False}
+        response = await self._request("POST", url, payload, 0)
+        if response is not None:
+            self._stream_messages[msg.stream_id] = str(response.json().get("id", ""))
+
+    async def _request(
+        self, method: str, url: str, payload: dict[str, Any], segment: int
+    ) -> httpx.Response | None:
+        """Send a REST request with rate-limit handling and retries."""
+        headers = {"Authorization": f"Bot {self.config.token}"}
+
+        for attempt in range(3):
+            try:
+                response = await self._http.request(method, url, headers=headers, json=payload)
+                if response.status_code == 429:
+                    data = response.json()
+                    retry_after = float(data.get("retry_after", 1.0))
+                    logger.warning(f"Discord rate limited, retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                return response
+            except Exception as e:
+                if attempt == 2:
+                    logger.error(f"Error sending Discord message segment {segment}: {e}")
+                else:
+                    await asyncio.sleep(1)
+        return None
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
@@ -14,6 +14,7 @@ from nanobot.config.schema import Config
 
 if TYPE_CHECKING:
     from nanobot.session.manager import SessionManager
+    from nanobot.utils.http import HttpClients
 
 
 class ChannelManager:
@@ -27,11 +28,16 @@ class ChannelManager:
     """
 
     def __init__(
-        self, config: Config, bus: MessageBus, session_manager: "SessionManager | None" = None
+        self,
+        config: Config,
+        bus: MessageBus,
+        session_manager: "SessionManager | None" = None,
+        http: "HttpClients | None" = None,
     ):
         self.config = config
         self.bus = bus
         self.session_manager = session_manager
+        self.http = http
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
 
@@ -50,6 +56,7 @@ class ChannelManager:
                     self.bus,
                     groq_api_key=self.config.providers.groq.api_key,
                     session_manager=self.session_manager,
+                    http=self.http,
                 )
                 logger.info("Telegram channel enabled")
             except ImportError as e:
@@ -70,7 +77,9 @@ class ChannelManager:
             try:
                 from nanobot.channels.discord import DiscordChannel
 
-                self.channels["discord"] = DiscordChannel(self.config.channels.discord, self.bus)
+                self.channels["discord"] = DiscordChannel(
+                    self.config.channels.discord, self.bus, http=self.http
+                )
                 logger.info("Discord channel enabled")
             except ImportError as e:
                 logger.warning(f"Discord channel not available: {e}")
@@ -139,6 +148,8 @@ class ChannelManager:
                 msg = await asyncio.wait_for(self.bus.consume_outbound(), timeout=1.0)
 
                 channel = self.channels.get(msg.channel)
+                if channel and msg.partial and not channel.supports_streaming:
+                    continue
                 if channel:
                     try:
                         await channel.send(msg)
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 from loguru import logger
 from telegram import BotCommand, Update
+from telegram.error import BadRequest
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 
 from nanobot.bus.events import OutboundMessage
@@ -17,6 +18,9 @@ from nanobot.config.schema import TelegramConfig
 
 if TYPE_CHECKING:
     from nanobot.session.manager import SessionManager
+    from nanobot.utils.http import HttpClients
+
+TELEGRAM_MAX_MESSAGE_LEN = 4096
 
 
 def _markdown_to_telegram_html(text: str) -> str:
@@ -82,6 +86,19 @@ def _markdown_to_telegram_html(text: str) -> str:
     return text
 
 
+def _split_message(text: str, limit: int = TELEGRAM_MAX_MESSAGE_LEN) -> list[str]:
+    """Split text into chunks of at most `limit` characters, at line breaks where possible."""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    chunks.append(text)
+    return chunks
+
+
 class TelegramChannel(BaseChannel):
     """
     Telegram channel using long polling.
@@ -90,6 +107,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -104,14 +122,17 @@ class TelegramChannel(BaseChannel):
         bus: MessageBus,
         groq_api_key: str = "",
         session_manager: SessionManager | None = None,
+        http: HttpClients | None = None,
     ):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
         self.groq_api_key = groq_api_key
         self.session_manager = session_manager
+        self.http = http
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._stream_messages: dict[str, int] = {}  # stream_id -> message_id being edited
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -188,31 +209,71 @@ class TelegramChannel(BaseChannel):
             logger.warning("Telegram bot not running")
             return
         
+        if msg.partial:
+            await self._send_partial(msg)
+            return
+        
         # Stop typing indicator for this chat
         self._stop_typing(msg.chat_id)
         
+        # A streamed reply is finalized by editing the message shown so far
+        message_id = self._stream_messages.pop(msg.stream_id, None) if msg.stream_id else None
+        
         try:
             # chat_id should be the Telegram chat ID (integer)
             chat_id = int(msg.chat_id)
-            # Convert markdown to Telegram HTML
-            html_content = _markdown_to_telegram_html(msg.content)
-            await self._app.bot.send_message(
-                chat_id=chat_id,
-                text=html_content,
-                parse_mode="HTML"
-            )
         except ValueError:
             logger.error(f"Invalid chat_id: {msg.chat_id}")
-        except Exception as e:
-            # Fallback to plain text if HTML parsing fails
-            logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            return
+        
+        # Long replies go out in several messages; the first one replaces the streamed text
+        for i, chunk in enumerate(_split_message(msg.content)):
+            target = message_id if i == 0 else None
             try:
-                await self._app.bot.send_message(
-                    chat_id=int(msg.chat_id),
-                    text=msg.content
-                )
-            except Exception as e2:
-                logger.error(f"Error sending Telegram message: {e2}")
+                # Convert markdown to Telegram HTML
+                html_content = _markdown_to_telegram_html(chunk)
+                await self._deliver(chat_id, html_content, target, parse_mode="HTML")
+            except Exception as e:
+                # Fallback to plain text if HTML parsing fails
+                logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+                try:
+                    await self._deliver(chat_id, chunk, target)
+                except Exception as e2:
+                    logger.error(f"Error sending Telegram message: {e2}")
+    
+    async def _send_partial(self, msg: OutboundMessage) -> None:
+        """Show an in-progress reply, editing the same message on each update."""
+        text = msg.content
+        if len(text) > TELEGRAM_MAX_MESSAGE_LEN:
+            text = text[: TELEGRAM_MAX_MESSAGE_LEN - 1] + "…"
+        
+        try:
+            chat_id = int(msg.chat_id)
+            message_id = self._stream_messages.get(msg.stream_id)
+            if message_id is None:
+                sent = await self._app.bot.send_message(chat_id=chat_id, text=text)
+                self._stream_messages[msg.stream_id] = sent.message_id
+            else:
+                await self._deliver(chat_id, text, message_id)
+        except Exception as e:
+            logger.debug(f"Telegram partial update failed for {msg.chat_id}: {e}")
+    
+    async def _deliver(
+        self, chat_id: int, text: str, message_id: int | None, parse_mode: str | None = None
+    ) -> None:
+        """Send a new message, or edit message_id in place if given."""
+        if message_id is None:
+            await self._app.bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+            return
+        
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id, text=text, parse_mode=parse_mode
+            )
+        except BadRequest as e:
+            # Editing to identical content is not an error for us
+            if "not modified" not in str(e).lower():
+                raise
     
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -240,7 +301,7 @@ class TelegramChannel(BaseChannel):
             return
         
         session = self.session_manager.get_or_create(session_key)
-        msg_count = len(session.messages)
+        msg_count = session.message_count
         session.clear()
         self.session_manager.save(session)
         
@@ -324,7 +385,7 @@ class TelegramChannel(BaseChannel):
                 # Handle voice transcription
                 if media_type == "voice" or media_type == "audio":
                     from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
+                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key, http=self.http)
                     transcription = await transcriber.transcribe(file_path)
                     if transcription:
                         logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
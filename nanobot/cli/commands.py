@@ -145,6 +145,45 @@ This file stores important information that should persist across sessions.
         console.print("  [dim]Created memory/MEMORY.md[/dim]")
 
 
+def _make_session_store(config):
+    """Create the session store selected by config.sessions.backend."""
+    from nanobot.session import JsonlSessionStore, SqliteSessionStore
+
+    if config.sessions.backend == "sqlite":
+        return SqliteSessionStore(Path.home() / ".nanobot" / "sessions.db")
+    if config.sessions.backend != "jsonl":
+        console.print(f"[yellow]Unknown sessions.backend '{config.sessions.backend}', using jsonl[/yellow]")
+    return JsonlSessionStore(Path.home() / ".nanobot" / "sessions")
+
+
+def _make_writer(config):
+    """Create the write-behind I/O queue, or None to write inline."""
+    from nanobot.utils.write_behind import FSYNC_POLICIES, WriteBehindQueue
+
+    if not config.persistence.write_behind:
+        return None
+    fsync = config.persistence.fsync
+    if fsync not in FSYNC_POLICIES:
+        console.print(f"[yellow]Unknown persistence.fsync '{fsync}', using batch[/yellow]")
+        fsync = "batch"
+    return WriteBehindQueue(fsync=fsync)
+
+
+def _make_http_clients(config):
+    """Create the shared HTTP client registry from config.http."""
+    from nanobot.utils.http import HttpClients
+
+    h = config.http
+    return HttpClients(
+        http2=h.http2,
+        max_connections=h.max_connections,
+        max_keepalive=h.max_keepalive,
+        max_per_host=h.max_per_host,
+        keepalive_expiry=h.keepalive_expiry,
+        proxy=h.proxy or None,
+    )
+
+
 def _make_provider(config):
     """Create LiteLLMProvider from config. Exits if no API key found."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
@@ -198,11 +237,20 @@ def gateway(
 
     bus = MessageBus()
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    writer = _make_writer(config)
+    http = _make_http_clients(config)
+    session_manager = SessionManager(
+        config.workspace_path,
+        store=_make_session_store(config),
+        cache_size=config.sessions.cache_size,
+        cache_bytes=config.sessions.cache_mb * 1024 * 1024,
+        tail_messages=config.sessions.tail_messages,
+        writer=writer,
+    )
 
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, writer=writer)
 
     # Create agent with cron service
     agent = AgentLoop(
@@ -211,11 +259,25 @@ def gateway(
         workspace=config.workspace_path,
         model=config.agents.defaults.model,
         max_iterations=config.agents.defaults.max_tool_iterations,
+        max_tokens=config.agents.defaults.max_tokens,
+        temperature=config.agents.defaults.temperature,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
+        max_concurrency=config.agents.defaults.max_concurrency,
+        streaming=config.agents.defaults.streaming,
+        context_window=config.agents.defaults.context_window,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        compaction_threshold=config.agents.defaults.compaction_threshold,
+        compaction_keep=config.agents.defaults.compaction_keep,
+        compaction_model=config.agents.defaults.compaction_model or None,
+        memory_tokens=config.agents.defaults.memory_tokens,
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
+        writer=writer,
+        http=http,
     )
 
     # Set cron callback (needs agent)
@@ -254,7 +316,7 @@ def gateway(
     )
 
     # Create channel manager
-    channels = ChannelManager(config, bus, session_manager=session_manager)
+    channels = ChannelManager(config, bus, session_manager=session_manager, http=http)
 
     if channels.enabled_channels:
         console.print(f"[green]✓[/green] Channels enabled: {', '.join(channels.enabled_channels)}")
@@ -297,8 +359,14 @@ def gateway(
             watcher_task.cancel()
             heartbeat.stop()
             cron.stop()
-            agent.stop()
+            await agent.aclose()
             await channels.stop_all()
+            if agent.shells is not None:
+                await agent.shells.aclose()
+            await http.aclose()
+            session_manager.close()
+            if writer:
+                writer.close()
 
     asyncio.run(run())
 
@@ -342,6 +410,14 @@ def agent(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        context_window=config.agents.defaults.context_window,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        compaction_threshold=config.agents.defaults.compaction_threshold,
+        compaction_keep=config.agents.defaults.compaction_keep,
+        compaction_model=config.agents.defaults.compaction_model or None,
+        memory_tokens=config.agents.defaults.memory_tokens,
+        web_fetch_config=config.tools.web.fetch,
+        web_search_config=config.tools.web.search,
     )
 
     if message:
@@ -362,8 +438,26 @@ def agent(
                     if not user_input.strip():
                         continue
 
-                    response = await agent_loop.process_direct(user_input, session_id)
-                    console.print(f"\n{__logo__} {response}\n")
+                    if not config.agents.defaults.streaming:
+                        response = await agent_loop.process_direct(user_input, session_id)
+                        console.print(f"\n{__logo__} {response}\n")
+                        continue
+
+                    streamed: list[str] = []
+
+                    async def on_delta(delta: str) -> None:
+                        if not streamed:
+                            console.print(f"\n{__logo__} ", end="")
+                        streamed.append(delta)
+                        console.print(delta, end="", markup=False, highlight=False)
+
+                    response = await agent_loop.process_direct(
+                        user_input, session_id, on_delta=on_delta
+                    )
+                    # Fallback replies (e.g. iteration limit) are never streamed
+                    if not "".join(streamed).endswith(response):
+                        console.print(f"\n{__logo__} {response}", end="")
+                    console.print("\n")
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
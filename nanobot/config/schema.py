@@ -65,6 +65,14 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    max_concurrency: int = 4  # Max sessions processed in parallel (1 = strictly serial)
+    streaming: bool = False  # Stream replies progressively (Telegram, Discord, CLI)
+    context_window: int = 0  # Model context window in tokens (0 = from the provider registry)
+    max_history_tokens: int = 16000  # Cap on history tokens per turn (0 = fill the context window)
+    compaction_threshold: int = 100  # Summarize older turns past this many unsummarized messages (0 = off)
+    compaction_keep: int = 40  # Recent messages always kept verbatim when summarizing
+    compaction_model: str = ""  # Model for summaries, e.g. a cheaper one ("" = agent model)
+    memory_tokens: int = 2000  # MEMORY.md budget; larger files inject only relevant sections (0 = whole file)
 
 
 class AgentsConfig(BaseModel):
@@ -104,23 +112,69 @@ class GatewayConfig(BaseModel):
     port: int = 18790
 
 
+class SessionsConfig(BaseModel):
+    """Conversation session storage configuration."""
+
+    backend: str = "jsonl"  # "jsonl" (one file per session) or "sqlite" (~/.nanobot/sessions.db)
+    cache_size: int = 1000  # Max sessions kept in memory
+    cache_mb: int = 64  # Approximate memory budget for cached sessions
+    tail_messages: int = 200  # Newest messages loaded per session (0 = load everything)
+
+
+class PersistenceConfig(BaseModel):
+    """Background persistence of sessions, memory notes and cron jobs."""
+
+    write_behind: bool = True  # Write on a dedicated I/O thread instead of the event loop
+    fsync: str = "batch"  # "never", "batch" (when the write queue drains) or "always" (every write)
+
+
+class HttpConfig(BaseModel):
+    """Shared HTTP connection pools (web tools, transcription, Discord REST)."""
+
+    http2: bool = False  # Negotiate HTTP/2 where supported (needs the 'h2' package)
+    max_connections: int = 100  # Open connections per client
+    max_keepalive: int = 20  # Idle connections kept alive per client
+    max_per_host: int = 10  # Concurrent requests per host (0 = no limit)
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    proxy: str = ""  # e.g. "http://proxy:8080" or "socks5://..." ("" = use *_PROXY env vars)
+
+
 class WebSearchConfig(BaseModel):
     """Web search tool configuration."""
 
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    cache_ttl: int = 600  # Seconds identical searches reuse results; 0 disables the cache
+    cache_entries: int = 512  # Max cached searches
+    cache_mb: int = 4  # Max total size of cached results
+
+
+class WebFetchConfig(BaseModel):
+    """Web fetch tool configuration."""
+
+    cache: bool = True  # Cache pages and extracted text in ~/.nanobot/cache/web
+    cache_mb: int = 100  # Cache size cap; least recently used pages are evicted
+    cache_ttl: int = 300  # Minimum seconds a cached page is reused without revalidation
+    extract_workers: int = 2  # Worker processes for HTML extraction (readability)
+    extract_timeout: float = 15.0  # Seconds allowed to extract one page
 
 
 class WebToolsConfig(BaseModel):
     """Web tools configuration."""
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
 
 
 class ExecToolConfig(BaseModel):
     """Shell exec tool configuration."""
 
     timeout: int = 60
+    persistent_shell: bool = False  # Keep one shell per chat so cd/export/venvs persist
+    shell_idle_timeout: int = 600  # Seconds before an idle persistent shell is closed
+    max_shells: int = 8  # Persistent shells kept at once (LRU idle one is evicted)
+    max_output_mb: int = 64  # Commands writing more to stdout or stderr are killed
+    spill_output: bool = True  # Save full output of truncated commands in workspace/.exec-output
 
 
 class ToolsConfig(BaseModel):
@@ -138,6 +192,9 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    persistence: PersistenceConfig = Field(default_factory=PersistenceConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
     @property
@@ -5,12 +5,15 @@ import json
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
 
+if TYPE_CHECKING:
+    from nanobot.utils.write_behind import WriteBehindQueue
+
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
@@ -45,10 +48,12 @@ class CronService:
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        writer: "WriteBehindQueue | None" = None,
     ):
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.writer = writer  # Saves run on its I/O thread; None saves inline
         self._store: CronStore | None = None
         self._timer_task: asyncio.Task | None = None
         self._running = False
@@ -101,12 +106,10 @@ class CronService:
         return self._store
     
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Save jobs to disk (queued on the writer, if any)."""
         if not self._store:
             return
         
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        
         data = {
             "version": self._store.version,
             "jobs": [
@@ -142,7 +145,17 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        text = json.dumps(data, indent=2)
+        
+        def write() -> list[Path]:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            self.store_path.write_text(text)
+            return [self.store_path]
+        
+        if self.writer is None:
+            write()
+        else:
+            self.writer.submit(("cron", self.store_path), write)
     
     async def start(self) -> None:
         """Start the cron service."""
@@ -2,7 +2,10 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Awaitable, Callable
+
+# Context window assumed when a model's limit is unknown
+DEFAULT_CONTEXT_WINDOW = 32_768
 
 
 @dataclass
@@ -63,6 +66,47 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request, reporting content deltas as they arrive.
+        
+        Providers without native streaming fall back to chat() and report the
+        whole content as a single delta.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            on_delta: Optional async callback receiving each text delta.
+        
+        Returns:
+            The complete LLMResponse once the stream has finished.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if on_delta and response.content and response.finish_reason != "error":
+            await on_delta(response.content)
+        return response
+    
+    def get_context_window(self, model: str | None = None) -> int:
+        """Get the context window (in tokens) of a model."""
+        return DEFAULT_CONTEXT_WINDOW
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
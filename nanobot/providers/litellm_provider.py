@@ -2,12 +2,12 @@
 
 import json
 import os
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import DEFAULT_CONTEXT_WINDOW, LLMProvider, LLMResponse, ToolCallRequest
 from nanobot.providers.registry import find_by_model, find_gateway
 
 
@@ -119,7 +119,125 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
-        model = self._resolve_model(model or self.default_model)
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+
+        self._log_request(kwargs)
+
+        try:
+            response = await acompletion(**kwargs)
+            self._log_response(response)
+            return self._parse_response(response)
+        except Exception as e:
+            # Return error as content for graceful handling
+            from loguru import logger
+
+            logger.error(f"Error calling LLM: {str(e)}")
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+    ) -> LLMResponse:
+        """
+        Send a streaming chat completion request via LiteLLM.
+
+        Text deltas are passed to on_delta as they arrive; tool call fragments
+        are accumulated and returned in the final LLMResponse.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        self._log_request(kwargs)
+
+        try:
+            stream = await acompletion(**kwargs)
+            content_parts: list[str] = []
+            tool_parts: dict[int, dict[str, str]] = {}
+            finish_reason = "stop"
+            usage: dict[str, int] = {}
+
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+
+                choice = chunk.choices[0]
+                delta = choice.delta
+                if delta and delta.content:
+                    content_parts.append(delta.content)
+                    if on_delta:
+                        await on_delta(delta.content)
+
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    index = tc.index if tc.index is not None else len(tool_parts)
+                    part = tool_parts.setdefault(index, {"id": "", "name": "", "arguments": ""})
+                    if tc.id:
+                        part["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        part["name"] = tc.function.name
+                    if tc.function and tc.function.arguments:
+                        part["arguments"] += tc.function.arguments
+
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+            tool_calls = [
+                ToolCallRequest(
+                    id=part["id"],
+                    name=part["name"],
+                    arguments=self._parse_arguments(part["arguments"] or "{}"),
+                )
+                for _, part in sorted(tool_parts.items())
+            ]
+            response = LLMResponse(
+                content="".join(content_parts) or None,
+                tool_calls=tool_calls,
+                finish_reason=finish_reason,
+                usage=usage,
+            )
+
+            from loguru import logger
+
+            logger.info(
+                f"📥 LLM stream finished ({finish_reason}): "
+                f"{len(response.content or '')} chars, {len(tool_calls)} tool calls"
+            )
+            if usage:
+                self._log_usage(usage)
+            return response
+        except Exception as e:
+            from loguru import logger
+
+            logger.error(f"Error calling LLM: {str(e)}")
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion keyword arguments for a request."""
+        requested = model or self.default_model
+        model = self._resolve_model(requested)
+
+        if self._supports_prompt_caching(requested):
+            messages, tools = self._apply_cache_control(messages, tools)
 
         kwargs: dict[str, Any] = {
             "model": model,
@@ -143,21 +261,61 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
 
-        self._log_request(kwargs)
+        return kwargs
 
-        try:
-            response = await acompletion(**kwargs)
-            self._log_response(response)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            from loguru import logger
+    def _supports_prompt_caching(self, model: str) -> bool:
+        """Check whether requests for a model should carry cache breakpoints."""
+        spec = find_by_model(model)
+        if not spec or not spec.supports_prompt_caching:
+            return False
+        return not self._gateway or self._gateway.supports_prompt_caching
 
-            logger.error(f"Error calling LLM: {str(e)}")
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+    @staticmethod
+    def _apply_cache_control(
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+        """
+        Mark prompt-cache breakpoints on a copy of the request.
+
+        Breakpoints go on the last tool definition, the system prompt, the last
+        history message before the current user turn and the newest message of
+        a tool-call loop (four, the Anthropic maximum). Each call then reads the
+        prefix written by the previous one; the volatile runtime context lives
+        in the current user turn, after every breakpoint.
+        """
+        marker = {"type": "ephemeral"}
+
+        def mark(message: dict[str, Any]) -> dict[str, Any] | None:
+            content = message.get("content")
+            if isinstance(content, str) and content:
+                blocks = [{"type": "text", "text": content, "cache_control": marker}]
+            elif isinstance(content, list) and content:
+                blocks = content[:-1] + [{**content[-1], "cache_control": marker}]
+            else:
+                return None
+            return {**message, "content": blocks}
+
+        messages = list(messages)
+        targets: set[int] = set()
+        if messages and messages[0].get("role") == "system":
+            targets.add(0)
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=None)
+        if last_user is not None:
+            if last_user > 0:
+                targets.add(last_user - 1)
+            if last_user < len(messages) - 1:
+                targets.add(len(messages) - 1)
+
+        for i in targets:
+            marked = mark(messages[i])
+            if marked:
+                messages[i] = marked
+
+        if tools:
+            tools = tools[:-1] + [{**tools[-1], "cache_control": marker}]
+
+        return messages, tools
 
     def _log_request(self, kwargs: dict[str, Any]) -> None:
         """Log the LLM request details."""
@@ -207,10 +365,7 @@ class LiteLLMProvider(LLMProvider):
         logger.info(f"Finish Reason: {choice.finish_reason}")
 
         if usage:
-            logger.info("Token Usage:")
-            logger.info(f"  - Prompt: {usage.prompt_tokens}")
-            logger.info(f"  - Completion: {usage.completion_tokens}")
-            logger.info(f"  - Total: {usage.total_tokens}")
+            self._log_usage(self._parse_usage(usage))
 
         content = message.content
         if content:
@@ -226,6 +381,21 @@ class LiteLLMProvider(LLMProvider):
 
         logger.info("=" * 80)
 
+    @staticmethod
+    def _log_usage(usage: dict[str, int]) -> None:
+        """Log token usage parsed by _parse_usage, including prompt-cache counters."""
+        from loguru import logger
+
+        logger.info("Token Usage:")
+        logger.info(f"  - Prompt: {usage['prompt_tokens']}")
+        logger.info(f"  - Completion: {usage['completion_tokens']}")
+        logger.info(f"  - Total: {usage['total_tokens']}")
+        if "cache_read_tokens" in usage or "cache_write_tokens" in usage:
+            logger.info(
+                f"  - Cache: {usage.get('cache_read_tokens', 0)} read, "
+                f"{usage.get('cache_write_tokens', 0)} written"
+            )
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
         choice = response.choices[0]
@@ -234,29 +404,17 @@ class LiteLLMProvider(LLMProvider):
         tool_calls = []
         if hasattr(message, "tool_calls") and message.tool_calls:
             for tc in message.tool_calls:
-                # Parse arguments from JSON string if needed
-                args = tc.function.arguments
-                if isinstance(args, str):
-                    try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
-                        args = {"raw": args}
-
                 tool_calls.append(
                     ToolCallRequest(
                         id=tc.id,
                         name=tc.function.name,
-                        arguments=args,
+                        arguments=self._parse_arguments(tc.function.arguments),
                     )
                 )
 
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
 
         return LLMResponse(
             content=message.content,
@@ -265,6 +423,48 @@ class LiteLLMProvider(LLMProvider):
             usage=usage,
         )
 
+    @staticmethod
+    def _parse_arguments(args: Any) -> dict[str, Any]:
+        """Parse tool call arguments from a JSON string if needed."""
+        if isinstance(args, str):
+            try:
+                return json.loads(args)
+            except json.JSONDecodeError:
+                return {"raw": args}
+        return args
+
+    @staticmethod
+    def _parse_usage(usage: Any) -> dict[str, int]:
+        """
+        Convert a LiteLLM usage object into a plain dict.
+
+        Prompt-cache counters are included as 'cache_read_tokens' and
+        'cache_write_tokens' when the provider reports them.
+        """
+        result = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cache_read = getattr(details, "cached_tokens", None) or getattr(usage, "cache_read_input_tokens", None)
+        cache_write = getattr(usage, "cache_creation_input_tokens", None)
+        if cache_read:
+            result["cache_read_tokens"] = cache_read
+        if cache_write:
+            result["cache_write_tokens"] = cache_write
+        return result
+
+    def get_context_window(self, model: str | None = None) -> int:
+        """Get the context window of a model from the provider registry."""
+        spec = find_by_model(model or self.default_model)
+        if spec and spec.context_window:
+            return spec.context_window
+        if self._gateway and self._gateway.context_window:
+            return self._gateway.context_window
+        return DEFAULT_CONTEXT_WINDOW
+
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
@@ -48,6 +48,13 @@ class ProviderSpec:
     # gateway behavior
     strip_model_prefix: bool = False         # strip "provider/" before re-prefixing
 
+    # default context window in tokens for this provider's models (0 = unknown)
+    context_window: int = 0
+
+    # prompt caching: accepts Anthropic-style cache_control breakpoints
+    # (for gateways: passes them through to providers that do)
+    supports_prompt_caching: bool = False
+
     # per-model param overrides, e.g. (("kimi-k2.5", {"temperature": 1.0}),)
     model_overrides: tuple[tuple[str, dict[str, Any]], ...] = ()
 
@@ -80,6 +87,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="openrouter",
         default_api_base="https://openrouter.ai/api/v1",
         strip_model_prefix=False,
+        context_window=0,                   # depends on the routed model
+        supports_prompt_caching=True,
         model_overrides=(),
     ),
 
@@ -100,6 +109,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="aihubmix",
         default_api_base="https://aihubmix.com/v1",
         strip_model_prefix=True,            # anthropic/claude-3 → claude-3 → openai/claude-3
+        context_window=0,                   # depends on the routed model
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -120,6 +131,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=200_000,
+        supports_prompt_caching=True,
         model_overrides=(),
     ),
 
@@ -138,6 +151,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=128_000,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -156,6 +171,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=64_000,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -174,6 +191,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=1_000_000,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -196,6 +215,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=128_000,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -214,6 +235,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=32_000,              # qwen-max; qwen-plus/turbo are larger
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -236,6 +259,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="https://api.moonshot.ai/v1",   # intl; use api.moonshot.cn for China
         strip_model_prefix=False,
+        context_window=128_000,
+        supports_prompt_caching=False,
         model_overrides=(
             ("kimi-k2.5", {"temperature": 1.0}),
         ),
@@ -260,6 +285,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",                # user must provide in config
         strip_model_prefix=False,
+        context_window=0,                   # model-specific; set agents.defaults.contextWindow
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -281,6 +308,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        context_window=8_192,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 )
@@ -0,0 +1,334 @@
+"""JSONL session store: one append-only file per session."""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import quote
+
+from loguru import logger
+
+from nanobot.session.manager import Session
+from nanobot.session.store import SessionStore
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+
+@dataclass
+class _FileState:
+    """What the session file on disk already holds."""
+
+    count: int = 0  # Messages written
+    last: dict[str, Any] | None = None  # Last message written (identity check)
+    stale_bytes: int = 0  # Superseded metadata lines and corrupt lines
+    trailer_bytes: int = 0  # Size of the current metadata trailer
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Session store writing one JSONL file per session.
+
+    Each file holds one line per message followed by a metadata trailer.
+    Saves append the new messages and a fresh trailer; the file is rewritten
+    (atomically) only when it can't be extended safely or superseded
+    trailers pile up. Tail-only loads read the file backwards from the trailer.
+    """
+
+    # Rewrite a session file once superseded metadata trailers exceed this size
+    COMPACT_STALE_BYTES = 1024 * 1024
+
+    def __init__(self, sessions_dir: Path):
+        self.sessions_dir = ensure_dir(sessions_dir)
+
+    def _get_session_path(self, key: str) -> Path:
+        """
+        Get the file path for a session.
+
+        Keys are percent-encoded, so two keys never share a file. A file still
+        under its old lossy name is moved to the new one.
+        """
+        path = self.sessions_dir / f"{quote(key, safe='')}.jsonl"
+        if not path.exists():
+            self._migrate_legacy_path(key, path)
+        return path
+
+    def _migrate_legacy_path(self, key: str, path: Path) -> None:
+        """Rename a session file from the old name (":" replaced by "_")."""
+        legacy = self.sessions_dir / f"{safe_filename(key.replace(':', '_'))}.jsonl"
+        if legacy == path or not legacy.exists():
+            return
+        try:
+            data = self._read_metadata(legacy)
+        except Exception as e:
+            logger.warning(f"Cannot migrate session file {legacy.name}: {e}")
+            return
+        if data and data.get("key", key) != key:
+            return  # Belongs to another key with the same old name
+        os.replace(legacy, path)
+        logger.info(f"Renamed session file {legacy.name} to {path.name}")
+
+    def load(self, key: str, tail_messages: int = 0) -> Session | None:
+        """Load a session from disk (tail only when possible)."""
+        path = self._get_session_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            session = self._load_tail(key, path, tail_messages) if tail_messages else None
+            return session or self._load_full(key, path)
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    def _load_full(self, key: str, path: Path) -> Session:
+        """Load every message of a session file."""
+        messages, trailer, stale_bytes, trailer_bytes = self._read_file(path)
+        trailer = trailer or {}
+        session = self._make_session(key, messages, trailer.get("created_at"), trailer.get("metadata"))
+        session.persisted = _FileState(
+            count=len(messages),
+            last=messages[-1] if messages else None,
+            stale_bytes=stale_bytes,
+            trailer_bytes=trailer_bytes,
+        )
+        return session
+
+    def _load_tail(self, key: str, path: Path, tail_messages: int) -> Session | None:
+        """
+        Load only the newest messages, reading the file backwards.
+
+        Returns:
+            The session, or None if the file needs a full load (no trailer
+            with a message count, e.g. a legacy file, or a corrupt line).
+        """
+        trailer = None
+        trailer_bytes = 0
+        messages: list[dict[str, Any]] = []
+
+        for line in self._iter_lines_reversed(path):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                return None  # Torn write; the full load skips it
+
+            if data.get("_type") == "metadata":
+                if trailer is None:
+                    trailer = data
+                    trailer_bytes = len(line) + 1
+                continue
+            if trailer is None or "message_count" not in trailer:
+                return None
+
+            messages.append(data)
+            if len(messages) >= tail_messages:
+                break
+
+        if trailer is None or "message_count" not in trailer:
+            return None
+        offset = trailer["message_count"] - len(messages)
+        if offset < 0:
+            return None
+
+        messages.reverse()
+        session = self._make_session(key, messages, trailer.get("created_at"), trailer.get("metadata"))
+        session.offset = offset
+        session.persisted = _FileState(
+            count=trailer["message_count"],
+            last=messages[-1] if messages else None,
+            stale_bytes=trailer.get("stale_bytes", 0),
+            trailer_bytes=trailer_bytes,
+        )
+        return session
+
+    def load_older(self, session: Session) -> None:
+        """Load the messages a tail-only load left on disk."""
+        if not session.offset:
+            return
+        messages, _, _, _ = self._read_file(self._get_session_path(session.key))
+        session.messages = messages[:session.offset] + session.messages
+        session.offset = 0
+
+    def _read_file(self, path: Path) -> tuple[list[dict[str, Any]], dict[str, Any] | None, int, int]:
+        """
+        Parse a whole session file.
+
+        Returns:
+            (messages, latest metadata line, stale bytes, trailer bytes).
+        """
+        messages = []
+        trailer = None
+        # Bytes of metadata lines superseded by a later one
+        stale_bytes = 0
+        trailer_bytes = 0
+
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write from a crash; skip it (the next save rewrites the file)
+                    logger.warning(f"Skipping corrupt line in {path.name}")
+                    stale_bytes += len(line) + 1
+                    continue
+
+                if data.get("_type") == "metadata":
+                    # Legacy files have it first; appended files end with the latest one
+                    stale_bytes += trailer_bytes
+                    trailer_bytes = len(line) + 1
+                    trailer = data
+                else:
+                    messages.append(data)
+
+        return messages, trailer, stale_bytes, trailer_bytes
+
+    @staticmethod
+    def _iter_lines_reversed(path: Path, chunk_size: int = 65536) -> Iterator[str]:
+        """Yield the lines of a file from last to first, reading it in chunks."""
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            buffer = b""
+            while pos > 0:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                buffer = f.read(step) + buffer
+                lines = buffer.split(b"\n")
+                buffer = lines[0]  # May continue in the previous chunk
+                for line in reversed(lines[1:]):
+                    yield line.decode("utf-8")
+            yield buffer.decode("utf-8")
+
+    def save(self, session: Session) -> list[Path]:
+        """
+        Save a session to disk.
+
+        Only messages added since the last save are appended, followed by a
+        metadata trailer, so a save costs O(new messages). The file is
+        rewritten atomically instead when it can't be extended safely (new
+        or unknown file, session cleared, torn last line) or when superseded
+        trailers exceed COMPACT_STALE_BYTES.
+        """
+        path = self._get_session_path(session.key)
+        state = session.persisted if isinstance(session.persisted, _FileState) else None
+
+        if state and self._can_append(path, session, state):
+            state.stale_bytes += state.trailer_bytes
+            trailer = json.dumps(self._metadata_line(session, state.stale_bytes)) + "\n"
+            new = session.messages[state.count - session.offset:]
+            lines = [json.dumps(msg) + "\n" for msg in new]
+            with open(path, "a") as f:
+                f.write("".join(lines) + trailer)
+        else:
+            # A rewrite must not lose messages a tail-only load left on disk
+            self.load_older(session)
+            trailer = json.dumps(self._metadata_line(session, 0)) + "\n"
+            self._rewrite(path, session, trailer)
+            state = _FileState()
+
+        state.count = session.message_count
+        state.last = session.messages[-1] if session.messages else None
+        state.trailer_bytes = len(trailer)
+        session.persisted = state
+        return [path]
+
+    def _can_append(self, path: Path, session: Session, state: _FileState) -> bool:
+        """Check whether the session file can be extended in place."""
+        index = state.count - session.offset - 1
+        if not state.count or not 0 <= index < len(session.messages):
+            return False
+        if session.messages[index] is not state.last:
+            return False  # History was replaced (e.g. cleared and refilled)
+        if state.stale_bytes + state.trailer_bytes > self.COMPACT_STALE_BYTES:
+            return False
+        try:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def _rewrite(self, path: Path, session: Session, trailer: str) -> None:
+        """Atomically replace a session file with its full contents."""
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w") as f:
+            for msg in session.messages:
+                f.write(json.dumps(msg) + "\n")
+            f.write(trailer)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _metadata_line(session: Session, stale_bytes: int) -> dict[str, Any]:
+        """Build the metadata record written after a session's messages."""
+        return {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "message_count": session.message_count,
+            "stale_bytes": stale_bytes,
+        }
+
+    def delete(self, key: str) -> bool:
+        """Delete a session file."""
+        path = self._get_session_path(key)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+    def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        List sessions by reading each file's metadata trailer.
+
+        Every file is opened, so this is O(sessions); use the SQLite store
+        for large deployments.
+        """
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                data = self._read_metadata(path)
+                if data:
+                    sessions.append({
+                        # Legacy files don't record their key, and their name is lossy
+                        "key": data.get("key") or path.stem.replace("_", ":"),
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+
+        sessions.sort(key=lambda x: x.get("updated_at") or "", reverse=True)
+        return sessions[offset:offset + limit] if limit is not None else sessions[offset:]
+
+    def _read_metadata(self, path: Path) -> dict[str, Any] | None:
+        """Read a session file's latest metadata: the trailer, or a legacy first line."""
+        for line in self._iter_lines_reversed(path):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if data.get("_type") == "metadata":
+                return data
+            break
+
+        with open(path) as f:
+            first_line = f.readline().strip()
+        if first_line:
+            data = json.loads(first_line)
+            if data.get("_type") == "metadata":
+                return data
+        return None
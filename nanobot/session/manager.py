@@ -1,14 +1,23 @@
 """Session management for conversation history."""
 
-import json
+import asyncio
+import copy
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.tokens import count_message_tokens
+
+if TYPE_CHECKING:
+    from nanobot.session.store import SessionStore
+    from nanobot.utils.write_behind import WriteBehindQueue
+
+# Summarizer(previous_summary, messages) -> new summary covering both
+Summarizer = Callable[[str, list[dict[str, Any]]], Awaitable[str]]
 
 
 @dataclass
@@ -17,6 +26,14 @@ class Session:
     A conversation session.
     
     Stores messages in JSONL format for easy reading and persistence.
+    
+    Once older messages have been compacted, metadata["summary"] holds
+    {"text", "until", "tokens"}: a summary of the first `until` messages,
+    which get_history returns in place of those messages.
+    
+    A session may be loaded tail-only: `messages` then holds the newest
+    messages and `offset` counts the older ones left in the store (see
+    SessionManager.load_older). Message indices in metadata are absolute.
     """
     
     key: str  # channel:chat_id
@@ -24,6 +41,13 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    offset: int = 0  # Older messages not loaded into memory
+    persisted: Any = field(default=None, repr=False, compare=False)  # Store bookkeeping
+    
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, including those not loaded."""
+        return self.offset + len(self.messages)
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -33,28 +57,75 @@ class Session:
             "timestamp": datetime.now().isoformat(),
             **kwargs
         }
+        msg["tokens"] = count_message_tokens(msg)
         self.messages.append(msg)
         self.updated_at = datetime.now()
     
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+    def get_history(
+        self,
+        max_messages: int | None = 50,
+        max_tokens: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
         
         Args:
-            max_messages: Maximum messages to return.
+            max_messages: Maximum messages to return (None for no limit).
+            max_tokens: If given, return only the most recent messages whose
+                combined token count fits within this budget.
         
         Returns:
             List of messages in LLM format.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+        summary = self.metadata.get("summary")
+        floor = max(0, summary["until"] - self.offset) if summary else 0
+        
+        if max_tokens is None:
+            # Get recent messages
+            start = max(floor, len(self.messages) - max_messages) if max_messages else floor
+            recent = self.messages[start:]
+        else:
+            if summary:
+                max_tokens -= summary["tokens"]
+            recent = self._fit_tokens(max_tokens, max_messages, floor)
         
         # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        history = [{"role": m["role"], "content": m["content"]} for m in recent]
+        if summary:
+            history.insert(0, {"role": "user", "content": self._summary_message(summary["text"])})
+        return history
+    
+    @staticmethod
+    def _summary_message(text: str) -> str:
+        """Format a compaction summary as a history message."""
+        return f"[Summary of the earlier conversation]\n{text}"
+    
+    def _fit_tokens(self, max_tokens: int, max_messages: int | None, floor: int = 0) -> list[dict[str, Any]]:
+        """Pack the newest messages after floor that fit in a token budget."""
+        start = len(self.messages)
+        used = 0
+        limit = max(floor, len(self.messages) - max_messages) if max_messages else floor
+        while start > limit:
+            msg = self.messages[start - 1]
+            tokens = msg.get("tokens")
+            if tokens is None:
+                # Loaded from a file written before counts were stored
+                tokens = msg["tokens"] = count_message_tokens(msg)
+            if used + tokens > max_tokens:
+                break
+            used += tokens
+            start -= 1
+        
+        # Don't open the history with a reply whose question was cut off
+        if floor < start < len(self.messages) and self.messages[start]["role"] == "assistant":
+            start += 1
+        return self.messages[start:]
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self.offset = 0
+        self.metadata.pop("summary", None)
         self.updated_at = datetime.now()
 
 
@@ -62,18 +133,146 @@ class SessionManager:
     """
     Manages conversation sessions.
     
-    Sessions are stored as JSONL files in the sessions directory.
+    Persistence is delegated to a SessionStore: by default one JSONL file
+    per session in ~/.nanobot/sessions (see JsonlSessionStore), or an
+    SQLite database (see SqliteSessionStore).
+    
+    Loaded sessions are kept in an LRU cache bounded by count and estimated
+    size. A cache miss loads only the newest tail_messages messages.
     """
     
-    def __init__(self, workspace: Path):
+    # Most message tokens folded into the summary by one summarizer call
+    COMPACTION_CHUNK_TOKENS = 24_000
+    
+    # Estimated per-message memory overhead beyond its content
+    MESSAGE_OVERHEAD_BYTES = 256
+    
+    def __init__(
+        self,
+        workspace: Path,
+        store: "SessionStore | None" = None,
+        cache_size: int = 1000,
+        cache_bytes: int = 64 * 1024 * 1024,
+        tail_messages: int = 200,
+        writer: "WriteBehindQueue | None" = None,
+    ):
+        from nanobot.session.jsonl_store import JsonlSessionStore
+        
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
-        self._cache: dict[str, Session] = {}
+        self.store = store or JsonlSessionStore(Path.home() / ".nanobot" / "sessions")
+        self.writer = writer  # Saves run on its I/O thread; None saves inline
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.tail_messages = tail_messages
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._cache_sizes: dict[str, int] = {}
+        self._cached_bytes = 0
+        self.summarizer: Summarizer | None = None
+        self.compact_threshold = 0
+        self.compact_keep = 40
+        self._compactions: dict[str, asyncio.Task] = {}
+    
+    def enable_compaction(self, summarizer: Summarizer, threshold: int = 100, keep_recent: int = 40) -> None:
+        """
+        Fold older messages of long sessions into a summary in the background.
+        
+        Args:
+            summarizer: Async function producing the new summary.
+            threshold: Compact once a session has more unsummarized messages than this.
+            keep_recent: Number of recent messages always kept verbatim.
+        """
+        self.summarizer = summarizer
+        self.compact_threshold = threshold
+        self.compact_keep = max(1, keep_recent)
+    
+    def _needs_compaction(self, session: Session) -> bool:
+        """Check whether a session is over the compaction threshold."""
+        if not self.summarizer or not self.compact_threshold:
+            return False
+        summary = session.metadata.get("summary")
+        unsummarized = session.message_count - (summary["until"] if summary else 0)
+        return unsummarized > self.compact_threshold
+    
+    def _maybe_compact(self, session: Session) -> None:
+        """Schedule a background compaction if the session needs one."""
+        if session.key in self._compactions or not self._needs_compaction(session):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (e.g. a sync caller); the next save retries
+        
+        task = loop.create_task(self._run_compaction(session))
+        self._compactions[session.key] = task
+        task.add_done_callback(lambda _: self._compactions.pop(session.key, None))
+    
+    async def _run_compaction(self, session: Session) -> None:
+        """Compact a session in chunks until it is under the threshold."""
+        while self._needs_compaction(session) and await self.compact(session):
+            pass
+    
+    async def compact(self, session: Session) -> bool:
+        """
+        Fold the oldest unsummarized messages of a session into its summary.
+        
+        At most COMPACTION_CHUNK_TOKENS of messages are folded per call, ending
+        on a turn boundary, and the newest compact_keep messages are never folded.
+        
+        Args:
+            session: The session to compact.
+        
+        Returns:
+            True if the summary was updated.
+        """
+        if not self.summarizer:
+            return False
+        
+        summary = session.metadata.get("summary") or {"text": "", "until": 0}
+        if summary["until"] < session.offset:
+            # Unsummarized messages were left on disk by a tail-only load
+            await self.aload_older(session)
+        
+        messages = session.messages
+        start = end = summary["until"] - session.offset
+        stop = len(messages) - self.compact_keep
+        used = 0
+        while end < stop:
+            msg = messages[end]
+            tokens = msg.get("tokens") or count_message_tokens(msg)
+            if used and used + tokens > self.COMPACTION_CHUNK_TOKENS:
+                break
+            used += tokens
+            end += 1
+        
+        # End on a turn boundary so the verbatim tail opens with a user message
+        while end > start and messages[end]["role"] != "user":
+            end -= 1
+        if end <= start:
+            return False
+        
+        until = session.offset + end
+        anchor = messages[end - 1]
+        try:
+            text = await self.summarizer(summary["text"], messages[start:end])
+        except Exception as e:
+            logger.warning(f"Failed to compact session {session.key}: {e}")
+            return False
+        
+        # The session may have been cleared while the summary was generated
+        index = until - 1 - session.offset
+        if not 0 <= index < len(session.messages) or session.messages[index] is not anchor:
+            return False
+        
+        tokens = count_message_tokens({"role": "user", "content": Session._summary_message(text)})
+        session.metadata["summary"] = {"text": text, "until": until, "tokens": tokens}
+        self.save(session)
+        logger.info(f"Compacted session {session.key}: folded {end - start} messages into summary")
+        return True
     
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+    async def wait_compactions(self) -> None:
+        """Wait for all in-flight background compactions to finish."""
+        while self._compactions:
+            await asyncio.gather(*self._compactions.values(), return_exceptions=True)
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -86,72 +285,128 @@ class SessionManager:
             The session.
         """
         # Check cache
-        if key in self._cache:
-            return self._cache[key]
+        session = self._cache.get(key)
+        if session is not None:
+            self._cache.move_to_end(key)
+            return session
         
-        # Try to load from disk
         session = self._load(key)
+        self._remember(session)
+        return session
+    
+    async def aget_or_create(self, key: str) -> Session:
+        """Like get_or_create, but a cache miss is loaded in a worker thread."""
+        session = self._cache.get(key)
         if session is None:
-            session = Session(key=key)
-        
-        self._cache[key] = session
+            loaded = await asyncio.to_thread(self._load, key)
+            # Another task may have loaded the session meanwhile
+            session = self._cache.get(key)
+            if session is None:
+                self._remember(loaded)
+                return loaded
+        self._cache.move_to_end(key)
         return session
     
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
+    def _load(self, key: str) -> Session:
+        """Load a session from the store, or make a new one (no cache access)."""
+        # An evicted session may still be queued for writing
+        if self.writer:
+            self.writer.flush_key(("session", key))
+        return self.store.load(key, self.tail_messages) or Session(key=key)
+    
+    def _remember(self, session: Session) -> None:
+        """Insert or refresh a session in the LRU cache, evicting as needed."""
+        key = session.key
+        size = sum(len(m.get("content") or "") for m in session.messages)
+        size += len(session.messages) * self.MESSAGE_OVERHEAD_BYTES
         
-        if not path.exists():
-            return None
+        self._cached_bytes += size - self._cache_sizes.get(key, 0)
+        self._cache_sizes[key] = size
+        self._cache[key] = session
+        self._cache.move_to_end(key)
         
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
-            
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    data = json.loads(line)
-                    
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
-            
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
+        # Evict least recently used sessions; never the current one or one being compacted
+        for old_key in list(self._cache):
+            if len(self._cache) <= self.cache_size and self._cached_bytes <= self.cache_bytes:
+                break
+            if old_key == key or old_key in self._compactions:
+                continue
+            self._forget(old_key)
+    
+    def _forget(self, key: str) -> None:
+        """Drop a session from the cache."""
+        self._cache.pop(key, None)
+        self._cached_bytes -= self._cache_sizes.pop(key, 0)
+    
+    def load_older(self, session: Session) -> None:
+        """
+        Load the messages a tail-only load left in the store.
+        
+        Args:
+            session: A session returned by get_or_create.
+        """
+        offset = session.offset
+        if offset:
+            self._merge_older(session, offset, self._read_older(session.key, offset))
+    
+    async def aload_older(self, session: Session) -> None:
+        """Like load_older, but the store is read in a worker thread."""
+        offset = session.offset
+        if offset:
+            older = await asyncio.to_thread(self._read_older, session.key, offset)
+            self._merge_older(session, offset, older)
+    
+    def _read_older(self, key: str, offset: int) -> list[dict[str, Any]]:
+        """Read the messages before `offset` from the store (no session access)."""
+        if self.writer:
+            self.writer.flush_key(("session", key))
+        older = Session(key=key, offset=offset)
+        self.store.load_older(older)
+        return older.messages
+    
+    def _merge_older(self, session: Session, offset: int, older: list[dict[str, Any]]) -> None:
+        """Prepend the messages _read_older read for `offset`."""
+        if session.offset != offset:
+            return  # Loaded or cleared while the store was read
+        session.messages = older + session.messages
+        session.offset = 0
+        if session.key in self._cache:
+            self._remember(session)
     
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-        
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-        
-        self._cache[session.key] = session
+        """
+        Save a session to the store.
+        
+        With a writer, the save is queued on its I/O thread: a snapshot of the
+        session is taken now (messages are never mutated once added, so a
+        shallow copy of the list suffices) and repeated saves coalesce.
+        """
+        if self.writer is None:
+            self.store.save(session)
+        else:
+            self.writer.submit(("session", session.key), self._save_job(session))
+        self._remember(session)
+        self._maybe_compact(session)
+    
+    def _save_job(self, session: Session) -> Callable[[], list[Path]]:
+        """Build a write job persisting the session as it is now."""
+        snapshot = Session(
+            key=session.key,
+            messages=list(session.messages),
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            metadata=copy.deepcopy(session.metadata),
+            offset=session.offset,
+        )
+        
+        def job() -> list[Path]:
+            # Store bookkeeping is only touched on the I/O thread from here on
+            snapshot.persisted = session.persisted
+            paths = self.store.save(snapshot)
+            session.persisted = snapshot.persisted
+            return paths
+        
+        return job
     
     def delete(self, key: str) -> bool:
         """
@@ -163,40 +418,32 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
-        self._cache.pop(key, None)
+        # Remove from cache and stop any compaction in flight
+        self._forget(key)
+        task = self._compactions.pop(key, None)
+        if task:
+            task.cancel()
+        if self.writer:
+            self.writer.discard(("session", key))
+            self.writer.flush_key(("session", key))  # Only waits for a write in progress
         
-        # Remove file
-        path = self._get_session_path(key)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
+        return self.store.delete(key)
     
-    def list_sessions(self) -> list[dict[str, Any]]:
+    def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
         """
-        List all sessions.
+        List sessions, most recently updated first.
+        
+        Args:
+            limit: Maximum number of sessions to return (None for all).
+            offset: Number of sessions to skip (for paging).
         
         Returns:
             List of session info dicts.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions(limit=limit, offset=offset)
+    
+    def close(self) -> None:
+        """Flush queued saves and close the session store."""
+        if self.writer:
+            self.writer.flush()
+        self.store.close()
@@ -0,0 +1,176 @@
+"""SQLite session store (WAL mode)."""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.manager import Session
+from nanobot.session.store import SessionStore
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    message_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class _RowState:
+    """What the database already holds for a session."""
+
+    count: int = 0  # Messages stored
+    last: dict[str, Any] | None = None  # Last message stored (identity check)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Session store backed by a single SQLite database in WAL mode.
+
+    Sessions are indexed by key and updated_at, and messages are rows keyed
+    by (session_key, seq), so saves insert only new rows, tail loads are an
+    index range scan, and listing pages through the updated_at index no
+    matter how many sessions exist. WAL lets readers (e.g. `sqlite3` on the
+    command line) run while the gateway writes.
+    """
+
+    def __init__(self, db_path: Path):
+        ensure_dir(db_path.parent)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, key: str, tail_messages: int = 0) -> Session | None:
+        """Load a session, optionally only its newest messages."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at, metadata, message_count FROM sessions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                created_at, metadata, count = row
+                offset = max(0, count - tail_messages) if tail_messages else 0
+                rows = self._conn.execute(
+                    "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq",
+                    (key, offset),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+        messages = [json.loads(data) for (data,) in rows]
+        session = self._make_session(key, messages, created_at, json.loads(metadata))
+        session.offset = offset
+        session.persisted = _RowState(count=count, last=messages[-1] if messages else None)
+        return session
+
+    def load_older(self, session: Session) -> None:
+        """Load the messages a tail-only load left in the database."""
+        if not session.offset:
+            return
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq < ? ORDER BY seq",
+                (session.key, session.offset),
+            ).fetchall()
+        session.messages = [json.loads(data) for (data,) in rows] + session.messages
+        session.offset = 0
+
+    def save(self, session: Session) -> list[Path]:
+        """
+        Save a session in one transaction.
+
+        New messages are inserted as rows; if the history was replaced
+        (e.g. cleared), the session's rows are rewritten. Durability follows
+        SQLite's own syncing of the WAL, so no files are returned to fsync.
+        """
+        state = session.persisted if isinstance(session.persisted, _RowState) else None
+        index = state.count - session.offset - 1 if state else -1
+
+        if state and (
+            (state.count == 0 and session.offset == 0)
+            or (0 <= index < len(session.messages) and session.messages[index] is state.last)
+        ):
+            replace = False
+            start = state.count
+        else:
+            self.load_older(session)
+            replace = True
+            start = 0
+
+        rows = [
+            (session.key, seq, json.dumps(msg))
+            for seq, msg in enumerate(session.messages[start - session.offset:], start)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            if replace:
+                self._conn.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (session_key, seq, data) VALUES (?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "INSERT INTO sessions (key, created_at, updated_at, metadata, message_count) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "updated_at = excluded.updated_at, metadata = excluded.metadata, "
+                "message_count = excluded.message_count",
+                (
+                    session.key,
+                    session.created_at.isoformat(),
+                    session.updated_at.isoformat(),
+                    json.dumps(session.metadata),
+                    session.message_count,
+                ),
+            )
+
+        session.persisted = _RowState(
+            count=session.message_count,
+            last=session.messages[-1] if session.messages else None,
+        )
+        return []
+
+    def delete(self, key: str) -> bool:
+        """Delete a session and its messages."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+            cursor = self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+        """List sessions from the updated_at index."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions "
+                "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.db_path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
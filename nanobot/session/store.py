@@ -0,0 +1,92 @@
+"""Session store interface."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.manager import Session
+
+
+class SessionStore(ABC):
+    """
+    Abstract persistence backend for conversation sessions.
+
+    Stores own how sessions are laid out on disk. Each store keeps its
+    bookkeeping about what is already persisted in `session.persisted`, so
+    a save only writes what changed since the session was loaded or last saved.
+    """
+
+    @abstractmethod
+    def load(self, key: str, tail_messages: int = 0) -> Session | None:
+        """
+        Load a session.
+
+        Args:
+            key: Session key.
+            tail_messages: Load only this many of the newest messages
+                (0 = all); `session.offset` counts the rest.
+
+        Returns:
+            The session, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def load_older(self, session: Session) -> None:
+        """Load the messages a tail-only load left in the store."""
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> list[Path]:
+        """
+        Persist a session (its new messages and metadata).
+
+        Returns:
+            Files written, for callers that fsync them; empty if the store
+            handles durability itself.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """
+        Delete a session.
+
+        Returns:
+            True if deleted, False if not found.
+        """
+        pass
+
+    @abstractmethod
+    def list_sessions(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        List sessions, most recently updated first.
+
+        Args:
+            limit: Maximum number of sessions to return (None for all).
+            offset: Number of sessions to skip (for paging).
+
+        Returns:
+            List of dicts with 'key', 'created_at', 'updated_at' and 'path'.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+        pass
+
+    @staticmethod
+    def _make_session(
+        key: str,
+        messages: list[dict[str, Any]],
+        created_at: str | None,
+        metadata: dict[str, Any] | None,
+    ) -> Session:
+        """Build a Session from stored fields."""
+        return Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+            metadata=metadata or {},
+        )
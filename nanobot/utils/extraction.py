@@ -0,0 +1,207 @@
+"""Readable-content extraction for fetched pages, off the event loop."""
+
+import asyncio
+import atexit
+import html
+import json
+import multiprocessing
+import os
+import re
+import signal
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.queues import SimpleQueue
+
+from loguru import logger
+
+
+class ExtractionTimeoutError(Exception):
+    """A document took longer than the per-document limit to extract."""
+
+
+def strip_tags(text: str) -> str:
+    """Remove HTML tags and decode entities."""
+    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
+    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).strip()
+
+
+def normalize(text: str) -> str:
+    """Normalize whitespace."""
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def to_markdown(html_text: str) -> str:
+    """Convert HTML to markdown."""
+    # Convert links, headings, lists before stripping tags
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{strip_tags(m[2])}]({m[1]})', html_text, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    return normalize(strip_tags(text))
+
+
+def extract_content(body: str, ctype: str, mode: str) -> tuple[str, str]:
+    """
+    Extract readable text from a response body.
+
+    Args:
+        body: Decoded response body.
+        ctype: Response content type.
+        mode: "markdown" or "text".
+
+    Returns:
+        (text, extractor name).
+    """
+    # JSON
+    if "application/json" in ctype:
+        try:
+            return json.dumps(json.loads(body), indent=2), "json"
+        except ValueError:
+            return body, "raw"  # Cut off at the download cap, or not JSON after all
+    # HTML
+    if "text/html" in ctype or body[:256].lower().startswith(("<!doctype", "<html")):
+        from readability import Document
+
+        doc = Document(body)
+        summary = doc.summary()
+        content = to_markdown(summary) if mode == "markdown" else strip_tags(summary)
+        title = doc.title()
+        return (f"# {title}\n\n{content}" if title else content), "readability"
+    return body, "raw"
+
+
+def _report_pid(pids: SimpleQueue) -> None:
+    """Worker initializer: tell the parent this worker's pid, so a stuck one can be killed."""
+    pids.put(os.getpid())
+
+
+class ExtractionPool:
+    """
+    Runs extract_content in a bounded pool of worker processes.
+
+    Readability and the markdown regexes are CPU-bound and can take hundreds
+    of milliseconds on large pages, so they must not run on the event loop.
+    Workers are started on first use. A document exceeding `timeout` raises
+    ExtractionTimeoutError; its worker process is killed and the pool
+    restarted, so a pathological page cannot hold a worker forever.
+
+    If worker processes cannot be started (e.g. a sandbox without
+    multiprocessing support), a thread pool is used instead. A stuck thread
+    cannot be killed: after a timeout it is left to finish in the background
+    and a fresh pool takes new work, but at most `workers` threads are
+    abandoned at once; past that the pool is kept and new work waits.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 15.0, use_processes: bool = True):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._worker_pids: dict[Executor, SimpleQueue] = {}  # Per process pool
+        self._abandoned = 0  # Timed-out threads still running
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def uses_processes(self) -> bool:
+        return isinstance(self._executor, ProcessPoolExecutor)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                try:
+                    # Not fork: the gateway runs threads (I/O writer, HTTP pools)
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    context = multiprocessing.get_context(method)
+                    pids = context.SimpleQueue()
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, mp_context=context, initializer=_report_pid, initargs=(pids,)
+                    )
+                    self._worker_pids[self._executor] = pids
+                except (OSError, NotImplementedError, ValueError) as e:
+                    logger.warning(f"Extraction process pool unavailable ({e}); using threads")
+                    self.use_processes = False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="nanobot-extract")
+        return self._executor
+
+    async def extract(self, body: str, ctype: str, mode: str) -> tuple[str, str]:
+        """
+        Extract readable text in the pool.
+
+        Raises:
+            ExtractionTimeoutError: If the document exceeds the time limit.
+        """
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                job = executor.submit(extract_content, body, ctype, mode)
+                return await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Extraction timed out after {self.timeout:.0f}s ({len(body)} chars)")
+                if isinstance(executor, ProcessPoolExecutor):
+                    self._restart(executor)
+                else:
+                    self._abandon(executor, job)
+                raise ExtractionTimeoutError(
+                    f"content extraction timed out after {self.timeout:.0f}s"
+                ) from None
+            except BrokenProcessPool:
+                # Workers died (killed after another document's timeout, or crashed)
+                self._restart(executor)
+                if attempt:
+                    raise
+            except OSError as e:
+                if not self.uses_processes:
+                    raise
+                logger.warning(f"Extraction worker failed to start ({e}); using threads")
+                self._restart(executor)
+                self.use_processes = False
+        raise RuntimeError("unreachable")
+
+    def _abandon(self, executor: Executor, job: Future) -> None:
+        """Leave a stuck thread to finish, moving new work to a fresh pool while under the cap."""
+        with self._lock:
+            if job.done() or self._abandoned >= self.workers or self._executor is not executor:
+                return
+            self._abandoned += 1
+            self._executor = None
+        job.add_done_callback(self._release)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _job: Future) -> None:
+        with self._lock:
+            self._abandoned -= 1
+
+    def _kill_workers(self, executor: Executor) -> None:
+        """Kill a process pool's workers (by the pids they reported on start)."""
+        pids = self._worker_pids.pop(executor, None)
+        if pids is None:
+            return
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                pass  # Already gone
+        pids.close()
+
+    def _restart(self, executor: Executor) -> None:
+        """Discard an executor (killing its processes) so the next call starts a fresh one."""
+        if self._executor is executor:
+            self._executor = None
+        self._kill_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the workers."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            self._kill_workers(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+"""Shared cache of small text files, invalidated by file metadata."""
+
+import os
+import stat
+from pathlib import Path
+from typing import Any
+
+# (mtime_ns, size, inode) of a regular file; None if missing or not a file
+FileSignature = tuple[int, int, int] | None
+
+
+def file_signature(path: Path) -> FileSignature:
+    """Get the cache signature of a file without reading it."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileCache:
+    """
+    Cache of text file contents keyed by path.
+
+    Entries are revalidated with a single stat() per lookup; a file is only
+    re-read when its mtime, size or inode changes. Prompt files (bootstrap
+    files, memory, skills) are read on every turn but rarely change, so an
+    unchanged workspace costs no file reads.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, tuple[FileSignature, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read_text(self, path: Path) -> str | None:
+        """
+        Read a UTF-8 text file through the cache.
+
+        Args:
+            path: File path.
+
+        Returns:
+            File content, or None if the file does not exist.
+        """
+        return self.read(path)[1]
+
+    def read(self, path: Path) -> tuple[FileSignature, str | None]:
+        """
+        Read a UTF-8 text file through the cache, with the signature it was checked against.
+
+        Callers keeping their own data derived from the content (e.g. parsed
+        skills) can key it by the signature instead of stat()ing again.
+
+        Returns:
+            (signature, content); both None if the file does not exist.
+        """
+        signature = file_signature(path)
+        if signature is None:
+            self._entries.pop(path, None)
+            return None, None
+
+        entry = self._entries.get(path)
+        if entry and entry[0] == signature:
+            self.hits += 1
+            return signature, entry[1]
+
+        self.misses += 1
+        content = path.read_text(encoding="utf-8")
+        self._entries[path] = (signature, content)
+        return signature, content
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Drop one entry, or all entries if no path is given."""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and the current hit rate."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Process-wide cache shared by every ContextBuilder, MemoryStore and SkillsLoader
+shared_file_cache = FileCache()
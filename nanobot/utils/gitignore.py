@@ -0,0 +1,116 @@
+"""Minimal .gitignore matching for directory walks."""
+
+import re
+from pathlib import Path
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Translate a gitignore-style glob to a regex matching a relative path.
+
+    `*` and `?` do not cross "/", `**` does, and a leading `**/` also
+    matches no directories at all.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and (end := pattern.find("]", i + 2)) > 0:
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def compile_glob(pattern: str) -> re.Pattern[str]:
+    """
+    Compile a file glob: patterns with a "/" match the path relative to the
+    search root, others match the file name.
+    """
+    pattern = pattern.strip().lstrip("/")
+    if "/" not in pattern:
+        pattern = "**/" + pattern
+    return re.compile(glob_to_regex(pattern))
+
+
+class GitIgnore:
+    """
+    An immutable, ordered set of .gitignore rules.
+
+    Rules from deeper .gitignore files are appended, so they override their
+    parents' (the last matching rule wins, as in git). Paths are "/"
+    separated and relative to the walk's top directory.
+    """
+
+    def __init__(self, rules: tuple[tuple[str, re.Pattern[str], bool, bool], ...] = ()):
+        # (base directory, pattern, negated, directories only)
+        self.rules = rules
+
+    def add(self, base: str, text: str) -> "GitIgnore":
+        """Return a copy with the rules of a .gitignore file in directory `base`."""
+        rules = list(self.rules)
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]  # Escaped leading "#" or "!"
+            dir_only = line.endswith("/")
+            if dir_only:
+                line = line[:-1]
+            # A "/" anywhere but the end anchors the pattern to `base`
+            if "/" in line:
+                line = line.lstrip("/")
+            else:
+                line = "**/" + line
+            if not line or line == "**/":
+                continue
+            rules.append((base, re.compile(glob_to_regex(line)), negate, dir_only))
+        return GitIgnore(tuple(rules))
+
+    def add_file(self, base: str, path: Path) -> "GitIgnore":
+        """Add the rules of a .gitignore file if it exists."""
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return self
+        return self.add(base, text)
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        """Whether a path (relative to the top directory) is ignored."""
+        result = False
+        for base, pattern, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel.startswith(base + "/"):
+                    continue
+                sub = rel[len(base) + 1:]
+            else:
+                sub = rel
+            if pattern.fullmatch(sub):
+                result = not negate
+        return result
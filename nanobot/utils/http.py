@@ -0,0 +1,137 @@
+"""Application-scoped pooled HTTP clients."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+from loguru import logger
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that frees a host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Any):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class _HostLimitTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per host on top of a pooled transport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int):
+        self._transport = transport
+        self._per_host = per_host
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._slots.setdefault(request.url.host, asyncio.Semaphore(self._per_host))
+        await slot.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, slot.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClients:
+    """
+    Registry of pooled httpx.AsyncClient instances shared across the app.
+
+    Each named client keeps its own keep-alive pool, created on first use,
+    so repeated calls to the same host skip DNS, TCP and TLS setup. Create
+    one registry at startup and close it with aclose() at shutdown.
+    """
+
+    def __init__(
+        self,
+        http2: bool = False,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        max_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        proxy: str | None = None,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_per_host = max_per_host
+        self.proxy = proxy or None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str = "default", **kwargs: Any) -> httpx.AsyncClient:
+        """
+        Get (or create) a named pooled client.
+
+        Args:
+            name: Client name; each name has its own pool and settings.
+            **kwargs: httpx.AsyncClient options (e.g. timeout, follow_redirects),
+                applied when the client is first created.
+
+        Returns:
+            The shared client. Callers must not close it.
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            options: dict[str, Any] = {"http2": self.http2, "limits": self.limits}
+            if self.proxy:
+                options["proxy"] = self.proxy
+                kwargs.setdefault("trust_env", False)  # Explicit proxy wins over *_PROXY env vars
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(**options)
+            if self.max_per_host:
+                transport = _HostLimitTransport(transport, self.max_per_host)
+            client = httpx.AsyncClient(transport=transport, **kwargs)
+            self._clients[name] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every client and its connection pool."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+
+
+@asynccontextmanager
+async def http_client(
+    clients: HttpClients | None, name: str = "default", **kwargs: Any
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Use a pooled client from a registry, or a one-off client without one.
+
+    Lets components work both inside the gateway (shared pools) and
+    standalone, where a fresh client is opened and closed per call.
+    """
+    if clients is not None:
+        yield clients.get(name, **kwargs)
+        return
+    async with httpx.AsyncClient(**kwargs) as client:
+        yield client
@@ -0,0 +1,86 @@
+"""Line-offset index for paging through large text files."""
+
+import mmap
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from nanobot.utils.file_cache import FileSignature, file_signature
+
+# Every STRIDE-th line start is recorded; other lines are found by scanning
+# at most STRIDE - 1 newlines from the nearest checkpoint
+STRIDE = 256
+
+
+class LineIndex:
+    """Sparse index of line start offsets in one version of a file."""
+
+    def __init__(self, size: int, lines: int, checkpoints: array):
+        self.size = size
+        self.lines = lines
+        self._checkpoints = checkpoints
+
+    @classmethod
+    def build(cls, mm: mmap.mmap) -> "LineIndex":
+        """Index a mapped file in one pass over its newlines."""
+        checkpoints = array("Q", [0])
+        find = mm.find
+        pos = 0
+        lines = 0
+        while True:
+            nl = find(b"\n", pos)
+            if nl < 0:
+                break
+            lines += 1
+            pos = nl + 1
+            if lines % STRIDE == 0:
+                checkpoints.append(pos)
+        size = len(mm)
+        if pos < size:
+            lines += 1  # Last line has no trailing newline
+        return cls(size, lines, checkpoints)
+
+    def line_start(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where a (0-based) line starts; the file size past the end."""
+        if line >= self.lines:
+            return self.size
+        pos = self._checkpoints[line // STRIDE]
+        for _ in range(line % STRIDE):
+            pos = mm.find(b"\n", pos) + 1
+        return pos
+
+
+class LineIndexCache:
+    """
+    Line indexes keyed by path, valid while the file signature is unchanged.
+
+    Building an index reads the whole file once; after that, any page of
+    the file is a checkpoint lookup plus a short scan.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Path, tuple[FileSignature, LineIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, mm: mmap.mmap) -> LineIndex:
+        """Get the index for a mapped file, building it if the file changed."""
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == signature and entry[1].size == len(mm):
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        index = LineIndex.build(mm)
+        with self._lock:
+            self._entries[path] = (signature, index)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+
+# Process-wide cache shared by every ReadFileTool
+shared_line_index_cache = LineIndexCache()
@@ -0,0 +1,57 @@
+"""Token counting for context-window budgeting."""
+
+from typing import Any
+
+# Per-message framing overhead (role, separators) added by chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Rough cost of one attached image
+IMAGE_TOKENS = 1000
+
+_encoding: Any = None
+_encoding_loaded = False
+
+
+def _get_encoding() -> Any:
+    """Get the cl100k tokenizer bundled with LiteLLM, or None if unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            # LiteLLM ships the tiktoken files, so this works offline
+            from litellm.litellm_core_utils.default_encoding import encoding
+            _encoding = encoding
+        except Exception:
+            _encoding = None
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a string.
+
+    Uses the cl100k tokenizer when available and falls back to a
+    4-characters-per-token estimate otherwise. Providers tokenize
+    differently, so callers should leave a safety margin either way.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(message: dict[str, Any]) -> int:
+    """Count the tokens of a chat message, including framing overhead."""
+    content = message.get("content")
+    if isinstance(content, list):
+        tokens = 0
+        for part in content:
+            if part.get("type") == "text":
+                tokens += count_tokens(part.get("text", ""))
+            else:
+                tokens += IMAGE_TOKENS
+    else:
+        tokens = count_tokens(content or "")
+    return tokens + MESSAGE_OVERHEAD_TOKENS
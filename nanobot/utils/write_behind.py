@@ -0,0 +1,206 @@
+"""Write-behind persistence on a dedicated I/O thread."""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+from loguru import logger
+
+# A write job; returns the files it wrote (for fsync), or None
+WriteJob = Callable[[], Iterable[Path] | None]
+
+FSYNC_POLICIES = ("never", "batch", "always")
+
+
+def fsync_path(path: Path) -> None:
+    """Flush a file's data to disk (no-op if it no longer exists)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteBehindQueue:
+    """
+    Runs persistence jobs on a background thread, off the event loop.
+
+    Jobs are keyed: submitting a job for a key that is still queued replaces
+    the queued job, so a burst of saves of the same session (or cron store)
+    costs one write. Jobs for different keys run in submission order, one at
+    a time.
+
+    fsync policies:
+        never: leave flushing to the OS.
+        batch: fsync the files written once the queue drains.
+        always: fsync each job's files as soon as it finishes.
+
+    Pending jobs are flushed by close(), which also runs at interpreter exit.
+    """
+
+    def __init__(self, fsync: str = "batch", name: str = "nanobot-io"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r} (expected one of {FSYNC_POLICIES})")
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._pending: OrderedDict[Hashable, WriteJob] = OrderedDict()
+        self._active: Hashable | None = None
+        self._inline: set[Hashable] = set()  # Keys being written by flush_key callers
+        self._unsynced: set[Path] = set()
+        self._closed = False
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, key: Hashable, job: WriteJob) -> None:
+        """
+        Queue a write job, replacing any job still queued under the same key.
+
+        After close(), the job runs synchronously in the caller's thread.
+        """
+        with self._cond:
+            if not self._closed:
+                if key in self._pending:
+                    self.coalesced += 1
+                self._pending[key] = job
+                self._cond.notify_all()
+                return
+        self._execute(key, job)
+
+    def discard(self, key: Hashable) -> bool:
+        """Drop the job queued under a key; returns True if there was one."""
+        with self._cond:
+            return self._pending.pop(key, None) is not None
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check whether a job for a key is queued or running."""
+        with self._cond:
+            return key in self._pending or self._active == key or key in self._inline
+
+    def wait(self, key: Hashable, timeout: float | None = None) -> bool:
+        """
+        Block until no job for a key is queued or running.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: key not in self._pending and self._active != key and key not in self._inline,
+                timeout,
+            )
+
+    def flush_key(self, key: Hashable, timeout: float | None = None) -> bool:
+        """
+        Write the job queued under a key now, in the caller's thread.
+
+        Unlike wait(), this never sits behind jobs queued for other keys; it
+        only blocks while a job for the same key is already being written.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._active != key and key not in self._inline, timeout
+            ):
+                return False
+            job = self._pending.pop(key, None)
+            if job is None:
+                return True
+            self._inline.add(key)
+        try:
+            self._execute(key, job)
+        finally:
+            with self._cond:
+                self._inline.discard(key)
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued job has been written (and synced, per policy).
+
+        Returns:
+            False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._active is None and not self._inline, timeout
+            )
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush pending jobs and stop the I/O thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._next_key() is not None or (self._closed and not self._pending)
+                )
+                key = self._next_key()
+                if key is None:
+                    return  # Closed and drained
+                job = self._pending.pop(key)
+                self._active = key
+
+            self._execute(key, job)
+
+            with self._cond:
+                drained = not self._pending
+            if drained and self._unsynced:
+                self._sync(self._unsynced)
+                self._unsynced.clear()
+
+            with self._cond:
+                self._active = None
+                self._cond.notify_all()
+
+    def _next_key(self) -> Hashable | None:
+        """The oldest queued key that no flush_key caller is writing."""
+        return next((key for key in self._pending if key not in self._inline), None)
+
+    def _execute(self, key: Hashable, job: WriteJob) -> None:
+        """Run one job and apply the fsync policy to the files it wrote."""
+        start = time.perf_counter()
+        try:
+            paths = list(job() or ())
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Write-behind job {key} failed: {e}")
+            return
+        self.writes += 1
+
+        if self.fsync == "always" or (self.fsync == "batch" and threading.current_thread() is not self._thread):
+            self._sync(paths)
+        elif self.fsync == "batch":
+            self._unsynced.update(paths)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > 1000:
+            logger.warning(f"Slow write-behind job {key}: {elapsed_ms:.0f} ms")
+
+    @staticmethod
+    def _sync(paths: Iterable[Path]) -> None:
+        for path in paths:
+            try:
+                fsync_path(path)
+            except OSError as e:
+                logger.warning(f"fsync failed for {path}: {e}")
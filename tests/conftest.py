@@ -0,0 +1,4 @@
+import os
+
+# Use LiteLLM's bundled model cost map instead of fetching it over the network on import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
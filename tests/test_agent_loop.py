@@ -0,0 +1,220 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class SlowEchoProvider(LLMProvider):
+    """Replies with the last user message after a delay, tracking overlap."""
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        text = messages[-1]["content"].split("\n\n[Runtime Context]")[0]
+        return LLMResponse(content=f"echo: {text}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class MessageToolProvider(SlowEchoProvider):
+    """First call asks the message tool to reply; second call finishes."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        await asyncio.sleep(self.delay)
+        if messages[-1]["role"] == "tool":
+            return LLMResponse(content="done")
+        return LLMResponse(
+            content=None,
+            tool_calls=[ToolCallRequest(id="t1", name="message", arguments={"content": "hi"})],
+        )
+
+
+@pytest.fixture
+def make_loop(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def _make(provider: LLMProvider, **kwargs: Any) -> tuple[AgentLoop, MessageBus]:
+        bus = MessageBus()
+        loop = AgentLoop(bus=bus, provider=provider, workspace=tmp_path / "ws", **kwargs)
+        return loop, bus
+
+    return _make
+
+
+async def _collect(bus: MessageBus, n: int) -> list:
+    return [await asyncio.wait_for(bus.consume_outbound(), timeout=5) for _ in range(n)]
+
+
+async def test_sessions_run_concurrently_and_keep_order(make_loop) -> None:
+    provider = SlowEchoProvider()
+    loop, bus = make_loop(provider, max_concurrency=4)
+    runner = asyncio.create_task(loop.run())
+    try:
+        for chat in ("a", "b", "c"):
+            for i in range(2):
+                await bus.publish_inbound(
+                    InboundMessage(channel="test", sender_id="u", chat_id=chat, content=f"{chat}{i}")
+                )
+        out = await _collect(bus, 6)
+    finally:
+        loop.stop()
+        await runner
+
+    assert provider.peak == 3
+    for chat in ("a", "b", "c"):
+        replies = [m.content for m in out if m.chat_id == chat]
+        assert replies == [f"echo: {chat}0", f"echo: {chat}1"]
+
+
+async def test_max_concurrency_caps_parallel_turns(make_loop) -> None:
+    provider = SlowEchoProvider()
+    loop, bus = make_loop(provider, max_concurrency=1)
+    runner = asyncio.create_task(loop.run())
+    try:
+        for chat in ("a", "b", "c"):
+            await bus.publish_inbound(
+                InboundMessage(channel="test", sender_id="u", chat_id=chat, content=chat)
+            )
+        await _collect(bus, 3)
+    finally:
+        loop.stop()
+        await runner
+
+    assert provider.peak == 1
+
+
+async def test_tool_context_is_per_turn(make_loop) -> None:
+    loop, bus = make_loop(MessageToolProvider(), max_concurrency=4)
+    runner = asyncio.create_task(loop.run())
+    try:
+        for chat in ("a", "b"):
+            await bus.publish_inbound(
+                InboundMessage(channel="test", sender_id="u", chat_id=chat, content="x")
+            )
+        out = await _collect(bus, 4)
+    finally:
+        loop.stop()
+        await runner
+
+    tool_sends = sorted(m.chat_id for m in out if m.content == "hi")
+    assert tool_sends == ["a", "b"]
+
+
+class StreamingProvider(SlowEchoProvider):
+    async def chat_stream(self, messages: list[dict[str, Any]], on_delta=None, **kwargs: Any) -> LLMResponse:
+        for word in ("Hello", " there"):
+            await on_delta(word)
+        return LLMResponse(content="Hello there")
+
+
+async def test_streaming_publishes_partials_then_final(make_loop) -> None:
+    loop, bus = make_loop(StreamingProvider(), streaming=True)
+    runner = asyncio.create_task(loop.run())
+    try:
+        await bus.publish_inbound(InboundMessage(channel="test", sender_id="u", chat_id="a", content="x"))
+        partial, final = await _collect(bus, 2)
+    finally:
+        loop.stop()
+        await runner
+
+    # Second delta falls inside the throttle window; the final reply carries the full text
+    assert partial.partial and partial.content == "Hello"
+    assert not final.partial and final.content == "Hello there"
+    assert partial.stream_id and partial.stream_id == final.stream_id
+
+
+class FailingStreamProvider(SlowEchoProvider):
+    async def chat_stream(self, messages: list[dict[str, Any]], on_delta=None, **kwargs: Any) -> LLMResponse:
+        await on_delta("Hello")
+        raise RuntimeError("upstream closed")
+
+
+async def test_streaming_error_finalizes_the_partial_reply(make_loop) -> None:
+    loop, bus = make_loop(FailingStreamProvider(), streaming=True)
+    runner = asyncio.create_task(loop.run())
+    try:
+        await bus.publish_inbound(InboundMessage(channel="test", sender_id="u", chat_id="a", content="x"))
+        partial, final = await _collect(bus, 2)
+    finally:
+        loop.stop()
+        await runner
+
+    assert partial.partial and partial.content == "Hello"
+    assert not final.partial and "upstream closed" in final.content
+    assert final.stream_id == partial.stream_id
+
+
+async def test_process_direct_streams_to_callback_only(make_loop) -> None:
+    loop, bus = make_loop(StreamingProvider(), streaming=True)
+    deltas: list[str] = []
+
+    async def on_delta(delta: str) -> None:
+        deltas.append(delta)
+
+    assert await loop.process_direct("x", on_delta=on_delta) == "Hello there"
+    assert deltas == ["Hello", " there"]
+    assert bus.outbound_size == 0
+
+
+async def test_history_is_budgeted_by_context_window(make_loop) -> None:
+    loop, _ = make_loop(SlowEchoProvider(delay=0), context_window=20_000, max_history_tokens=0)
+    session = loop.sessions.get_or_create("cli:direct")
+    session.add_message("user", "log " * 50_000)
+    session.add_message("assistant", "that's a big log")
+    session.add_message("user", "short question")
+    session.add_message("assistant", "short answer")
+
+    history = loop._get_history(session, "next")
+    assert [m["content"] for m in history] == ["short question", "short answer"]
+
+
+async def test_aclose_cancels_session_workers(make_loop) -> None:
+    provider = SlowEchoProvider(delay=30)
+    loop, bus = make_loop(provider, max_concurrency=4)
+    runner = asyncio.create_task(loop.run())
+    for chat in ("a", "b"):
+        await bus.publish_inbound(InboundMessage(channel="test", sender_id="u", chat_id=chat, content="x"))
+    while provider.active < 2:
+        await asyncio.sleep(0.01)
+    workers = list(loop._workers.values())
+
+    await asyncio.wait_for(loop.aclose(), timeout=5)
+    await runner
+
+    assert all(task.cancelled() for task in workers)
+    assert not loop._workers and not loop._session_queues
+    assert provider.active == 0
+
+
+async def test_aclose_logs_cache_stats(make_loop) -> None:
+    from loguru import logger
+
+    lines: list[str] = []
+    sink = logger.add(lines.append, format="{message}")
+    loop, _ = make_loop(SlowEchoProvider())
+    loop.context.build_system_prompt()
+    loop.context.build_system_prompt()
+    try:
+        await loop.aclose()
+    finally:
+        logger.remove(sink)
+
+    stats = [line for line in lines if line.startswith("Cache stats:")]
+    assert len(stats) == 1 and "prompt bootstrap 50% of 2" in stats[0]
+    assert "search 0% of 0 (0 coalesced)" in stats[0]
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.utils.file_cache import FileCache
+
+
+def _touch_later(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_workspace_reads_no_files(tmp_path) -> None:
+    (tmp_path / "SOUL.md").write_text("be kind", encoding="utf-8")
+    (tmp_path / "skills" / "demo").mkdir(parents=True)
+    (tmp_path / "skills" / "demo" / "SKILL.md").write_text(
+        "---\ndescription: demo skill\n---\nbody", encoding="utf-8"
+    )
+    ctx = ContextBuilder(tmp_path, file_cache=FileCache())
+
+    first = ctx.build_system_prompt()
+    misses = ctx.files.misses
+    second = ctx.build_system_prompt()
+
+    assert "be kind" in second and "demo skill" in second
+    assert first.split("## Runtime")[1] == second.split("## Runtime")[1]
+    assert ctx.files.misses == misses
+    stats = ctx.cache_stats()
+    assert stats["sections"]["bootstrap"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert stats["files"]["hits"] > 0
+
+
+def test_changed_file_invalidates_section(tmp_path) -> None:
+    soul = tmp_path / "SOUL.md"
+    soul.write_text("v1", encoding="utf-8")
+    ctx = ContextBuilder(tmp_path, file_cache=FileCache())
+    assert "v1" in ctx.build_system_prompt()
+
+    _touch_later(soul, "v2")
+    memory = ctx.memory.memory_file
+    _touch_later(memory, "remember this")
+
+    prompt = ctx.build_system_prompt()
+    assert "v2" in prompt and "v1" not in prompt
+    assert "remember this" in prompt
+    assert ctx.cache_stats()["sections"]["bootstrap"]["misses"] == 2
+
+
+def test_system_prompt_is_stable_across_chats(tmp_path) -> None:
+    ctx = ContextBuilder(tmp_path, file_cache=FileCache())
+    a = ctx.build_messages([], "hi", channel="telegram", chat_id="1")
+    b = ctx.build_messages([], "hi", channel="discord", chat_id="2")
+
+    assert a[0] == b[0]
+    assert a[-1]["content"].startswith("hi\n\n[Runtime Context]")
+    assert "Chat ID: 1" in a[-1]["content"] and "Chat ID: 2" in b[-1]["content"]
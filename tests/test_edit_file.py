@@ -0,0 +1,67 @@
+import os
+
+from nanobot.agent.tools.filesystem import EditFileTool
+
+
+async def test_batch_edits_apply_together_with_diff_summary(tmp_path) -> None:
+    path = tmp_path / "app.py"
+    path.write_text("def load():\n    return read(a)\n\n\ndef save():\n    write(a)\n", encoding="utf-8")
+    os.chmod(path, 0o640)
+    tool = EditFileTool()
+
+    result = await tool.execute(path=str(path), edits=[
+        {"old_text": "write(a)", "new_text": "write(b)\n    flush()"},
+        {"old_text": "read(a)", "new_text": "read(b)"},
+    ])
+
+    assert path.read_text(encoding="utf-8") == (
+        "def load():\n    return read(b)\n\n\ndef save():\n    write(b)\n    flush()\n"
+    )
+    assert result.splitlines() == [
+        f"Successfully edited {path}",
+        "2 edits, +3 -2 lines",
+        "@@ -2 +2 @@",
+        "-    return read(a)",
+        "+    return read(b)",
+        "@@ -6 +6,2 @@",
+        "-    write(a)",
+        "+    write(b)",
+        "+    flush()",
+    ]
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert list(tmp_path.iterdir()) == [path]
+
+
+async def test_failed_batch_reports_every_error_and_leaves_file_alone(tmp_path) -> None:
+    path = tmp_path / "notes.md"
+    original = "a = 1\na = 1\nb = 2\n"
+    path.write_text(original, encoding="utf-8")
+    tool = EditFileTool()
+
+    result = await tool.execute(path=str(path), edits=[
+        {"old_text": "b = 2", "new_text": "b = 3"},
+        {"old_text": "a = 1", "new_text": "a = 0"},
+        {"old_text": "c = 3", "new_text": "c = 4"},
+        {"old_text": "= 2\n", "new_text": "= 5\n"},
+    ])
+
+    assert result.splitlines() == [
+        f"Error: 3 of 4 edits failed; {path} was not changed.",
+        "- edit 2: Warning: old_text appears 2 times. Please provide more context to make it unique.",
+        "- edit 3: Error: old_text not found in file. Make sure it matches exactly.",
+        "- edit 4: Error: old_text overlaps edit 1",
+    ]
+    assert path.read_text(encoding="utf-8") == original
+
+
+async def test_single_edit_keeps_crlf_line_endings(tmp_path) -> None:
+    path = tmp_path / "win.txt"
+    path.write_bytes(b"one\r\ntwo\r\n")
+    tool = EditFileTool()
+
+    result = await tool.execute(path=str(path), old_text="one\ntwo", new_text="1\n2")
+    assert result.startswith(f"Successfully edited {path}")
+    assert path.read_bytes() == b"1\r\n2\r\n"
+    assert await tool.execute(path=str(path), old_text="three", new_text="3") == (
+        "Error: old_text not found in file. Make sure it matches exactly."
+    )
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.shell_output import OutputCapture
+from nanobot.agent.tools.shell_session import ShellPool
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="persistent shells need POSIX")
+
+
+async def test_shell_state_persists_per_session(tmp_path) -> None:
+    (tmp_path / "sub").mkdir()
+    pool = ShellPool()
+    tool = ExecTool(working_dir=str(tmp_path), shells=pool)
+
+    tool.set_context("cli:a")
+    first = [
+        await tool.execute("cd sub && export GREETING=hi"),
+        await tool.execute("pwd; echo $GREETING"),
+        await tool.execute("echo oops >&2; exit_code() { return 3; }; exit_code"),
+    ]
+    tool.set_context("cli:b")
+    other = await tool.execute("pwd; echo ${GREETING:-unset}")
+    await pool.aclose()
+
+    assert first[0] == "(no output)"
+    assert first[1] == f"{tmp_path / 'sub'}\nhi\n"
+    assert "STDERR:\noops" in first[2] and "Exit code: 3" in first[2]
+    assert other == f"{tmp_path}\nunset\n"
+
+
+async def test_working_dir_applies_to_one_command_only(tmp_path) -> None:
+    (tmp_path / "sub").mkdir()
+    pool = ShellPool()
+    tool = ExecTool(working_dir=str(tmp_path), shells=pool, session="cli:a")
+
+    inside = await tool.execute("pwd", working_dir=str(tmp_path / "sub"))
+    after = await tool.execute("pwd")
+    await pool.aclose()
+
+    assert inside == f"{tmp_path / 'sub'}\n"
+    assert after == f"{tmp_path}\n"
+
+
+async def test_timeout_kills_shell_and_its_children(tmp_path) -> None:
+    pool = ShellPool()
+    tool = ExecTool(working_dir=str(tmp_path), timeout=1, shells=pool, session="cli:a")
+    marker = tmp_path / "late"
+
+    await tool.execute("cd /")
+    start = time.monotonic()
+    timed_out = await tool.execute(f"(sleep 2; touch {marker}) & sleep 30")
+    assert time.monotonic() - start < 5
+    await asyncio.sleep(2.5)
+    after = await tool.execute("pwd")
+    await pool.aclose()
+
+    assert "timed out" in timed_out
+    assert not marker.exists()  # Background child was killed with the shell
+    assert after == f"{tmp_path}\n"  # Fresh shell, back in the working directory
+
+
+async def _run_in(pool: ShellPool, key: str, command: str, cwd) -> tuple[int | None, str]:
+    stdout, stderr = OutputCapture("stdout"), OutputCapture("stderr")
+    status = await pool.run(key, command, str(cwd), 5, stdout, stderr)
+    return status, stdout.text()
+
+
+async def test_pool_evicts_least_recently_used_idle_shell(tmp_path) -> None:
+    pool = ShellPool(max_shells=2)
+
+    await _run_in(pool, "a", "X=1", tmp_path)
+    await _run_in(pool, "b", "X=2", tmp_path)
+    await _run_in(pool, "a", "true", tmp_path)
+    await _run_in(pool, "c", "X=3", tmp_path)  # Evicts "b"
+    results = [(await _run_in(pool, key, 'echo "${X:-none}"', tmp_path))[1] for key in ("c", "a", "b")]
+    await pool.aclose()
+
+    assert results == ["3\n", "1\n", "none\n"]
+
+
+async def test_starting_shell_is_not_evicted(tmp_path) -> None:
+    pool = ShellPool(max_shells=1)
+
+    first, second = await asyncio.gather(
+        _run_in(pool, "a", "echo a", tmp_path), _run_in(pool, "b", "echo b", tmp_path)
+    )
+    shells = dict(pool._shells)
+    await pool.aclose()
+
+    assert first == (0, "a\n")
+    assert second == (None, "")  # No free shell; exec falls back to a one-off process
+    assert list(shells) == ["a"]
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+async def test_large_output_keeps_head_and_tail_and_spills(tmp_path, persistent) -> None:
+    pool = ShellPool() if persistent else None
+    tool = ExecTool(working_dir=str(tmp_path), shells=pool, session="cli:a", spill_dir=tmp_path / "out")
+
+    result = await tool.execute("seq 1 200000; echo done >&2")
+    if pool:
+        await pool.aclose()
+
+    lines = result.splitlines()
+    assert lines[:3] == ["1", "2", "3"]
+    assert "200000" in lines and lines[-2:] == ["STDERR:", "done"]
+    assert len(result) < 10000
+    spilled = list((tmp_path / "out").iterdir())
+    assert len(spilled) == 1 and str(spilled[0]) in result
+    assert spilled[0].read_text().split() == [str(i) for i in range(1, 200001)]
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+async def test_output_limit_kills_command(tmp_path, persistent) -> None:
+    pool = ShellPool() if persistent else None
+    tool = ExecTool(working_dir=str(tmp_path), timeout=30, shells=pool, session="cli:a", max_output_bytes=1_000_000)
+
+    start = time.monotonic()
+    result = await tool.execute("yes")
+    elapsed = time.monotonic() - start
+    if pool:
+        await pool.aclose()
+
+    assert result.startswith("y\ny\n")
+    assert "Command killed after writing more than 1000000 bytes" in result
+    assert elapsed < 10
+
+
+async def test_spill_file_is_written_in_batches_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    import threading
+
+    threads: list[threading.Thread] = []
+    write = OutputCapture._write_spill
+
+    def recording(self, data: bytes) -> None:
+        threads.append(threading.current_thread())
+        write(self, data)
+
+    monkeypatch.setattr(OutputCapture, "_write_spill", recording)
+    capture = OutputCapture("stdout", spill_dir=tmp_path)
+    for _ in range(40):
+        capture.feed(b"x" * 65536)
+        await capture.spill()
+    await capture.close()
+
+    assert len(threads) == 3  # Two full 1 MB batches and the rest
+    assert threading.main_thread() not in threads
+    assert capture.spill_path.stat().st_size == 40 * 65536
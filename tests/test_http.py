@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+
+from nanobot.utils.http import HttpClients, _HostLimitTransport, http_client
+
+
+async def test_registry_reuses_clients_until_closed() -> None:
+    clients = HttpClients(max_per_host=0)
+    first = clients.get("web", timeout=5.0)
+    assert clients.get("web") is first
+    assert clients.get("other") is not first
+    await clients.aclose()
+    assert first.is_closed
+    assert clients.get("web") is not first
+    await clients.aclose()
+
+
+async def test_one_off_client_without_registry_is_closed() -> None:
+    async with http_client(None, timeout=5.0) as client:
+        assert not client.is_closed
+    assert client.is_closed
+
+
+async def test_requests_are_capped_per_host() -> None:
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+
+        async def body():
+            yield b"ok"
+
+        return httpx.Response(200, content=body())  # Streamed, like a real transport
+
+    transport = _HostLimitTransport(httpx.MockTransport(handler), per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        urls = [f"http://{host}/{i}" for host in ("a.test", "b.test") for i in range(6)]
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+
+    assert all(r.text == "ok" for r in responses)
+    assert peak == {"a.test": 2, "b.test": 2}
@@ -0,0 +1,60 @@
+import pytest
+
+from nanobot.agent.tools.filesystem import ListDirTool
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text("x" * 2048)
+    (root / "src" / "main.py").write_text("print()")
+    (root / "docs").mkdir()
+    (root / "docs" / "guide.md").write_text("# Guide")
+    (root / "README.md").write_text("hello")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref")
+    return root
+
+
+async def test_single_level_listing_is_unchanged(tree) -> None:
+    tool = ListDirTool()
+
+    assert (await tool.execute(path=str(tree))).splitlines() == ["📁 .git", "📄 README.md", "📁 docs", "📁 src"]
+    assert (await tool.execute(path=str(tree / "docs" / "guide.md"))).startswith("Error: Not a directory")
+
+
+async def test_recursive_tree_with_sizes_and_pattern(tree) -> None:
+    tool = ListDirTool()
+
+    assert (await tool.execute(path=str(tree), depth=3, include_sizes=True)).splitlines() == [
+        "📁 .git (1 entry)",
+        "📄 README.md (5 B)",
+        "📁 docs",
+        "  📄 guide.md (7 B)",
+        "📁 src",
+        "  📄 main.py (7 B)",
+        "  📁 pkg",
+        "    📄 core.py (2.0 KB)",
+    ]
+    assert (await tool.execute(path=str(tree), depth=3, pattern="*.py")).splitlines() == [
+        "📁 src", "  📄 main.py", "  📁 pkg", "    📄 core.py",
+    ]
+    assert await tool.execute(path=str(tree), pattern="*.rs") == f"No files match *.rs in {tree}"
+
+
+async def test_large_directories_are_summarized(tmp_path) -> None:
+    tool = ListDirTool()
+    big = tmp_path / "big"
+    big.mkdir()
+    for i in range(120):
+        (big / f"f{i:03}.log").write_text("x" * 100)
+    (big / "sub").mkdir()
+
+    lines = (await tool.execute(path=str(tmp_path), depth=2, include_sizes=True)).splitlines()
+    assert lines[0] == "📁 big" and lines[1] == "  📄 f000.log (100 B)"
+    assert len(lines) == 2 + ListDirTool.DIR_ENTRIES
+    assert lines[-1] == "  ... 71 more (70 files, 1 dir, 6.8 KB)"
+
+    capped = (await tool.execute(path=str(big), max_entries=10)).splitlines()
+    assert len(capped) == 11 and capped[-1] == "... 111 more (110 files, 1 dir)"
@@ -0,0 +1,146 @@
+from types import SimpleNamespace
+
+from nanobot.providers import litellm_provider
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=usage
+    )
+
+
+def _tool_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+async def test_chat_stream_accumulates_content_and_tool_calls(monkeypatch) -> None:
+    chunks = [
+        _chunk(content="Let me "),
+        _chunk(content="check."),
+        _chunk(tool_calls=[_tool_delta(0, id="call_1", name="web_search", arguments='{"qu')]),
+        _chunk(tool_calls=[_tool_delta(0, arguments='ery": "cats"}')]),
+        _chunk(finish_reason="tool_calls"),
+        SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        ),
+    ]
+
+    async def fake_acompletion(**kwargs):
+        assert kwargs["stream"] is True
+
+        async def gen():
+            for c in chunks:
+                yield c
+
+        return gen()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    deltas: list[str] = []
+
+    async def on_delta(delta: str) -> None:
+        deltas.append(delta)
+
+    provider = LiteLLMProvider(default_model="gpt-4o")
+    response = await provider.chat_stream(
+        messages=[{"role": "user", "content": "hi"}], on_delta=on_delta
+    )
+
+    assert deltas == ["Let me ", "check."]
+    assert response.content == "Let me check."
+    assert response.finish_reason == "tool_calls"
+    assert [(tc.id, tc.name, tc.arguments) for tc in response.tool_calls] == [
+        ("call_1", "web_search", {"query": "cats"})
+    ]
+    assert response.usage["total_tokens"] == 15
+
+
+async def test_chat_stream_logs_usage_with_cache_tokens(monkeypatch) -> None:
+    from loguru import logger
+
+    usage = SimpleNamespace(
+        prompt_tokens=1200, completion_tokens=5, total_tokens=1205,
+        cache_read_input_tokens=1000, cache_creation_input_tokens=150,
+    )
+
+    async def fake_acompletion(**kwargs):
+        async def gen():
+            yield _chunk(content="hi", finish_reason="stop")
+            yield SimpleNamespace(choices=[], usage=usage)
+
+        return gen()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    lines: list[str] = []
+    sink = logger.add(lines.append, format="{message}")
+    try:
+        await LiteLLMProvider(default_model="gpt-4o").chat_stream(messages=[{"role": "user", "content": "hi"}])
+    finally:
+        logger.remove(sink)
+
+    logged = "".join(lines)
+    assert "  - Total: 1205" in logged
+    assert "  - Cache: 1000 read, 150 written" in logged
+
+
+def _messages() -> list[dict]:
+    return [
+        {"role": "system", "content": "stable prompt"},
+        {"role": "user", "content": "earlier"},
+        {"role": "assistant", "content": "earlier reply"},
+        {"role": "user", "content": "now\n\n[Runtime Context]\nCurrent Time: t"},
+        {"role": "assistant", "content": "", "tool_calls": []},
+        {"role": "tool", "tool_call_id": "c1", "name": "read_file", "content": "data"},
+    ]
+
+
+def _cached(message: dict) -> bool:
+    content = message["content"]
+    return isinstance(content, list) and "cache_control" in content[-1]
+
+
+def test_cache_breakpoints_for_anthropic_models() -> None:
+    provider = LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5")
+    messages = _messages()
+    tools = [{"type": "function", "function": {"name": n}} for n in ("a", "b")]
+
+    kwargs = provider._build_kwargs(messages, tools, None, 100, 0.5)
+
+    marked = [i for i, m in enumerate(kwargs["messages"]) if _cached(m)]
+    assert marked == [0, 2, 5]
+    assert "cache_control" in kwargs["tools"][-1] and "cache_control" not in kwargs["tools"][0]
+    # The caller's request is left untouched
+    assert messages == _messages() and "cache_control" not in tools[-1]
+
+
+def test_no_cache_breakpoints_for_other_providers() -> None:
+    provider = LiteLLMProvider(default_model="gpt-4o")
+    kwargs = provider._build_kwargs(_messages(), None, None, 100, 0.5)
+    assert not any(_cached(m) for m in kwargs["messages"])
+
+    gateway = LiteLLMProvider(api_key="k", api_base="https://aihubmix.com/v1")
+    kwargs = gateway._build_kwargs(_messages(), None, "anthropic/claude-sonnet-4-5", 100, 0.5)
+    assert not any(_cached(m) for m in kwargs["messages"])
+
+
+def test_parse_usage_reports_cache_tokens() -> None:
+    usage = SimpleNamespace(
+        prompt_tokens=100,
+        completion_tokens=5,
+        total_tokens=105,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=80),
+        cache_creation_input_tokens=20,
+    )
+    parsed = LiteLLMProvider._parse_usage(usage)
+    assert parsed["cache_read_tokens"] == 80 and parsed["cache_write_tokens"] == 20
+
+
+def test_context_window_from_registry() -> None:
+    assert LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5").get_context_window() == 200_000
+    assert LiteLLMProvider(default_model="deepseek-chat").get_context_window("gpt-4o") == 128_000
+    local = LiteLLMProvider(api_key="k", api_base="http://localhost:8000/v1", default_model="llama-3")
+    assert local.get_context_window() == 32_768
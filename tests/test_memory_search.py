@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.memory import MemorySearchTool
+
+
+def _write(path, text: str, mtime: int | None = None) -> None:
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_search_ranks_matching_notes_with_dates(tmp_path) -> None:
+    memory = MemoryStore(tmp_path)
+    _write(memory.memory_dir / "2025-01-02.md", "# 2025-01-02\n\nBooked flight to Lisbon for March.\n")
+    _write(memory.memory_dir / "2025-01-05.md", "# 2025-01-05\n\nDentist appointment moved.\n")
+    _write(memory.memory_dir / "MEMORY.md", "# Memory\n\n## Travel\nPrefers aisle seats on a flight.\n\n## Food\nVegetarian.\n")
+
+    results = memory.search("lisbon flight")
+    assert [(r[1].date, r[1].heading) for r in results] == [("2025-01-02", "2025-01-02"), (None, "Travel")]
+
+    output = asyncio.run(MemorySearchTool(memory).execute(query="vegetarian"))
+    assert output.startswith("[long-term] memory/MEMORY.md:6 (Food)")
+    assert "Vegetarian." in output
+
+
+def test_index_follows_file_changes(tmp_path) -> None:
+    memory = MemoryStore(tmp_path)
+    note = memory.memory_dir / "2025-02-01.md"
+    _write(note, "# 2025-02-01\n\nTalked about kayaks.\n", mtime=1_000_000)
+    assert memory.search("kayaks")
+    indexed = len(memory.index)
+
+    _write(note, "# 2025-02-01\n\nTalked about canoes.\n", mtime=2_000_000)
+    assert not memory.search("kayaks") and memory.search("canoes")
+    assert len(memory.index) == indexed
+
+    note.unlink()
+    assert not memory.search("canoes") and len(memory.index) == 0
+
+
+def _big_memory(tmp_path) -> str:
+    sections = [f"## Topic {i}\nRoutine note number {i} about everyday things." for i in range(200)]
+    sections[40] = "## Pets\nThe user's cat is called Miso and hates the vacuum."
+    text = "# Memory\n\n" + "\n\n".join(sections) + "\n"
+    (tmp_path / "memory").mkdir(exist_ok=True)
+    (tmp_path / "memory" / "MEMORY.md").write_text(text, encoding="utf-8")
+    return text
+
+
+def test_large_memory_injects_relevant_sections_within_budget(tmp_path) -> None:
+    from nanobot.agent.context import ContextBuilder
+    from nanobot.utils.file_cache import FileCache
+    from nanobot.utils.tokens import count_tokens
+
+    _big_memory(tmp_path)
+    ctx = ContextBuilder(tmp_path, file_cache=FileCache(), memory_tokens=150)
+    messages = ctx.build_messages([], "What is my cat called?")
+
+    system, user = messages[0]["content"], messages[-1]["content"]
+    assert "Routine note number 5 " not in system and "too large to include" in system
+    recalled = user.split("[Relevant Memory]\n")[1].split("\n\n[Runtime Context]")[0]
+    assert "Miso" in recalled
+    assert "Topic 199" in recalled  # Recency fills the rest of the budget
+    assert count_tokens(recalled) <= 150
+    assert ctx.build_system_prompt() == system  # Stable across turns
+
+
+def test_small_memory_stays_in_system_prompt(tmp_path) -> None:
+    from nanobot.agent.context import ContextBuilder
+    from nanobot.utils.file_cache import FileCache
+
+    text = _big_memory(tmp_path)
+    ctx = ContextBuilder(tmp_path, file_cache=FileCache(), memory_tokens=0)
+    messages = ctx.build_messages([], "What is my cat called?")
+    assert text.strip() in messages[0]["content"]
+    assert "[Relevant Memory]" not in messages[-1]["content"]
@@ -0,0 +1,46 @@
+from nanobot.agent.tools.filesystem import ReadFileTool
+from nanobot.utils.line_index import STRIDE, LineIndexCache
+
+
+async def test_small_files_are_returned_whole(tmp_path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("one\ntwo\n", encoding="utf-8")
+
+    assert await ReadFileTool().execute(path=str(path)) == "one\ntwo\n"
+
+
+async def test_large_files_are_paged_by_line(tmp_path) -> None:
+    path = tmp_path / "app.log"
+    lines = [f"line {i} " + "x" * 100 for i in range(1, 5001)]
+    path.write_text("\n".join(lines), encoding="utf-8")  # No trailing newline
+    size = path.stat().st_size
+    indexes = LineIndexCache()
+    tool = ReadFileTool(line_indexes=indexes)
+
+    fits = 0
+    while sum(len(line) + 1 for line in lines[:fits + 1]) <= ReadFileTool.MAX_BYTES:
+        fits += 1
+    first = await tool.execute(path=str(path))
+    header, _, body = first.partition("\n")
+    assert header == f"[File: {size} bytes, 5000 lines; lines 1-{fits} shown, use offset={fits + 1} to continue]"
+    assert body == "\n".join(lines[:fits]) + "\n"
+
+    page = await tool.execute(path=str(path), offset=STRIDE * 3 + 5, limit=3)
+    assert page.split("\n")[1:] == [lines[STRIDE * 3 + 4], lines[STRIDE * 3 + 5], lines[STRIDE * 3 + 6], ""]
+    last = await tool.execute(path=str(path), offset=4999)
+    assert "lines 4999-5000 shown]" in last and last.endswith(lines[-1])
+    assert "past the end" in await tool.execute(path=str(path), offset=5001)
+    assert len(indexes._entries) == 1
+
+    # A changed file is re-indexed
+    path.write_text("short\n" * 30000, encoding="utf-8")
+    assert "30000 lines" in await tool.execute(path=str(path), offset=2, limit=1)
+
+
+async def test_byte_ranges_keep_characters_whole(tmp_path) -> None:
+    path = tmp_path / "utf8.txt"
+    path.write_text("é" * 10, encoding="utf-8")  # 2 bytes per character
+
+    page = await ReadFileTool().execute(path=str(path), byte_offset=1, byte_limit=6)
+
+    assert page == "[File: 20 bytes, 1 lines; bytes 2-6 shown, use byte_offset=6 to continue]\néé"
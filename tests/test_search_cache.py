@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from nanobot.agent.tools.search_cache import SearchCache
+from nanobot.agent.tools.web import WebSearchTool
+
+
+class _FakeSearch(WebSearchTool):
+    """WebSearchTool with the Brave request replaced by a slow stub."""
+
+    def __init__(self, cache: SearchCache):
+        super().__init__(api_key="test", cache=cache)
+        self.calls: list[tuple[str, int]] = []
+
+    async def _search(self, query: str, n: int) -> list[dict[str, str]]:
+        self.calls.append((query, n))
+        await asyncio.sleep(0.05)
+        return [{"title": f"About {query}", "url": "https://example.com", "description": ""}]
+
+
+def test_identical_searches_share_one_request() -> None:
+    cache = SearchCache()
+    tool = _FakeSearch(cache)
+
+    async def run() -> list[str]:
+        concurrent = await asyncio.gather(*(tool.execute(query="Nanobot  News") for _ in range(5)))
+        later = await tool.execute(query="nanobot news")
+        other_count = await tool.execute(query="nanobot news", count=3)
+        return [*concurrent, later, other_count]
+
+    results = asyncio.run(run())
+
+    assert tool.calls == [("Nanobot  News", 5), ("nanobot news", 3)]
+    assert all("About Nanobot  News" in r for r in results[:6])
+    assert results[5].startswith("Results for: nanobot news")
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (2, 4, 1)
+
+
+def test_failures_are_shared_but_not_cached() -> None:
+    cache = SearchCache()
+    attempts = []
+
+    async def failing() -> list:
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("quota exceeded")
+
+    async def run() -> None:
+        outcomes = await asyncio.gather(
+            *(cache.get_or_fetch("q", 5, failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("q", 5, failing)
+
+    asyncio.run(run())
+    assert len(attempts) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_expiry_and_size_limits() -> None:
+    cache = SearchCache(ttl=60, max_entries=2, max_entry_bytes=100)
+
+    async def fetch(value):
+        return value
+
+    async def run() -> None:
+        for query in ("a", "b", "c"):
+            await cache.get_or_fetch(query, 5, lambda: fetch([query]))
+        await cache.get_or_fetch("huge", 5, lambda: fetch(["x" * 200]))
+
+    asyncio.run(run())
+    assert [key[0] for key in cache._entries] == ["b", "c"]  # LRU "a" evicted, "huge" never stored
+    assert cache.stats()["evictions"] == 1
+
+    cache._entries[("b", 5)] = (0.0, *cache._entries[("b", 5)][1:])  # Expired
+    asyncio.run(cache.get_or_fetch("b", 5, lambda: fetch(["fresh"])))
+    assert cache._entries[("b", 5)][2] == ["fresh"]
@@ -0,0 +1,71 @@
+import pytest
+
+from nanobot.agent.tools.search import SearchFilesTool
+from nanobot.utils.gitignore import GitIgnore
+
+
+@pytest.fixture
+def make_tree(tmp_path):
+    def _make(files: dict[str, str | bytes]) -> None:
+        for rel, content in files.items():
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content, encoding="utf-8")
+
+    return _make
+
+
+def test_gitignore_rules() -> None:
+    ignore = GitIgnore().add("", "*.log\nbuild/\n/secret.txt\n!keep.log\n/dist/\n").add("docs", "*.tmp\n")
+
+    assert ignore.ignored("a/b/x.log", False)
+    assert not ignore.ignored("a/keep.log", False)
+    assert ignore.ignored("src/build", True) and not ignore.ignored("src/build", False)
+    assert ignore.ignored("secret.txt", False) and not ignore.ignored("a/secret.txt", False)
+    assert ignore.ignored("docs/x/y.tmp", False) and not ignore.ignored("y.tmp", False)
+    assert ignore.ignored("dist", True) and not ignore.ignored("src/dist", True)
+
+
+async def test_search_respects_gitignore_binaries_and_globs(tmp_path, make_tree) -> None:
+    make_tree({
+        ".git/config": "needle",
+        ".gitignore": "node_modules/\n*.min.js\n",
+        "src/app.py": "import os\n\ndef needle():\n    return 1\n",
+        "src/util.js": "// needle here\n",
+        "src/app.min.js": "needle",
+        "node_modules/lib/index.js": "needle",
+        "data/blob.bin": b"needle\x00\x01",
+        "notes/todo.md": "find the NEEDLE\n",
+    })
+    tool = SearchFilesTool(working_dir=str(tmp_path))
+
+    out = await tool.execute(pattern="needle")
+    assert out.splitlines() == ["src/app.py:3: def needle():", "src/util.js:1: // needle here"]
+
+    assert "notes/todo.md:1: find the NEEDLE" in await tool.execute(pattern="needle", ignore_case=True)
+    assert (await tool.execute(pattern="needle", glob="*.py")).splitlines() == ["src/app.py:3: def needle():"]
+    assert await tool.execute(glob="src/*.py") == "src/app.py"
+
+    with_context = await tool.execute(pattern="def needle", context=1)
+    assert with_context.splitlines() == ["src/app.py-2- ", "src/app.py:3: def needle():", "src/app.py-4-     return 1"]
+
+
+async def test_search_caps_results_and_stays_inside_allowed_dir(tmp_path, make_tree) -> None:
+    make_tree({f"d{i}/f{j}.txt": "match\n" * 3 for i in range(5) for j in range(5)})
+    tool = SearchFilesTool(working_dir=str(tmp_path), allowed_dir=tmp_path / "d0")
+
+    assert "outside allowed directory" in await tool.execute(pattern="match")
+    out = await tool.execute(pattern="match", path=str(tmp_path / "d0"), max_results=7)
+    assert len(out.splitlines()) == 8 and out.endswith("[Stopped at 7 results; narrow the search]")
+
+
+async def test_anchored_patterns_match_any_line(tmp_path, make_tree) -> None:
+    make_tree({"app.py": "import os\n\ndef foo():\n    pass\n\nx = 1\n"})
+    tool = SearchFilesTool(working_dir=str(tmp_path))
+
+    assert await tool.execute(pattern="^def ") == "app.py:3: def foo():"
+    assert await tool.execute(pattern="pass$") == "app.py:4:     pass"
+    assert await tool.execute(pattern="^DEF FOO", ignore_case=True) == "app.py:3: def foo():"
@@ -0,0 +1,358 @@
+from nanobot.session.manager import Session
+from nanobot.utils.tokens import count_message_tokens
+
+
+def _session(*sizes: int) -> Session:
+    session = Session(key="test:1")
+    for i, size in enumerate(sizes):
+        session.add_message("user" if i % 2 == 0 else "assistant", "word " * size)
+    return session
+
+
+def test_token_counts_are_cached_at_write_time() -> None:
+    session = _session(10)
+    msg = session.messages[0]
+    assert msg["tokens"] == count_message_tokens(msg) > 10
+
+
+def test_history_packs_newest_messages_within_budget() -> None:
+    # A pasted log in the middle of otherwise short messages
+    session = _session(5, 5, 5000, 5, 5, 5)
+    history = session.get_history(max_messages=None, max_tokens=200)
+
+    # The log doesn't fit; the orphaned reply before the last question is dropped
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    assert all("tokens" not in m for m in history)
+
+
+def test_history_never_starts_with_orphaned_reply() -> None:
+    session = _session(5, 5, 5, 5)
+    per_message = session.messages[-1]["tokens"]
+    history = session.get_history(max_messages=None, max_tokens=per_message * 3)
+    assert [m["role"] for m in history] == ["user", "assistant"]
+
+
+def test_history_counts_legacy_messages_lazily() -> None:
+    session = Session(key="test:1", messages=[{"role": "user", "content": "hi"}])
+    assert session.get_history(max_tokens=100) == [{"role": "user", "content": "hi"}]
+    assert session.messages[0]["tokens"] > 0
+
+
+def test_message_limit_still_applies() -> None:
+    session = _session(*[1] * 10)
+    assert len(session.get_history()) == 10
+    assert len(session.get_history(max_messages=4, max_tokens=10_000)) == 4
+
+
+def _manager(tmp_path, monkeypatch, summaries: list, threshold: int = 6, keep: int = 2):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    async def summarize(previous: str, messages: list) -> str:
+        summaries.append((previous, [m["content"] for m in messages]))
+        return f"summary of {len(messages)} after [{previous}]"
+
+    manager = SessionManager(tmp_path)
+    manager.enable_compaction(summarize, threshold=threshold, keep_recent=keep)
+    return manager
+
+
+async def test_compaction_runs_in_background_and_folds_history(tmp_path, monkeypatch) -> None:
+    summaries: list = []
+    manager = _manager(tmp_path, monkeypatch, summaries)
+    session = manager.get_or_create("test:1")
+    for i in range(4):
+        session.add_message("user", f"q{i}")
+        session.add_message("assistant", f"a{i}")
+    manager.save(session)
+    assert not summaries  # Scheduled, not run inline
+
+    await manager.wait_compactions()
+    assert summaries == [("", ["q0", "a0", "q1", "a1", "q2", "a2"])]
+
+    history = session.get_history()
+    assert history[0]["content"].endswith("summary of 6 after []")
+    assert [m["content"] for m in history[1:]] == ["q3", "a3"]
+
+    # Persisted with the session
+    manager._cache.clear()
+    assert manager.get_or_create("test:1").get_history() == history
+
+
+async def test_compaction_discarded_if_session_cleared(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:1")
+
+    async def summarize(previous: str, messages: list) -> str:
+        session.clear()  # e.g. /reset while the summary is being generated
+        return "stale"
+
+    manager.enable_compaction(summarize, threshold=6, keep_recent=2)
+    for i in range(8):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"m{i}")
+    manager.save(session)
+    await manager.wait_compactions()
+
+    assert "summary" not in session.metadata
+
+def test_summary_counts_against_token_budget() -> None:
+    session = _session(*[5] * 6)
+    per_message = session.messages[-1]["tokens"]
+    session.metadata["summary"] = {"text": "older stuff", "until": 2, "tokens": 100}
+
+    history = session.get_history(max_tokens=100 + per_message * 2)
+    assert history[0]["content"].endswith("older stuff")
+    assert len(history) == 3
+
+
+def _lines(path) -> list[dict]:
+    import json
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_save_appends_new_messages_and_trailer(tmp_path, monkeypatch) -> None:
+    manager = _manager(tmp_path, monkeypatch, [], threshold=0)
+    session = manager.get_or_create("test:1")
+    session.add_message("user", "q0")
+    manager.save(session)
+    path = manager.store._get_session_path("test:1")
+    first = path.read_text()
+
+    session.add_message("assistant", "a0")
+    manager.save(session)
+    assert path.read_text().startswith(first)
+    assert [d.get("content", d.get("_type")) for d in _lines(path)] == ["q0", "metadata", "a0", "metadata"]
+
+    manager._cache.clear()
+    loaded = manager.get_or_create("test:1")
+    assert [m["content"] for m in loaded.messages] == ["q0", "a0"]
+    assert manager.list_sessions()[0]["key"] == "test:1"
+
+
+def test_save_rewrites_after_clear_and_torn_write(tmp_path, monkeypatch) -> None:
+    manager = _manager(tmp_path, monkeypatch, [], threshold=0)
+    session = manager.get_or_create("test:1")
+    session.add_message("user", "old")
+    manager.save(session)
+    path = manager.store._get_session_path("test:1")
+
+    session.clear()
+    session.add_message("user", "new")
+    manager.save(session)
+    assert [d.get("content", d.get("_type")) for d in _lines(path)] == ["new", "metadata"]
+
+    with open(path, "a") as f:
+        f.write('{"role": "user", "cont')  # Crash mid-append
+    manager._cache.clear()
+    session = manager.get_or_create("test:1")
+    assert [m["content"] for m in session.messages] == ["new"]
+    session.add_message("assistant", "reply")
+    manager.save(session)
+    assert [d.get("content", d.get("_type")) for d in _lines(path)] == ["new", "reply", "metadata"]
+
+
+def test_legacy_metadata_first_files_load_and_append(tmp_path, monkeypatch) -> None:
+    import json
+    manager = _manager(tmp_path, monkeypatch, [], threshold=0)
+    path = manager.store._get_session_path("test:1")
+    path.write_text(
+        json.dumps({"_type": "metadata", "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00", "metadata": {"k": 1}}) + "\n"
+        + json.dumps({"role": "user", "content": "hi"}) + "\n"
+    )
+    assert manager.list_sessions()[0]["created_at"] == "2025-01-01T00:00:00"
+
+    session = manager.get_or_create("test:1")
+    session.add_message("assistant", "hello")
+    manager.save(session)
+
+    manager._cache.clear()
+    reloaded = manager.get_or_create("test:1")
+    assert [m["content"] for m in reloaded.messages] == ["hi", "hello"]
+    assert reloaded.metadata == {"k": 1}
+    assert reloaded.created_at.year == 2025
+
+
+def _filled_manager(tmp_path, monkeypatch, messages: int, **kwargs):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    manager = SessionManager(tmp_path, **kwargs)
+    session = manager.get_or_create("test:1")
+    for i in range(messages):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"m{i}")
+        if i % 10 == 9:
+            manager.save(session)  # Several appends, several trailers
+    manager.save(session)
+    return manager
+
+
+def test_cache_miss_loads_only_the_tail(tmp_path, monkeypatch) -> None:
+    manager = _filled_manager(tmp_path, monkeypatch, 95, tail_messages=20)
+    manager._forget("test:1")
+
+    session = manager.get_or_create("test:1")
+    assert session.offset == 75 and session.message_count == 95
+    assert [m["content"] for m in session.messages][:2] == ["m75", "m76"]
+
+    # Appending after a tail load keeps the older messages on disk
+    session.add_message("user", "m95")
+    manager.save(session)
+    manager._forget("test:1")
+    manager.tail_messages = 0
+    full = manager.get_or_create("test:1")
+    assert [m["content"] for m in full.messages] == [f"m{i}" for i in range(96)]
+
+
+def test_load_older_and_rewrite_keep_full_history(tmp_path, monkeypatch) -> None:
+    manager = _filled_manager(tmp_path, monkeypatch, 50, tail_messages=10)
+    manager._forget("test:1")
+    session = manager.get_or_create("test:1")
+
+    manager.load_older(session)
+    assert session.offset == 0 and len(session.messages) == 50
+
+    manager._forget("test:1")
+    session = manager.get_or_create("test:1")
+    session.persisted = None  # Force the rewrite path
+    manager.save(session)
+    manager._forget("test:1")
+    manager.tail_messages = 0
+    assert manager.get_or_create("test:1").message_count == 50
+
+
+async def test_async_loads_read_the_store_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    import threading
+
+    manager = _filled_manager(tmp_path, monkeypatch, 50, tail_messages=10)
+    manager._forget("test:1")
+    threads: list[threading.Thread] = []
+
+    def recording(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return wrapper
+
+    monkeypatch.setattr(manager.store, "load", recording(manager.store.load))
+    monkeypatch.setattr(manager.store, "load_older", recording(manager.store.load_older))
+
+    session = await manager.aget_or_create("test:1")
+    assert session.offset == 40 and await manager.aget_or_create("test:1") is session
+    session.add_message("user", "m50")
+    await manager.aload_older(session)
+
+    assert [m["content"] for m in session.messages] == [f"m{i}" for i in range(51)]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+def test_cache_is_lru_bounded(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    manager = SessionManager(tmp_path, cache_size=2)
+    a = manager.get_or_create("test:a")
+    manager.get_or_create("test:b")
+    manager.get_or_create("test:a")
+    manager.get_or_create("test:c")
+    assert list(manager._cache) == ["test:a", "test:c"]
+    assert manager.get_or_create("test:a") is a
+
+    manager.cache_bytes = 1000
+    a.add_message("user", "x" * 5000)
+    manager.save(a)
+    assert list(manager._cache) == ["test:a"]
+
+
+def test_jsonl_list_sessions_keeps_exact_key(tmp_path, monkeypatch) -> None:
+    manager = _manager(tmp_path, monkeypatch, [], threshold=0)
+    session = manager.get_or_create("telegram:user_42")
+    session.add_message("user", "hi")
+    manager.save(session)
+    assert manager.list_sessions()[0]["key"] == "telegram:user_42"
+
+
+def test_jsonl_keys_that_used_to_collide_get_separate_files(tmp_path, monkeypatch) -> None:
+    import json
+    manager = _manager(tmp_path, monkeypatch, [], threshold=0)
+    legacy = manager.store.sessions_dir / "telegram_a_b.jsonl"  # Old name of both keys
+    legacy.write_text(
+        json.dumps({"role": "user", "content": "old"}) + "\n"
+        + json.dumps({"_type": "metadata", "key": "telegram:a_b", "message_count": 1}) + "\n"
+    )
+
+    other = manager.get_or_create("telegram_a:b")
+    assert other.messages == []  # The old file belongs to another key
+    other.add_message("user", "other")
+    manager.save(other)
+
+    session = manager.get_or_create("telegram:a_b")
+    assert [m["content"] for m in session.messages] == ["old"]
+    assert not legacy.exists()
+    assert sorted(s["key"] for s in manager.list_sessions()) == ["telegram:a_b", "telegram_a:b"]
+
+
+def _sqlite_manager(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session import SessionManager, SqliteSessionStore
+
+    return SessionManager(tmp_path, store=SqliteSessionStore(tmp_path / "s.db"), **kwargs)
+
+
+def test_sqlite_store_appends_and_loads_tail(tmp_path, monkeypatch) -> None:
+    manager = _sqlite_manager(tmp_path, monkeypatch, tail_messages=5)
+    session = manager.get_or_create("telegram:user_42")
+    for i in range(12):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"m{i}")
+        manager.save(session)
+    session.metadata["k"] = 1
+    manager.save(session)
+
+    manager._forget("telegram:user_42")
+    session = manager.get_or_create("telegram:user_42")
+    assert session.offset == 7 and session.message_count == 12
+    assert [m["content"] for m in session.messages] == [f"m{i}" for i in range(7, 12)]
+    assert session.metadata == {"k": 1}
+
+    session.add_message("user", "m12")
+    manager.save(session)
+    manager.load_older(session)
+    assert [m["content"] for m in session.messages] == [f"m{i}" for i in range(13)]
+    assert manager.list_sessions()[0]["key"] == "telegram:user_42"
+
+
+def test_sqlite_store_replaces_cleared_history(tmp_path, monkeypatch) -> None:
+    manager = _sqlite_manager(tmp_path, monkeypatch, tail_messages=2)
+    session = manager.get_or_create("test:1")
+    for i in range(6):
+        session.add_message("user", f"old{i}")
+    manager.save(session)
+
+    manager._forget("test:1")
+    session = manager.get_or_create("test:1")
+    session.clear()
+    session.add_message("user", "new")
+    manager.save(session)
+
+    manager._forget("test:1")
+    manager.tail_messages = 0
+    assert [m["content"] for m in manager.get_or_create("test:1").messages] == ["new"]
+
+
+def test_sqlite_store_pages_and_deletes(tmp_path, monkeypatch) -> None:
+    manager = _sqlite_manager(tmp_path, monkeypatch)
+    for i in range(5):
+        session = manager.get_or_create(f"test:{i}")
+        session.add_message("user", "hi")
+        manager.save(session)
+
+    keys = [s["key"] for s in manager.list_sessions()]
+    assert keys == [f"test:{i}" for i in reversed(range(5))]
+    assert [s["key"] for s in manager.list_sessions(limit=2, offset=1)] == keys[1:3]
+
+    assert manager.delete("test:0") is True
+    assert manager.delete("test:0") is False
+    assert manager.get_or_create("test:0").messages == []
+    manager.close()
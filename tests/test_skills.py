@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from nanobot.agent import skills as skills_module
+from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.file_cache import FileCache
+
+
+def _write_skill(root: Path, name: str, description: str, bins: list[str]) -> Path:
+    skill_dir = root / "skills" / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    metadata = '{"nanobot":{"requires":{"bins":[%s]}}}' % ",".join(f'"{b}"' for b in bins)
+    path = skill_dir / "SKILL.md"
+    path.write_text(f"---\ndescription: {description}\nmetadata: {metadata}\n---\n\nBody\n")
+    return path
+
+
+def test_summary_reads_and_probes_once(tmp_path, monkeypatch) -> None:
+    probes: list[str] = []
+    monkeypatch.setattr(skills_module.shutil, "which", lambda name: probes.append(name) or None)
+    for i in range(3):
+        _write_skill(tmp_path, f"s{i}", f"skill {i}", ["sometool"])
+
+    files = FileCache()
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", file_cache=files)
+    first = loader.build_skills_summary()
+    second = loader.build_skills_summary()
+
+    assert first == second
+    assert files.misses == 3
+    assert probes == ["sometool"]
+    assert "<requires>CLI: sometool</requires>" in first
+
+
+def test_edited_skill_is_picked_up(tmp_path) -> None:
+    path = _write_skill(tmp_path, "s", "old description", [])
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", file_cache=FileCache())
+    assert "old description" in loader.build_skills_summary()
+
+    path.write_text("---\ndescription: new description, longer\n---\n\nBody\n")
+    summary = loader.build_skills_summary()
+    assert "new description, longer" in summary
+    assert "old description" not in summary
+
+    _write_skill(tmp_path, "t", "added later", [])
+    assert "added later" in loader.build_skills_summary()
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+
+class RecordingTool(Tool):
+    def __init__(self, name: str, safe: bool, log: list[str], delay: float = 0.05):
+        self._name = name
+        self._safe = safe
+        self._log = log
+        self._delay = delay
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "records calls"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}, "required": ["tag"]}
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return self._safe
+
+    async def execute(self, tag: str, **kwargs: Any) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self._log.append(f"start {tag}")
+        await asyncio.sleep(self._delay)
+        self._log.append(f"end {tag}")
+        self.active -= 1
+        return tag
+
+
+async def test_execute_batch_keeps_order_and_parallelizes_safe_calls() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    fetch = RecordingTool("fetch", safe=True, log=log)
+    reg.register(fetch)
+
+    calls = [("fetch", {"tag": t}) for t in ("a", "b", "c")]
+    assert await reg.execute_batch(calls) == ["a", "b", "c"]
+    assert fetch.peak == 3
+
+
+async def test_execute_batch_respects_max_concurrency() -> None:
+    reg = ToolRegistry(max_concurrency=2)
+    fetch = RecordingTool("fetch", safe=True, log=[])
+    reg.register(fetch)
+
+    await reg.execute_batch([("fetch", {"tag": str(i)}) for i in range(5)])
+    assert fetch.peak == 2
+
+
+async def test_execute_batch_unsafe_calls_are_barriers() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(RecordingTool("fetch", safe=True, log=log))
+    reg.register(RecordingTool("write", safe=False, log=log))
+
+    results = await reg.execute_batch([
+        ("fetch", {"tag": "r1"}),
+        ("write", {"tag": "w"}),
+        ("fetch", {"tag": "r2"}),
+        ("missing", {}),
+    ])
+
+    assert results[:3] == ["r1", "w", "r2"]
+    assert "not found" in results[3]
+    assert log.index("end r1") < log.index("start w") < log.index("end w") < log.index("start r2")
@@ -0,0 +1,205 @@
+import json
+import os
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache
+
+PAGE = "<html><head><title>Doc</title></head><body><article><h2>Intro</h2><p>Hello <b>cached</b> world, " + "with enough text to be readable. " * 20 + "</p></article></body></html>"
+
+
+class _MockClients:
+    """Stands in for HttpClients, routing every request to a handler."""
+
+    def __init__(self, handler):
+        self.requests: list[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        self._transport = httpx.MockTransport(record)
+
+    def get(self, name: str = "default", **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self._transport, **kwargs)
+
+
+async def _fetch(tool: WebFetchTool, **kwargs) -> dict:
+    return json.loads(await tool.execute(url="https://docs.test/page", **kwargs))
+
+
+async def test_fresh_pages_are_served_from_cache_per_extract_mode(tmp_path) -> None:
+    clients = _MockClients(lambda r: httpx.Response(
+        200, text=PAGE, headers={"content-type": "text/html", "cache-control": "max-age=3600"}
+    ))
+    tool = WebFetchTool(http=clients, cache=WebCache(tmp_path, ttl_floor=0))
+
+    first = await _fetch(tool)
+    second = await _fetch(tool)
+    as_text = await _fetch(tool, extractMode="text")
+
+    assert len(clients.requests) == 1
+    assert (first["cache"], second["cache"], as_text["cache"]) == ("miss", "hit", "hit")
+    assert second["text"] == first["text"] and "## Intro" in first["text"]
+    assert "## Intro" not in as_text["text"] and "cached" in as_text["text"]
+
+
+async def test_stale_pages_are_revalidated_with_etag(tmp_path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "max-age=0"})
+        return httpx.Response(200, text=PAGE, headers={
+            "content-type": "text/html", "etag": '"v1"', "cache-control": "max-age=0",
+        })
+
+    clients = _MockClients(handler)
+    tool = WebFetchTool(http=clients, cache=WebCache(tmp_path, ttl_floor=600))
+
+    first = await _fetch(tool)
+    second = await _fetch(tool)
+    assert (first["cache"], second["cache"]) == ("miss", "revalidated")
+    assert second["text"] == first["text"]
+    assert len(clients.requests) == 2
+
+
+async def test_no_store_responses_are_not_cached(tmp_path) -> None:
+    clients = _MockClients(lambda r: httpx.Response(
+        200, json={"a": 1}, headers={"cache-control": "no-store"}
+    ))
+    tool = WebFetchTool(http=clients, cache=WebCache(tmp_path))
+
+    assert (await _fetch(tool))["extractor"] == "json"
+    assert (await _fetch(tool))["cache"] == "miss"
+    assert len(clients.requests) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = WebCache(tmp_path, max_bytes=30_000)
+    headers = {"cache-control": "max-age=3600"}
+    for i in range(5):
+        url = f"https://x.test/{i}"
+        entry = cache.put_raw(url, url, 200, headers, "utf-8", bytes([i]) * 8000)
+        for path in (cache._raw_path(url), cache._blob_path(entry.body)):
+            os.utime(path, (1000 + i, 1000 + i))  # Written in order, oldest first
+
+    assert cache.size() <= 30_000
+    assert cache.get_raw("https://x.test/0") is None
+    assert cache.get_raw("https://x.test/4") is not None
+
+
+def test_concurrent_writes_of_one_entry_do_not_collide(tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = WebCache(tmp_path)
+    cache.size()  # Start tracking the size, so every write updates it
+    headers = {"cache-control": "max-age=3600"}
+    url = "https://x.test/same"
+
+    with ThreadPoolExecutor(8) as pool:
+        entries = list(pool.map(
+            lambda _: cache.put_raw(url, url, 200, headers, "utf-8", b"same body" * 1000), range(64)
+        ))
+
+    assert all(entry is not None for entry in entries)
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert cache.size() == sum(p.stat().st_size for p in tmp_path.rglob("*") if p.is_file())
+
+
+async def test_extraction_runs_in_worker_pool_and_times_out_cleanly() -> None:
+    from nanobot.utils.extraction import ExtractionPool
+
+    pool = ExtractionPool(workers=1, timeout=30)
+    clients = _MockClients(lambda r: httpx.Response(200, text=PAGE, headers={"content-type": "text/html"}))
+    tool = WebFetchTool(http=clients, extractor=pool)
+    try:
+        page = await _fetch(tool)
+        assert page["extractor"] == "readability" and "## Intro" in page["text"]
+        assert pool.uses_processes
+
+        pool.timeout = 0
+        assert "timed out" in (await _fetch(tool))["error"]
+
+        # The timed-out worker was replaced; the pool keeps working
+        pool.timeout = 30
+        assert "## Intro" in (await _fetch(tool))["text"]
+    finally:
+        pool.shutdown()
+
+
+async def test_thread_pool_stops_replacing_stuck_threads_at_the_cap(monkeypatch) -> None:
+    import threading
+
+    from nanobot.utils import extraction
+
+    release = threading.Event()
+    started: list[str] = []
+
+    def stuck(body: str, ctype: str, mode: str) -> tuple[str, str]:
+        started.append(body)
+        release.wait()
+        return body, "raw"
+
+    monkeypatch.setattr(extraction, "extract_content", stuck)
+    pool = extraction.ExtractionPool(workers=1, timeout=0.2, use_processes=False)
+    try:
+        for body in ("1", "2", "3"):
+            with pytest.raises(extraction.ExtractionTimeoutError):
+                await pool.extract(body, "text/plain", "text")
+        # "1" was left behind for a fresh pool; at the cap, "3" queued behind "2"
+        assert "3" not in started
+
+        release.set()
+        pool.timeout = 5
+        assert await pool.extract("4", "text/plain", "text") == ("4", "raw")
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def _streamed(chunks, headers: dict) -> httpx.Response:
+    """A streaming response whose body generator records how far it was read."""
+    sent = []
+
+    async def body():
+        for chunk in chunks:
+            sent.append(len(chunk))
+            yield chunk
+
+    response = httpx.Response(200, content=body(), headers=headers)
+    response.sent = sent
+    return response
+
+
+async def test_binary_downloads_are_rejected_after_the_first_bytes() -> None:
+    responses = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        chunks = [b"\x7fELF" + b"\x00" * 65532] + [b"\x00" * 65536] * 1000  # ~64 MB
+        responses.append(_streamed(chunks, {"content-type": "application/octet-stream"}))
+        return responses[-1]
+
+    result = await _fetch(WebFetchTool(http=_MockClients(handler)))
+
+    assert "Binary content" in result["error"]
+    assert len(responses[0].sent) == 1
+
+
+async def test_downloads_stop_at_the_byte_cap_and_are_not_cached(tmp_path) -> None:
+    from nanobot.agent.tools.web import _download_cap
+
+    paragraph = b"<p>" + b"word " * 2000 + b"</p>"
+    chunks = [b"<html><body><article>"] + [paragraph] * 1000  # ~10 MB
+    clients = _MockClients(lambda r: _streamed(chunks, {
+        "content-type": "text/html", "cache-control": "max-age=3600",
+    }))
+    tool = WebFetchTool(http=clients, cache=WebCache(tmp_path))
+
+    page = await _fetch(tool, maxChars=1000)
+    cap = _download_cap(1000)
+
+    assert page["truncated"] is True
+    assert cap < page["bytes"] <= cap + len(paragraph)
+    assert (await _fetch(tool, maxChars=1000))["cache"] == "miss"
+    assert len(clients.requests) == 2
@@ -0,0 +1,117 @@
+import threading
+
+from nanobot.utils.write_behind import WriteBehindQueue
+
+
+def test_repeated_writes_to_a_key_coalesce() -> None:
+    writer = WriteBehindQueue(fsync="never")
+    gate = threading.Event()
+    written: list[str] = []
+
+    writer.submit("block", lambda: gate.wait())
+    for i in range(5):
+        writer.submit("session", lambda i=i: written.append(f"v{i}"))
+    writer.submit("other", lambda: written.append("other"))
+    gate.set()
+
+    assert writer.flush(timeout=5)
+    assert written == ["v4", "other"]
+    assert writer.coalesced == 4
+    writer.close()
+
+
+def test_close_flushes_and_later_writes_run_inline(tmp_path) -> None:
+    writer = WriteBehindQueue(fsync="always")
+    path = tmp_path / "a.txt"
+
+    def write():
+        path.write_text("hello")
+        return [path]
+
+    writer.submit("a", write)
+    writer.close()
+    assert path.read_text() == "hello"
+
+    writer.submit("b", lambda: path.write_text("again"))
+    assert path.read_text() == "again"
+
+
+def test_failed_job_does_not_stop_the_queue() -> None:
+    writer = WriteBehindQueue()
+    done: list[int] = []
+
+    writer.submit("bad", lambda: 1 / 0)
+    writer.submit("good", lambda: done.append(1))
+    assert writer.flush(timeout=5)
+    assert done == [1] and writer.errors == 1
+    writer.close()
+
+
+def test_session_saves_run_behind_and_reload(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    writer = WriteBehindQueue()
+    manager = SessionManager(tmp_path, writer=writer)
+    session = manager.get_or_create("test:1")
+    for i in range(20):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    session.clear()
+    session.add_message("user", "fresh")
+    manager.save(session)
+
+    manager._forget("test:1")  # Reload waits for the queued save
+    assert [m["content"] for m in manager.get_or_create("test:1").messages] == ["fresh"]
+    manager.close()
+    writer.close()
+
+
+def test_reload_writes_only_its_own_queued_save(tmp_path, monkeypatch) -> None:
+    import time
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from nanobot.session.manager import SessionManager
+
+    writer = WriteBehindQueue()
+    gate = threading.Event()
+    writer.submit("block", lambda: gate.wait())
+    release = threading.Timer(5, gate.set)  # Unblocks the queue if the test fails
+    release.start()
+
+    manager = SessionManager(tmp_path, writer=writer)
+    session = manager.get_or_create("test:1")
+    session.add_message("user", "hi")
+    manager.save(session)
+    manager._forget("test:1")
+
+    start = time.monotonic()
+    reloaded = manager.get_or_create("test:1")
+    assert time.monotonic() - start < 2  # Did not wait behind the blocked job
+    assert [m["content"] for m in reloaded.messages] == ["hi"]
+    assert writer.is_pending("block")
+
+    gate.set()
+    release.cancel()
+    writer.close()
+
+
+def test_memory_appends_are_visible_before_they_are_written(tmp_path) -> None:
+    from nanobot.agent.memory import MemoryStore
+
+    writer = WriteBehindQueue()
+    gate = threading.Event()
+    writer.submit("block", lambda: gate.wait())
+
+    memory = MemoryStore(tmp_path, writer=writer)
+    memory.append_today("first")
+    memory.append_today("second")
+    expected = f"# {memory.get_today_file().stem}\n\nfirst\nsecond"
+    assert memory.read_today() == expected
+    assert not memory.get_today_file().exists()
+
+    gate.set()
+    writer.flush()
+    assert memory.get_today_file().read_text() == expected
+    assert memory.read_today() == expected
+    writer.close()